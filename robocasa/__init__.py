@@ -1,95 +1,111 @@
-from robosuite.environments.base import make
-
-# Manipulation environments
-from robocasa.environments.tabletop.tabletop import Tabletop
-from robocasa.environments.tabletop.tabletop_pnp import (
-    PnPOnionToBowl,
-    PnPCanToBowl,
-    PnPCupToPlate,
-    PnPAppleToPlate,
-    PnPMilkToBasket,
-    PnPKettleToPlate,
-    PnPFruitToPlacemat,
-    PnPCounterToPlate,
-    PnPCounterToBowl,
-    PnPCounterToCuttingBoard,
-    PnPCounterToPot,
-    PnPCounterToPan,
-    PnPPlateToPlate,
-    PnPMilkPlateToPlate,
-    PnPVegetableBowlToPlate,
-    PnPObjectsToShelf,
-    PnPObjectsToShelfLevel,
-    PnPObjectsShelfToCounter,
-    PnPObjectsShelfLevelToLevel,
-    PnPObjectsToTieredBasket,
-    PnPObjectsToTieredBasketLevel,
-    PnPObjectsTieredBasketToCounter,
-    PnPObjectsTieredBasketLevelToLevel,
-    PnPRubixCubeBasketToCounter,
-    PnPCupToPlateNoDistractors,
-    PnPCupToDishRackUpperLevel,
-    PnPBreadBasketToBowl,
-    PnPPouring,
-    PnPFruitToPlate,
-    PnPFruitToPlateSplitA,
-    PnPFruitToPlateSplitB,
-    PnPCylindricalToPlate,
-    PnPMilkPlateToPlateCotrain,
-    PnPAppleToPlateCotrain,
-)
-from robocasa.environments.tabletop.tabletop_cabinet_door import (
-    TabletopCabinetDoor,
-    TabletopOpenCabinetDoor,
-    TabletopCloseCabinetDoor,
-)
-from robocasa.environments.tabletop.tabletop_drawer_door import (
-    TabletopDrawerDoor,
-    TabletopOpenDrawerDoor,
-    TabletopCloseDrawerDoor,
-)
-from robocasa.environments.tabletop.tabletop_drawer_pnp import (
-    PnPCupToDrawerClose,
-    PnPAppleToDrawerClose,
-    PnPBottleToDrawerClose,
-    PnPCanToDrawerClose,
-    PnPWineToDrawerClose,
-)
-from robocasa.environments.tabletop.tabletop_microwave_pnp import (
-    PnPCupToMicrowaveClose,
-    PnPCornToMicrowaveClose,
-    PnPPotatoToMicrowaveClose,
-    PnPEggplantToMicrowaveClose,
-    PnPMilkToMicrowaveClose,
-)
-from robocasa.environments.tabletop.tabletop_cabinet_pnp import (
-    PnPCupToCabinetClose,
-    PnPAppleToCabinetClose,
-    PnPBottleToCabinetClose,
-    PnPCanToCabinetClose,
-    PnPWineToCabinetClose,
-)
-from robocasa.environments.tabletop.tabletop_microwave import (
-    TabletopTurnOffMicrowave,
-    TabletopTurnOnMicrowave,
-)
-from robocasa.environments.tabletop.tabletop_microwave_door import (
-    TabletopOpenMicrowaveDoor,
-    TabletopCloseMicrowaveDoor,
-)
-from robocasa.environments.tabletop.tabletop_multi_pnp import (
-    PutAllObjectsInBasket,
-    PutAllObjectsOnPlate,
-)
-from robocasa.environments.tabletop.tabletop_object_showcase import (
-    TabletopObjectShowcase,
-)
-from robocasa.environments.tabletop.tabletop_5dc import *
-from robocasa.environments.tabletop.tabletop_24dc import *
-from robocasa.environments.tabletop.tabletop_laptop import (
-    TabletopLaptopOpen,
-    TabletopLaptopClose,
-)
+import importlib
+import os
+
+from robosuite.environments.base import REGISTERED_ENVS
+
+# Manipulation environments. Environment modules are imported on first access of one of their names
+# (PEP 562), or eagerly if macros.LAZY_ENV_IMPORTS is False. robosuite registers an environment when
+# its module is imported, see get_env_class
+_ENV_MODULES = {
+    "robocasa.environments.tabletop.tabletop": [
+        "Tabletop",
+    ],
+    "robocasa.environments.tabletop.tabletop_pnp": [
+        "PnPOnionToBowl",
+        "PnPCanToBowl",
+        "PnPCupToPlate",
+        "PnPAppleToPlate",
+        "PnPMilkToBasket",
+        "PnPKettleToPlate",
+        "PnPFruitToPlacemat",
+        "PnPCounterToPlate",
+        "PnPCounterToBowl",
+        "PnPCounterToCuttingBoard",
+        "PnPCounterToPot",
+        "PnPCounterToPan",
+        "PnPPlateToPlate",
+        "PnPMilkPlateToPlate",
+        "PnPVegetableBowlToPlate",
+        "PnPObjectsToShelf",
+        "PnPObjectsToShelfLevel",
+        "PnPObjectsShelfToCounter",
+        "PnPObjectsShelfLevelToLevel",
+        "PnPObjectsToTieredBasket",
+        "PnPObjectsToTieredBasketLevel",
+        "PnPObjectsTieredBasketToCounter",
+        "PnPObjectsTieredBasketLevelToLevel",
+        "PnPRubixCubeBasketToCounter",
+        "PnPCupToPlateNoDistractors",
+        "PnPCupToDishRackUpperLevel",
+        "PnPBreadBasketToBowl",
+        "PnPPouring",
+        "PnPFruitToPlate",
+        "PnPFruitToPlateSplitA",
+        "PnPFruitToPlateSplitB",
+        "PnPCylindricalToPlate",
+        "PnPMilkPlateToPlateCotrain",
+        "PnPAppleToPlateCotrain",
+    ],
+    "robocasa.environments.tabletop.tabletop_cabinet_door": [
+        "TabletopCabinetDoor",
+        "TabletopOpenCabinetDoor",
+        "TabletopCloseCabinetDoor",
+    ],
+    "robocasa.environments.tabletop.tabletop_drawer_door": [
+        "TabletopDrawerDoor",
+        "TabletopOpenDrawerDoor",
+        "TabletopCloseDrawerDoor",
+    ],
+    "robocasa.environments.tabletop.tabletop_drawer_pnp": [
+        "PnPCupToDrawerClose",
+        "PnPAppleToDrawerClose",
+        "PnPBottleToDrawerClose",
+        "PnPCanToDrawerClose",
+        "PnPWineToDrawerClose",
+    ],
+    "robocasa.environments.tabletop.tabletop_microwave_pnp": [
+        "PnPCupToMicrowaveClose",
+        "PnPCornToMicrowaveClose",
+        "PnPPotatoToMicrowaveClose",
+        "PnPEggplantToMicrowaveClose",
+        "PnPMilkToMicrowaveClose",
+    ],
+    "robocasa.environments.tabletop.tabletop_cabinet_pnp": [
+        "PnPCupToCabinetClose",
+        "PnPAppleToCabinetClose",
+        "PnPBottleToCabinetClose",
+        "PnPCanToCabinetClose",
+        "PnPWineToCabinetClose",
+    ],
+    "robocasa.environments.tabletop.tabletop_microwave": [
+        "TabletopTurnOffMicrowave",
+        "TabletopTurnOnMicrowave",
+    ],
+    "robocasa.environments.tabletop.tabletop_microwave_door": [
+        "TabletopOpenMicrowaveDoor",
+        "TabletopCloseMicrowaveDoor",
+    ],
+    "robocasa.environments.tabletop.tabletop_multi_pnp": [
+        "PutAllObjectsInBasket",
+        "PutAllObjectsOnPlate",
+    ],
+    "robocasa.environments.tabletop.tabletop_object_showcase": [
+        "TabletopObjectShowcase",
+    ],
+    "robocasa.environments.tabletop.tabletop_laptop": [
+        "TabletopLaptopOpen",
+        "TabletopLaptopClose",
+    ],
+}
+# modules generating their task classes at import time. Any of their public names is exported, looked up
+# in this order
+_ENV_GENERATOR_MODULES = [
+    "robocasa.environments.tabletop.tabletop_24dc",
+    "robocasa.environments.tabletop.tabletop_5dc",
+]
+_ENV_NAME_TO_MODULE = {
+    name: module for module, names in _ENV_MODULES.items() for name in names
+}
 
 try:
     import mimicgen
@@ -133,3 +149,99 @@ __logo__ = """
     /[_]\  [~]\/    |//  |
      ] [   OOO      /o|__|
 """
+
+import robocasa.macros as macros
+
+
+def import_all_envs():
+    """
+    Imports all environment modules, registering all environments with robosuite
+    """
+    for module in list(_ENV_MODULES.keys()) + _ENV_GENERATOR_MODULES[::-1]:
+        importlib.import_module(module)
+
+
+def _is_submodule(name):
+    path = os.path.join(__path__[0], name)
+    return os.path.isdir(path) or os.path.exists(path + ".py")
+
+
+def _find_attr(name):
+    """
+    Imports the environment module exporting @name and returns the exported value
+    """
+    module = _ENV_NAME_TO_MODULE.get(name, None)
+    if module is not None:
+        return getattr(importlib.import_module(module), name)
+    # generators may define classes in the globals of another generator module (e.g. the PnP5* classes of
+    # tabletop_5dc are stored in tabletop_24dc), so all generators are imported before looking up @name
+    modules = [importlib.import_module(module) for module in _ENV_GENERATOR_MODULES]
+    for module in modules:
+        if hasattr(module, name):
+            return getattr(module, name)
+    raise AttributeError("module 'robocasa' has no attribute '{}'".format(name))
+
+
+def __getattr__(name):
+    # submodules (e.g. "from robocasa import macros") must be left to the import system, and private names
+    # never come from environment modules
+    if name.startswith("_") or _is_submodule(name):
+        raise AttributeError("module 'robocasa' has no attribute '{}'".format(name))
+    value = _find_attr(name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(_ENV_NAME_TO_MODULE.keys()))
+
+
+def get_env_class(env_name):
+    """
+    Returns the class of environment @env_name, importing the robocasa module defining it if it is not
+    registered with robosuite yet
+
+    Args:
+        env_name (str): environment name
+
+    Returns:
+        type: environment class
+    """
+    if env_name not in REGISTERED_ENVS:
+        try:
+            _find_attr(env_name)
+        except AttributeError:
+            pass
+    if env_name not in REGISTERED_ENVS:
+        # the environment may be defined in a module without being exported by robocasa
+        import_all_envs()
+    if env_name not in REGISTERED_ENVS:
+        raise ValueError(
+            "Environment {} not found. Make sure it is a registered environment among: {}".format(
+                env_name, ", ".join(REGISTERED_ENVS)
+            )
+        )
+    return REGISTERED_ENVS[env_name]
+
+
+def make(env_name, *args, **kwargs):
+    """
+    Same as robosuite.make, but resolves the class of environment @env_name with get_env_class, importing
+    the robocasa module defining it if needed. robosuite.make itself is left unchanged: it only finds
+    environments whose module has been imported, e.g. after import_all_envs()
+
+    Args:
+        env_name (str): environment name
+
+        *args: arguments of the environment class initializer
+
+        **kwargs: keyword arguments of the environment class initializer
+
+    Returns:
+        MujocoEnv: environment
+    """
+    return get_env_class(env_name)(*args, **kwargs)
+
+
+if not macros.LAZY_ENV_IMPORTS:
+    import_all_envs()
@@ -1,13 +1,19 @@
+import json
 import os
 import random
+import time
 import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from contextlib import nullcontext
 from copy import deepcopy
 
+import mujoco
 import numpy as np
 import robosuite
 import robosuite.utils.transform_utils as T
 from robosuite.environments.manipulation.manipulation_env import ManipulationEnv
 from robosuite.models.tasks import ManipulationTask
+from robosuite.utils.binding_utils import MjSim
 from robosuite.utils.errors import RandomizationError
 from robosuite.utils.mjcf_utils import (
     array_to_string,
@@ -20,14 +26,28 @@ from robosuite.environments.base import EnvMeta
 from scipy.spatial.transform import Rotation
 
 from robosuite.models.robots import PandaOmron
-import yaml
 
 import robocasa
 import robocasa.macros as macros
 from robocasa.models.scenes.scene_builder import FIXTURES
-from robocasa.models.scenes.scene_utils import initialize_fixture, load_style_config
+from robocasa.models.scenes.scene_utils import (
+    initialize_fixture,
+    load_style_config,
+    load_yaml,
+)
 import robocasa.utils.camera_utils as CamUtils
 import robocasa.utils.object_utils as OU
+import robocasa.utils.snapshot_utils as SnapshotUtils
+from robocasa.utils.contact_utils import ContactIndex
+from robocasa.utils.collision_utils import filter_static_collisions
+from robocasa.utils.asset_cache import AssetCache
+from robocasa.utils.asset_dedup import dedup_assets
+from robocasa.utils.physics_profiles import (
+    apply_physics_profile,
+    get_physics_profile,
+)
+from robocasa.utils.profiling_utils import StepProfiler
+from robocasa.utils.scene_bank import SceneBank
 import robocasa.models.scenes.scene_registry as SceneRegistry
 from robocasa.models.scenes import TabletopArena
 from robocasa.models.fixtures import *
@@ -35,6 +55,8 @@ from robocasa.models.robots import *
 from robocasa.models.objects.kitchen_object_utils import sample_kitchen_object
 from robocasa.models.objects.objects import MJCFObject
 from robocasa.utils.placement_samplers import (
+    ObjectPlacementError,
+    OccupancyRasterSampler,
     SequentialCompositeSampler,
     UniformRandomSampler,
 )
@@ -252,10 +274,81 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
             wrist and agentview cameras
 
         env_lang (str): kept for backwards compatibility
+
+        adaptive_settling (bool): if True, settling objects on reset stops as soon as all object joint
+            velocities fall below @settle_vel_threshold, instead of always running 10 control steps
+
+        settle_vel_threshold (float): maximum absolute object joint velocity for objects to be considered settled
+
+        max_settle_substeps (int): maximum number of simulation substeps used to settle objects on reset.
+            If None, defaults to 10 control steps
+
+        cache_settled_states (bool): if True, caches the settled simulation and controller state of each scene so that
+            resetting to the same scene and initial state skips settling altogether
+
+        freeze_far_distractors (bool): if True, distractor objects placed outside of the robot's reach
+            (see @distractor_reach_radius) are made static, which removes their free joints from the simulation.
+            Object placements are unaffected. The frozen distractors are recorded in the episode meta data and
+            frozen again when the episode is restored
+
+        distractor_reach_radius (float): horizontal distance from the robot base beyond which distractor
+            objects are considered out of reach
+
+        filter_fixture_collisions (bool): if True, the collision bitmasks of the model are rewritten so that
+            static fixture parts (and static distractors) are never tested for collisions against each other.
+            Collisions of robots, objects and moving fixture parts (doors, drawers) are unaffected
+
+        collision_lod (str): if set, overrides the collision level of detail of all objects, one of
+            ["full", "capped", "merged"]. Simplified variants are built with build_collision_lods.py
+
+        use_asset_cache (bool): if True, mesh and texture files of the compiled model are redirected to a
+            content-hashed cache of compile-ready files (see build_asset_cache.py). The redirection is applied
+            in edit_model_xml, so models returned by get_model_xml reference the source files
+
+        asset_cache_max_texture_res (int): maximum resolution of cached textures, larger textures are downscaled
+
+        dedup_assets (bool): if True, mesh, texture and material assets with identical content (e.g. from objects
+            sampled from the same model more than once) are merged into a single asset in the compiled model
+
+        physics_profile (str): named physics settings (solver options and lite physics), one of
+            ["accurate", "default", "fast"]. See robocasa/utils/physics_profiles.py
+
+        profile_steps (bool): if True, times the sections of each env step (physics substeps, controllers,
+            post action, reward, each observable sensor and camera render) into ring-buffered histograms, see
+            get_step_profile_stats and dump_step_profile
+
+        profiler_buffer_size (int): number of most recent samples kept per profiled section
+
+        scene_bank (str): (optional) directory of a scene bank of this environment (see build_scene_bank.py).
+            Scenes of the bank are loaded with reset_to_scene, without sampling or settling
+
+        placement_sampler (str): sampler of fixture and object placements, "uniform" for uniform rejection sampling
+            or "raster" to sample from the free cells of an occupancy raster of the region (OccupancyRasterSampler).
+            Can be overridden per placement with the "sampler" key of its placement config
     """
 
     VALID_LAYOUTS = [0, 1, 2, 3, 4, 5]
 
+    # stateful fixtures are only updated when one of their joints moved by more than this amount
+    FIXTURE_STATE_QPOS_TOL = 1e-6
+
+    # maximum number of settled scene states kept when cache_settled_states is enabled
+    SETTLED_STATE_CACHE_SIZE = 64
+
+    # caps of the staged retries of _load_model when fixtures or objects cannot be placed, from the cheapest
+    # (re-sampling object placements) to the most expensive stage (rebuilding the whole scene)
+    MAX_OBJECT_PLACEMENT_TRIES = 3
+    MAX_OBJECT_MODEL_RESAMPLES = 2
+    MAX_FIXTURE_PLACEMENT_TRIES = 10
+    MAX_FIXTURE_RESAMPLES = 2
+    MAX_SCENE_REBUILDS = 10
+
+    # placement samplers selectable with placement_sampler
+    PLACEMENT_SAMPLERS = {
+        "uniform": UniformRandomSampler,
+        "raster": OccupancyRasterSampler,
+    }
+
     def __init__(
         self,
         robots,
@@ -300,6 +393,22 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
         translucent_robot=False,
         randomize_cameras=False,
         env_lang="en",
+        adaptive_settling=False,
+        settle_vel_threshold=0.01,
+        max_settle_substeps=None,
+        cache_settled_states=False,
+        freeze_far_distractors=False,
+        distractor_reach_radius=0.9,
+        filter_fixture_collisions=False,
+        collision_lod=None,
+        use_asset_cache=False,
+        asset_cache_max_texture_res=1024,
+        dedup_assets=False,
+        physics_profile="default",
+        profile_steps=False,
+        profiler_buffer_size=1000,
+        scene_bank=None,
+        placement_sampler="uniform",
     ):
         self.init_robot_base_pos = init_robot_base_pos
 
@@ -336,6 +445,68 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
         self.translucent_robot = translucent_robot
         self.randomize_cameras = randomize_cameras
 
+        # settling of objects on reset
+        self.adaptive_settling = adaptive_settling
+        self.settle_vel_threshold = settle_vel_threshold
+        self.max_settle_substeps = max_settle_substeps
+        self.cache_settled_states = cache_settled_states
+        self._settled_state_cache = OrderedDict()
+        self.last_settle_substeps = None
+
+        # set while restoring a recorded episode with reset_to_state, along with the recorded
+        # (model xml, state)
+        self._restoring_state = False
+        self._restore_source = None
+
+        self.freeze_far_distractors = freeze_far_distractors
+        self.distractor_reach_radius = distractor_reach_radius
+        self.frozen_distractors = []
+
+        self.filter_fixture_collisions = filter_fixture_collisions
+        self.fixture_collision_filter_stats = None
+        self.collision_lod = collision_lod
+        self.asset_cache = (
+            AssetCache(max_texture_res=asset_cache_max_texture_res)
+            if use_asset_cache
+            else None
+        )
+        self.dedup_assets = dedup_assets
+        self.asset_dedup_stats = None
+
+        self.physics_profile = physics_profile
+        self._physics_profile_cfg = get_physics_profile(physics_profile)
+
+        self.step_profiler = (
+            StepProfiler(buffer_size=profiler_buffer_size) if profile_steps else None
+        )
+
+        self.scene_bank = SceneBank(scene_bank) if scene_bank is not None else None
+        if (
+            self.scene_bank is not None
+            and self.scene_bank.env_name != self.__class__.__name__
+        ):
+            raise ValueError(
+                "Scene bank {} holds scenes of {}, not {}".format(
+                    scene_bank, self.scene_bank.env_name, self.__class__.__name__
+                )
+            )
+
+        if placement_sampler not in self.PLACEMENT_SAMPLERS:
+            raise ValueError(
+                "Invalid placement sampler: {}. Must be one of {}".format(
+                    placement_sampler, list(self.PLACEMENT_SAMPLERS.keys())
+                )
+            )
+        self.placement_sampler = placement_sampler
+
+        # number of times each stage of the placement retries of _load_model was triggered
+        self.placement_retry_stats = dict(
+            object_placement=0,
+            object_model=0,
+            fixture_placement=0,
+            scene=0,
+        )
+
         # intialize cameras
         self._cam_configs = deepcopy(CamUtils.CAM_CONFIGS)
 
@@ -381,7 +552,7 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
             render_visual_mesh=render_visual_mesh,
             render_gpu_device_id=render_gpu_device_id,
             control_freq=control_freq,
-            lite_physics=True,
+            lite_physics=self._physics_profile_cfg["lite_physics"],
             horizon=horizon,
             ignore_done=ignore_done,
             hard_reset=hard_reset,
@@ -394,6 +565,11 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
             seed=seed,
         )
 
+        if self.step_profiler is not None:
+            self._check_success = self.step_profiler.wrap(
+                "check_success", self._check_success
+            )
+
     def _load_model_monitor_wrapper(func):
         """Wrapper to count number of times _load_model is called"""
 
@@ -414,7 +590,33 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
     @_load_model_monitor_wrapper
     def _load_model(self, reload=True):
         """
-        Loads an xml model, puts it in self.model
+        Loads an xml model, puts it in self.model. If fixtures or objects cannot be placed, only the failing
+        placement stage is retried (see _place_objects), and the whole scene is rebuilt as a last resort, up to
+        MAX_SCENE_REBUILDS times
+
+        Raises:
+            RandomizationError: [Cannot place fixtures and objects]
+        """
+        for i in range(self.MAX_SCENE_REBUILDS + 1):
+            if i > 0:
+                self.placement_retry_stats["scene"] += 1
+                if macros.VERBOSE:
+                    print("Rebuilding the scene. Try #{}".format(i))
+            if self._build_scene():
+                return
+        raise RandomizationError(
+            "Could not place fixtures and objects after {} scene rebuilds".format(
+                self.MAX_SCENE_REBUILDS
+            )
+        )
+
+    def _build_scene(self):
+        """
+        Samples layout and style, builds the arena, fixtures and objects and places them.
+        Helper function called by _load_model()
+
+        Returns:
+            bool: True if all fixtures and objects were placed, False if the scene must be rebuilt
         """
         super()._load_model()
 
@@ -471,6 +673,7 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
         self.fixture_cfgs = self.mujoco_arena.get_fixture_cfgs()
         self.fixture_cfgs.extend(self._get_distractor_fixture_cfgs())
         self.fixtures = {cfg["name"]: cfg["model"] for cfg in self.fixture_cfgs}
+        self._fixture_index = None
 
         # setup scene, robots, objects
         self.model = ManipulationTask(
@@ -480,11 +683,66 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
         )
 
         # setup fixture locations
+        robot_base_pos = self._place_fixtures()
+        if robot_base_pos is None:
+            return False
+
+        # create and place objects
+        self._create_objects()
+
+        # setup object locations
+        self.frozen_distractors = []
+        if self._restoring_state:
+            # object poses come from the recorded simulation state, no need to sample them. Subclasses
+            # still look objects up in the placements while building the model
+            self.placement_initializer = self._get_placement_initializer(
+                self.object_cfgs
+            )
+            model_xml, state = self._restore_source
+            poses = OU.get_recorded_body_poses(
+                model_xml, state, [obj.root_body for obj in self.objects.values()]
+            )
+            self.object_placements = {
+                name: (*poses[obj.root_body], obj) for name, obj in self.objects.items()
+            }
+            # the recorded model has no joints for the distractors that were frozen when it was built
+            for obj_name in self._ep_meta.get("frozen_distractors", []):
+                self._freeze_object(obj_name)
+            return True
+        for i in range(self.MAX_FIXTURE_RESAMPLES + 1):
+            if i > 0:
+                # objects may fit with a different arrangement of the fixtures they are placed on
+                self.placement_retry_stats["fixture_placement"] += 1
+                if macros.VERBOSE:
+                    print("Re-sampling fixture placements. Try #{}".format(i))
+                robot_base_pos = self._place_fixtures()
+                if robot_base_pos is None:
+                    return False
+            if self._place_objects():
+                break
+        else:
+            return False
+
+        if (
+            self.freeze_far_distractors
+            or len(self._ep_meta.get("frozen_distractors", [])) > 0
+        ):
+            self._freeze_far_distractors(robot_base_pos)
+        return True
+
+    def _place_fixtures(self):
+        """
+        Samples fixture placements, up to MAX_FIXTURE_PLACEMENT_TRIES times, and places the fixtures and the
+        robot base accordingly. Helper function called by _build_scene()
+
+        Returns:
+            np.array: robot base position, None if the fixtures could not be placed
+        """
         fxtr_placement_initializer = self._get_placement_initializer(
             self.fixture_cfgs, z_offset=0.0
         )
         fxtr_placements = None
-        for i in range(10):
+        for i in range(self.MAX_FIXTURE_PLACEMENT_TRIES):
             try:
                 fxtr_placements = fxtr_placement_initializer.sample()
             except RandomizationError as e:
@@ -494,9 +752,8 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
             break
         if fxtr_placements is None:
             if macros.VERBOSE:
-                print("Could not place fixtures. Trying again with self._load_model()")
-            self._load_model()
-            return
+                print("Could not place fixtures")
+            return None
         self.fxtr_placements = fxtr_placements
         # Loop through all objects and reset their positions
         for obj_pos, obj_quat, obj in fxtr_placements.values():
@@ -505,6 +762,8 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
 
             # hacky code to set orientation
             obj.set_euler(T.mat2euler(T.quat2mat(T.convert_quat(obj_quat, "xyzw"))))
+        # fixture types and bounding boxes depend on placement, rebuild lookups
+        self._fixture_index = None
 
         # setup internal references related to fixtures
         self._setup_table_references()
@@ -513,29 +772,149 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
         robot_model = self.robots[0].robot_model
         robot_model.set_base_xpos(robot_base_pos)
         robot_model.set_base_ori(robot_base_ori)
+        return robot_base_pos
 
-        # create and place objects
-        self._create_objects()
+    def _place_objects(self):
+        """
+        Samples object placements on top of the placed fixtures. If this fails, only the object placements are
+        re-sampled, up to MAX_OBJECT_PLACEMENT_TRIES times in total. Then the model of the object that could not
+        be placed is re-sampled and the placements are tried again, up to MAX_OBJECT_MODEL_RESAMPLES times.
+        Helper function called by _build_scene()
 
-        # setup object locations
-        self.placement_initializer = self._get_placement_initializer(self.object_cfgs)
-        object_placements = None
-        for i in range(1):
-            try:
-                object_placements = self.placement_initializer.sample(
-                    placed_objects=self.fxtr_placements
-                )
-            except RandomizationError as e:
+        Returns:
+            bool: True if all objects were placed
+        """
+        failed_obj_name = None
+        for i in range(self.MAX_OBJECT_MODEL_RESAMPLES + 1):
+            if i > 0:
+                if not self._resample_object_model(failed_obj_name):
+                    return False
+                self.placement_retry_stats["object_model"] += 1
                 if macros.VERBOSE:
-                    print(f"Randomization error in initial placement. {e}. Try #{i}")
+                    print(
+                        "Re-sampled the model of {}. Try #{}".format(failed_obj_name, i)
+                    )
+            self.placement_initializer = self._get_placement_initializer(
+                self.object_cfgs
+            )
+            for j in range(self.MAX_OBJECT_PLACEMENT_TRIES):
+                if j > 0:
+                    self.placement_retry_stats["object_placement"] += 1
+                # spawn sites used by the failed try are available again
+                for obj in self.objects.values():
+                    for spawn_id in range(len(obj.spawns)):
+                        obj.set_spawn_active(spawn_id, True)
+                try:
+                    self.object_placements = self.placement_initializer.sample(
+                        placed_objects=self.fxtr_placements
+                    )
+                    return True
+                except RandomizationError as e:
+                    if isinstance(e, ObjectPlacementError):
+                        failed_obj_name = e.obj_name
+                    if macros.VERBOSE:
+                        print(f"Randomization error in initial placement. {e}. Try #{j}")
+        if macros.VERBOSE:
+            print("Could not place objects")
+        return False
+
+    def _resample_object_model(self, obj_name):
+        """
+        Replaces the model of object @obj_name with a newly sampled model of the same category, so that the
+        task and its language description are unchanged. Helper function called by _place_objects()
+
+        Args:
+            obj_name (str): name of the object
+
+        Returns:
+            bool: True if the model was replaced, False if it cannot be re-sampled, e.g. because the objects
+                are given by the episode meta data
+        """
+        if obj_name not in self.objects or "object_cfgs" in self._ep_meta:
+            return False
+        cfg_index = [cfg["name"] for cfg in self.object_cfgs].index(obj_name)
+        cfg = {k: v for k, v in self.object_cfgs[cfg_index].items() if k != "info"}
+        sample_cfg = dict(cfg)
+        obj_groups = cfg.get("obj_groups", "all")
+        if not isinstance(obj_groups, (list, tuple)):
+            obj_groups = [obj_groups]
+        # objects given by their xml path are re-sampled among the given paths
+        if not all(isinstance(g, str) and g.endswith(".xml") for g in obj_groups):
+            sample_cfg["obj_groups"] = self.object_cfgs[cfg_index]["info"]["cat"]
+        try:
+            model, info = self._create_obj(sample_cfg)
+        except ValueError:
+            return False
+
+        # remove the old model and its assets from the scene
+        old_model = self.objects[obj_name]
+        self.model.worldbody.remove(old_model.get_obj())
+        merged_assets = list(self.model.asset)
+        for asset in old_model.asset:
+            if any(asset is merged for merged in merged_assets):
+                self.model.asset.remove(asset)
+
+        cfg["info"] = info
+        self.object_cfgs[cfg_index] = cfg
+        self.objects[obj_name] = model
+        self.model.merge_objects([model])
+        return True
+
+    def _freeze_far_distractors(self, robot_base_pos, z_offset=0.01):
+        """
+        Makes distractor objects that were placed outside of the robot's reach static, by removing their
+        free joint and fixing their body at the sampled placement. This removes their degrees of freedom
+        from the simulation, while leaving object placements unchanged. If the episode meta data lists the
+        frozen distractors of a recorded episode, exactly these are frozen.
+
+        Args:
+            robot_base_pos (np.array): position of the robot base
+
+            z_offset (float): vertical offset that was added to object placements, removed so that static
+                objects rest on their support instead of settling onto it
+        """
+        recorded = self._ep_meta.get("frozen_distractors", None)
+        for obj_name, (obj_pos, obj_quat, obj) in self.object_placements.items():
+            if not obj_name.startswith("distractor_obj"):
                 continue
-            break
-        if object_placements is None:
-            if macros.VERBOSE:
-                print("Could not place objects. Trying again with self._load_model()")
-            self._load_model()
-            return
-        self.object_placements = object_placements
+            if recorded is not None:
+                if obj_name not in recorded:
+                    continue
+            else:
+                dist = np.linalg.norm(
+                    np.array(obj_pos[:2]) - np.array(robot_base_pos[:2])
+                )
+                if dist <= self.distractor_reach_radius:
+                    continue
+            self._freeze_object(
+                obj_name, np.array(obj_pos) - np.array([0, 0, z_offset]), obj_quat
+            )
+
+        if macros.VERBOSE and len(self.frozen_distractors) > 0:
+            print("Froze out of reach distractors: {}".format(self.frozen_distractors))
+
+    def _freeze_object(self, obj_name, pos=None, quat=None):
+        """
+        Makes object @obj_name static by removing its joints, and adds it to @self.frozen_distractors
+
+        Args:
+            obj_name (str): name of the object
+
+            pos (np.array): if given, position at which the object body is fixed
+
+            quat (np.array): if given, orientation at which the object body is fixed
+        """
+        obj = self.objects[obj_name]
+        root_body = obj.get_obj()
+        for joint in root_body.findall("joint") + root_body.findall("freejoint"):
+            root_body.remove(joint)
+        obj._joints = []
+        if pos is not None:
+            root_body.set("pos", array_to_string(pos))
+        if quat is not None:
+            root_body.set("quat", array_to_string(quat))
+        if obj_name not in self.frozen_distractors:
+            self.frozen_distractors.append(obj_name)
 
     def _get_distractor_fixture_cfgs(self):
         """Returns configurations for distractor fixtures to be placed in the scene"""
@@ -543,9 +922,7 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
             return []
 
         # Load style config
-        style_path = SceneRegistry.get_style_path(self.style_id)
-        with open(style_path, "r") as f:
-            style = yaml.safe_load(f)
+        style = load_yaml(SceneRegistry.get_style_path(self.style_id))
 
         processed_configs = []
 
@@ -756,6 +1133,8 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
             object_scale=cfg.get("object_scale", None),
         )
         info = object_info
+        if self.collision_lod is not None:
+            object_kwargs["collision_lod"] = self.collision_lod
 
         object = MJCFObject(name=cfg["name"], **object_kwargs)
 
@@ -999,8 +1378,11 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
                 site_tree = ET.fromstring(site_str)
                 self.model.worldbody.append(site_tree)
 
+            sampler_cls = self.PLACEMENT_SAMPLERS[
+                placement.get("sampler", self.placement_sampler)
+            ]
             placement_initializer.append_sampler(
-                sampler=UniformRandomSampler(
+                sampler=sampler_cls(
                     name="{}_Sampler".format(cfg["name"]),
                     mujoco_objects=mj_obj,
                     x_range=x_range,
@@ -1066,30 +1448,125 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
             self.robots[0].composite_controller.reset()
             policy_step = False
 
-        # Loop through the simulation at the model timestep rate until we're ready to take the next policy step
-        # (as defined by the control frequency specified at the environment level)
-        for i in range(10 * int(self.control_timestep / self.model_timestep)):
-            self.sim.step1()
-            self._pre_action(action, policy_step)
-            self.sim.step2()
-            policy_step = False
+        settled_state_key = None
+        if self.cache_settled_states and not self._restoring_state:
+            settled_state_key = self._get_settled_state_key()
+        if self._restoring_state:
+            # the recorded simulation state is set right after the reset
+            self.last_settle_substeps = 0
+        elif settled_state_key in self._settled_state_cache:
+            # this scene has been settled before from the exact same initial state
+            # restore the controllers along with the physics, since settling also advances them
+            self._settled_state_cache.move_to_end(settled_state_key)
+            mj_state, attr_state = self._settled_state_cache[settled_state_key]
+            SnapshotUtils.set_mj_state(self.sim, mj_state)
+            SnapshotUtils.set_attr_state(
+                self._get_robot_snapshot_objects(), attr_state
+            )
+            self.last_settle_substeps = 0
+        else:
+            self.last_settle_substeps = self._settle_objects(action, policy_step)
+            if settled_state_key is not None:
+                self._settled_state_cache[settled_state_key] = (
+                    SnapshotUtils.get_mj_state(self.sim),
+                    SnapshotUtils.get_attr_state(
+                        self._get_robot_snapshot_objects(),
+                        self.sim,
+                        refs=[self, self.rng],
+                    ),
+                )
+                while len(self._settled_state_cache) > self.SETTLED_STATE_CACHE_SIZE:
+                    self._settled_state_cache.popitem(last=False)
+
+        if macros.VERBOSE:
+            print("Settled objects in {} substeps".format(self.last_settle_substeps))
 
         # Only needed for GR1
         if "GR1" in self.robots[0].name:
             for joint_name in ["robot0_l_elbow_pitch", "robot0_r_elbow_pitch"]:
-                l_elbow_pitch_id = self.sim.model.joint_name2id(joint_name)
+                l_elbow_pitch_id = self.robot_joint_id[joint_name]
                 l_elbow_pitch_range = self.sim.model.jnt_range[l_elbow_pitch_id]
-                self.sim.data.qpos[self.sim.model.get_joint_qpos_addr(joint_name)] = (
+                self.sim.data.qpos[self.robot_joint_qpos_addr[joint_name]] = (
                     l_elbow_pitch_range[0] * 0.7 + l_elbow_pitch_range[1] * 0.3
                 )
         elif "BDM1" in self.robots[0].name:
             for joint_name in ["robot0_larm.el", "robot0_rarm.el"]:
-                l_elbow_pitch_id = self.sim.model.joint_name2id(joint_name)
+                l_elbow_pitch_id = self.robot_joint_id[joint_name]
                 l_elbow_pitch_range = self.sim.model.jnt_range[l_elbow_pitch_id]
-                self.sim.data.qpos[self.sim.model.get_joint_qpos_addr(joint_name)] = (
+                self.sim.data.qpos[self.robot_joint_qpos_addr[joint_name]] = (
                     l_elbow_pitch_range[0] * 0.1 + l_elbow_pitch_range[1] * 0.9
                 )
 
+        self.invalidate_contact_index()
+
+    def _settle_objects(self, action, policy_step):
+        """
+        Steps through the simulation with the given action to let objects settle after being placed.
+        Runs for 10 control steps, or until all object joint velocities fall below
+        @self.settle_vel_threshold if adaptive settling is enabled
+
+        Args:
+            action (np.array): action to apply while settling
+
+            policy_step (bool): whether the first substep is a policy step
+
+        Returns:
+            int: number of simulation substeps taken
+        """
+        substeps_per_control_step = int(self.control_timestep / self.model_timestep)
+        max_substeps = self.max_settle_substeps
+        if max_substeps is None:
+            max_substeps = 10 * substeps_per_control_step
+
+        # Loop through the simulation at the model timestep rate until we're ready to take the next policy step
+        # (as defined by the control frequency specified at the environment level)
+        num_substeps = 0
+        while num_substeps < max_substeps:
+            self.sim.step1()
+            self._pre_action(action, policy_step)
+            self.sim.step2()
+            policy_step = False
+            num_substeps += 1
+
+            # check for settling once per control step
+            if (
+                self.adaptive_settling
+                and num_substeps % substeps_per_control_step == 0
+                and self._objects_settled()
+            ):
+                break
+        return num_substeps
+
+    def _objects_settled(self):
+        """
+        Returns:
+            bool: True if all object joint velocities are below @self.settle_vel_threshold
+        """
+        if len(self.obj_qvel_inds) == 0:
+            return True
+        obj_qvel = self.sim.data.qvel[self.obj_qvel_inds]
+        return np.max(np.abs(obj_qvel)) < self.settle_vel_threshold
+
+    def _get_settled_state_key(self):
+        """
+        Returns a key identifying the scene, the object models and the simulation state before
+        settling. Settling is deterministic given these, so states settled from the same key can be
+        reused
+        """
+        return (
+            self.layout_id,
+            self.style_id,
+            tuple(
+                sorted(
+                    (cfg["name"], cfg.get("info", {}).get("mjcf_path"))
+                    for cfg in self.object_cfgs
+                )
+            ),
+            self.sim.model.nq,
+            self.sim.model.nv,
+            self.sim.get_state().flatten().tobytes(),
+        )
+
     def _get_obj_cfgs(self):
         """
         Returns a list of object configurations to use in the environment.
@@ -1102,6 +1579,95 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
 
         return []
 
+    def reset_to_state(self, model_xml, ep_meta, state, model_binary_path=None):
+        """
+        Restores a recorded episode state. The scene described by @ep_meta is rebuilt without
+        sampling object placements (they are read from the recorded model and state instead), the
+        recorded model is compiled exactly once, and no settling is done since the simulation state
+        is overwritten right away. @ep_meta only applies to this restore: the episode meta data set
+        before is restored afterwards, so that later resets sample new scenes again.
+
+        Args:
+            model_xml (str): recorded mujoco scene xml
+
+            ep_meta (dict or str): recorded episode meta data (or its json encoding)
+
+            state (np.array): recorded flattened simulation state
+
+            model_binary_path (str): (optional) path to the compiled recorded model in MuJoCo's binary
+                format. If given, the model is loaded from it instead of compiling @model_xml
+
+        Returns:
+            OrderedDict: observations after restoring the state
+        """
+        if isinstance(ep_meta, (str, bytes)):
+            ep_meta = json.loads(ep_meta)
+        prev_ep_meta = self._ep_meta
+        self.set_ep_meta(ep_meta or {})
+
+        self._restoring_state = True
+        self._restore_source = (model_xml, state)
+        try:
+            # python-side scene (fixtures, objects, references), nothing is compiled here
+            self._load_model()
+
+            self.close()
+            if model_binary_path is not None:
+                # the binary model was compiled from an already processed xml
+                self.sim = MjSim(mujoco.MjModel.from_binary_path(model_binary_path))
+                self.sim.forward()
+                self.initialize_time(self.control_freq)
+            else:
+                self._initialize_sim(xml_string=self.edit_model_xml(model_xml))
+            self.deterministic_reset = True
+            self.reset()
+        finally:
+            self.deterministic_reset = False
+            self._restoring_state = False
+            self._restore_source = None
+            self.set_ep_meta(prev_ep_meta)
+
+        self.sim.set_state_from_flattened(state)
+        self.sim.forward()
+        self.invalidate_contact_index()
+        self.update_state()
+        return self._get_observations(force_update=True)
+
+    def reset_to_scene(self, index):
+        """
+        Loads scene @index of the scene bank. The scene is restored exactly as generated, without
+        sampling or settling
+
+        Args:
+            index (int): index of the scene in the bank
+
+        Returns:
+            OrderedDict: observations of the scene
+        """
+        if self.scene_bank is None:
+            raise ValueError("No scene bank set, pass scene_bank to the environment")
+        scene = self.scene_bank.load_scene(index)
+        return self.reset_to_state(
+            scene["model_xml"],
+            scene["ep_meta"],
+            scene["state"],
+            model_binary_path=scene["model_binary_path"],
+        )
+
+    def get_model_xml(self):
+        """
+        Returns the xml of the compiled model, to be recorded with the episode. Asset files redirected to the
+        asset cache are mapped back to their source files, so that recorded models do not depend on the cache
+        of this machine (the redirection is recomputed when the model is loaded again)
+
+        Returns:
+            str: model xml
+        """
+        model_xml = self.sim.model.get_xml()
+        if self.asset_cache is not None:
+            model_xml = self.asset_cache.restore_xml_string(model_xml)
+        return model_xml
+
     def get_ep_meta(self):
         """
         Returns a dictionary containing episode meta data
@@ -1131,6 +1697,7 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
             {k: v.name for (k, v) in self.fixture_refs.items()}
         )
         ep_meta["cam_configs"] = deepcopy(self._cam_configs)
+        ep_meta["frozen_distractors"] = list(self.frozen_distractors)
 
         return ep_meta
 
@@ -1338,6 +1905,9 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
                 new_joint = "mobilebase0_" + old_joint[6:]
                 elem.set("joint", new_joint)
 
+        # set timestep and solver options of the physics profile
+        apply_physics_profile(root, self._physics_profile_cfg)
+
         # result = ET.tostring(root, encoding="utf8").decode("utf8")
         result = ET.tostring(root).decode("utf8")
 
@@ -1367,8 +1937,39 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
                 self.rng, result, new_floor_texture_file=floor_tex
             )
 
+        if self.dedup_assets or self.asset_cache is not None:
+            root = ET.fromstring(result)
+            if self.dedup_assets:
+                self.asset_dedup_stats = dedup_assets(root)
+                if macros.VERBOSE:
+                    print("Deduplicated assets: {}".format(self.asset_dedup_stats))
+            if self.asset_cache is not None:
+                self.asset_cache.redirect_xml(root)
+            result = ET.tostring(root).decode("utf8")
+
+        if self.filter_fixture_collisions:
+            result, self.fixture_collision_filter_stats = filter_static_collisions(
+                result, self._get_static_collision_bodies()
+            )
+            if macros.VERBOSE:
+                print(
+                    "Filtered fixture collisions: {}".format(
+                        self.fixture_collision_filter_stats
+                    )
+                )
+
         return result
 
+    def _get_static_collision_bodies(self):
+        """
+        Returns:
+            list: names of the root bodies of all fixtures and static distractor objects, whose geoms
+                never need to be tested for collisions against each other
+        """
+        bodies = [fxtr.root_body for fxtr in self.fixtures.values()]
+        bodies += [self.objects[name].root_body for name in self.frozen_distractors]
+        return bodies
+
     def _setup_references(self):
         """
         Sets up references to important components. A reference is typically an
@@ -1381,6 +1982,107 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
         for name, model in self.objects.items():
             self.obj_body_id[name] = self.sim.model.body_name2id(model.root_body)
 
+        self._setup_id_tables()
+        self._setup_fixture_state_refs()
+
+    def _setup_id_tables(self):
+        """
+        Resolves the names of frequently accessed model elements to integer ids once per episode,
+        so that hot paths do not need to go through name lookups.
+
+        Sets up:
+            spawn_geom_id (dict): maps spawn geom names to geom ids
+            obj_spawn_geom_ids (dict): maps object names to the geom ids of their spawn regions
+            robot_joint_id (dict): maps robot joint names to joint ids
+            robot_joint_qpos_addr (dict): maps robot joint names to qpos addresses
+            obj_qvel_inds (np.array): qvel indices of all object joints
+
+        Objects that have no joints in the compiled model, e.g. distractors frozen in a recorded model that is
+        loaded into a differently sampled scene, are made static on the python side as well.
+        """
+        model = self.sim.model
+
+        model_joints = set(model.joint_names)
+        for name, obj in self.objects.items():
+            if len(obj.joints) > 0 and all(j not in model_joints for j in obj.joints):
+                self._freeze_object(name)
+
+        self.spawn_geom_id = {}
+        self.obj_spawn_geom_ids = {}
+        for name, obj in self.objects.items():
+            spawn_ids = []
+            for spawn in getattr(obj, "spawns", []):
+                geom_id = model.geom_name2id(spawn.get("name"))
+                self.spawn_geom_id[spawn.get("name")] = geom_id
+                spawn_ids.append(geom_id)
+            self.obj_spawn_geom_ids[name] = spawn_ids
+
+        self.obj_qvel_inds = []
+        for obj in self.objects.values():
+            for joint in obj.joints:
+                addr = model.get_joint_qvel_addr(joint)
+                if isinstance(addr, tuple):
+                    self.obj_qvel_inds.extend(range(addr[0], addr[1]))
+                else:
+                    self.obj_qvel_inds.append(addr)
+        self.obj_qvel_inds = np.array(self.obj_qvel_inds, dtype=int)
+
+        robot_prefixes = tuple(
+            robot.robot_model.naming_prefix for robot in self.robots
+        )
+        self.robot_joint_id = {}
+        self.robot_joint_qpos_addr = {}
+        for joint in model.joint_names:
+            if joint is None or not joint.startswith(robot_prefixes):
+                continue
+            self.robot_joint_id[joint] = model.joint_name2id(joint)
+            self.robot_joint_qpos_addr[joint] = model.get_joint_qpos_addr(joint)
+
+    def _setup_fixture_state_refs(self):
+        """
+        Collects the fixtures that have an internal state, along with the qpos indices of the joints
+        their state depends on. Stateless fixtures are never updated, and fixtures whose joints have
+        not moved since their last update are skipped
+        """
+        self._stateful_fixtures = []
+        for fixtr in self.fixtures.values():
+            if not getattr(fixtr, "is_stateful", True):
+                continue
+            joints = fixtr.get_state_joints() if isinstance(fixtr, Fixture) else None
+            qpos_inds = None
+            if joints is not None:
+                qpos_inds = []
+                for joint in joints:
+                    addr = self.sim.model.get_joint_qpos_addr(joint)
+                    if isinstance(addr, tuple):
+                        qpos_inds.extend(range(addr[0], addr[1]))
+                    else:
+                        qpos_inds.append(addr)
+                qpos_inds = np.array(qpos_inds, dtype=int)
+            # [fixture, qpos indices, qpos at last update]
+            self._stateful_fixtures.append([fixtr, qpos_inds, None])
+        self._fixture_state_sim = self.sim
+        self._fixture_update_stats = dict(
+            steps=0,
+            num_updated=0,
+            num_skipped=0,
+            time=0.0,
+        )
+
+    def get_fixture_update_stats(self):
+        """
+        Returns statistics on fixture state updates since the simulation was last set up
+
+        Returns:
+            dict: number of update_state calls, number of fixture updates performed and skipped,
+                and the average time spent updating fixtures per call (in seconds)
+        """
+        stats = dict(self._fixture_update_stats)
+        stats["num_stateful_fixtures"] = len(self._stateful_fixtures)
+        stats["num_fixtures"] = len(self.fixtures)
+        stats["time_per_step"] = stats["time"] / max(stats["steps"], 1)
+        return stats
+
     def _setup_observables(self):
         """
         Sets up observables to be used for this environment. Creates object-based observables if enabled
@@ -1429,6 +2131,14 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
                 active=active,
             )
 
+        if self.step_profiler is not None:
+            for name, observable in observables.items():
+                observable.set_sensor(
+                    self.step_profiler.wrap(
+                        "sensor/{}".format(name), observable._sensor
+                    )
+                )
+
         return observables
 
     def _create_obj_sensors(self, obj_name, modality="object"):
@@ -1515,12 +2225,245 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
                 - (bool) whether the current episode is completed or not
                 - (dict) information about the current state of the environment
         """
-        reward, done, info = super()._post_action(action)
+        with self._profile_section("reward"):
+            reward, done, info = super()._post_action(action)
 
         # Check if stove is turned on or not
-        self.update_state()
+        with self._profile_section("update_state"):
+            self.update_state()
         return reward, done, info
 
+    def _profile_section(self, name):
+        """
+        Returns:
+            context manager: times the enclosed code as section @name if step profiling is enabled
+        """
+        if self.step_profiler is None:
+            return nullcontext()
+        return self.step_profiler.section(name)
+
+    def step(self, action):
+        """
+        Takes a step in simulation with control command @action. If step profiling is enabled, the
+        sections of the step are timed
+        """
+        if self.step_profiler is None:
+            return super().step(action)
+        with self.step_profiler.section("step"):
+            return self._profiled_step(action)
+
+    def _profiled_step(self, action):
+        """
+        Same as robosuite's MujocoEnv.step, with each section of the step timed by the step profiler
+        """
+        if self.done:
+            raise ValueError("executing action in terminated episode")
+
+        self.timestep += 1
+        prof = self.step_profiler
+
+        policy_step = True
+        for i in range(int(self.control_timestep / self.model_timestep)):
+            if self.lite_physics:
+                with prof.section("sim_step1"):
+                    self.sim.step1()
+            else:
+                with prof.section("sim_forward"):
+                    self.sim.forward()
+            with prof.section("pre_action"):
+                self._pre_action(action, policy_step)
+            if self.lite_physics:
+                with prof.section("sim_step2"):
+                    self.sim.step2()
+            else:
+                with prof.section("sim_step"):
+                    self.sim.step()
+            with prof.section("update_observables"):
+                self._update_observables()
+            policy_step = False
+
+        # Note: this is done all at once to avoid floating point inaccuracies
+        self.cur_time += self.control_timestep
+
+        with prof.section("post_action"):
+            reward, done, info = self._post_action(action)
+
+        if self.viewer is not None and self.renderer != "mujoco":
+            self.viewer.update()
+        elif self.has_renderer and self.renderer == "mjviewer" and self.viewer is None:
+            # need to launch again after it was destroyed
+            self.initialize_renderer()
+            # so that mujoco viewer renders
+            self.viewer.update()
+
+        with prof.section("get_observations"):
+            observations = (
+                self.viewer._get_observations()
+                if self.viewer_get_obs
+                else self._get_observations()
+            )
+        return observations, reward, done, info
+
+    def get_step_profile_stats(self, histogram=True):
+        """
+        Returns:
+            dict: per-section step timing statistics (see StepProfiler.get_stats), or None if step
+                profiling is disabled
+        """
+        if self.step_profiler is None:
+            return None
+        return self.step_profiler.get_stats(histogram=histogram)
+
+    def dump_step_profile(self, path, **extra):
+        """
+        Appends the step timing statistics to a JSON lines file, one line per section
+
+        Args:
+            path (str): path to the file
+
+            extra (dict): additional fields written on every line
+        """
+        assert self.step_profiler is not None, "step profiling is disabled"
+        self.step_profiler.dump_jsonl(path, env_name=type(self).__name__, **extra)
+
+    def _get_contact_index(self):
+        """
+        Returns the contact index of the current simulation, creating it if needed
+
+        Returns:
+            ContactIndex: contact index
+        """
+        contact_index = getattr(self, "_contact_index", None)
+        if contact_index is None or contact_index.sim is not self.sim:
+            contact_index = ContactIndex(self.sim)
+            self._contact_index = contact_index
+        return contact_index
+
+    def invalidate_contact_index(self):
+        """
+        Forces contacts to be re-read on the next contact query. Calls to sim.forward and sim.step
+        already do so, this is only needed after writing to the contact buffer directly
+        """
+        if getattr(self, "_contact_index", None) is not None:
+            self._contact_index.invalidate()
+
+    def get_contact_index_stats(self):
+        """
+        Returns:
+            dict: number of contact queries, contact buffer scans, and scans avoided
+        """
+        return self._get_contact_index().get_stats()
+
+    def _get_robot_snapshot_objects(self):
+        """
+        Returns the robots and their controllers (composite controller, part controllers and
+        joint action policy), whose internal state evolves with the simulation
+        """
+        objs = []
+        for robot in self.robots:
+            objs.append(robot)
+            controller = robot.composite_controller
+            objs.append(controller)
+            objs.extend(controller.part_controllers.values())
+            joint_action_policy = getattr(controller, "joint_action_policy", None)
+            if joint_action_policy is not None:
+                objs.append(joint_action_policy)
+        return objs
+
+    def _get_snapshot_objects(self):
+        """
+        Returns the python objects whose internal state evolves with the simulation:
+        robots (history buffers), robot controllers, stateful fixtures and observables
+        """
+        objs = self._get_robot_snapshot_objects()
+        objs.extend(
+            fxtr
+            for fxtr in self.fixtures.values()
+            if getattr(fxtr, "is_stateful", False)
+        )
+        objs.extend(self._observables.values())
+        return objs
+
+    def snapshot(self):
+        """
+        Captures the current state of the environment in memory, so that rollouts can be branched
+        from it with restore(). Covers the full MuJoCo integration state (qpos, qvel, act, warmstart,
+        ctrl, mocap, ...), robot and controller internal state, fixture states, observable state, episode
+        counters and the environment rng. The model itself is not captured: snapshots can only be
+        restored into the same simulation they were taken from
+
+        Returns:
+            dict: snapshot of the environment
+        """
+        return dict(
+            sim=self.sim,
+            mj_state=SnapshotUtils.get_mj_state(self.sim),
+            attr_state=SnapshotUtils.get_attr_state(
+                self._get_snapshot_objects(), self.sim, refs=[self, self.rng]
+            ),
+            rng_state=deepcopy(self.rng.bit_generator.state),
+            timestep=self.timestep,
+            cur_time=self.cur_time,
+            done=self.done,
+        )
+
+    def restore(self, snap):
+        """
+        Restores a snapshot taken with snapshot(). No model is recompiled, so this is only valid
+        while the simulation the snapshot was taken from is still loaded
+
+        Args:
+            snap (dict): snapshot of the environment
+        """
+        if snap["sim"] is not self.sim:
+            raise ValueError(
+                "Snapshot was taken from a different simulation. "
+                "Use reset_to to restore states across model reloads"
+            )
+        SnapshotUtils.set_mj_state(self.sim, snap["mj_state"])
+        SnapshotUtils.set_attr_state(self._get_snapshot_objects(), snap["attr_state"])
+        self.rng.bit_generator.state = deepcopy(snap["rng_state"])
+        self.timestep = snap["timestep"]
+        self.cur_time = snap["cur_time"]
+        self.done = snap["done"]
+
+        # derived caches no longer match the restored state
+        self._obs_cache = {}
+        self.invalidate_contact_index()
+        for entry in getattr(self, "_stateful_fixtures", []):
+            entry[2] = None
+
+    def check_contact(self, geoms_1, geoms_2=None):
+        """
+        Finds contact between two geom groups. All contact queries made within the same
+        simulation step share a single scan of the contact buffer
+
+        Args:
+            geoms_1 (str or list of str or MujocoModel): an individual geom name or list of geom names or a model. If
+                a MujocoModel is specified, the geoms checked will be its contact_geoms
+
+            geoms_2 (str or list of str or MujocoModel or None): another individual geom name or list of geom names.
+                If a MujocoModel is specified, the geoms checked will be its contact_geoms. If None, will check
+                any collision with @geoms_1 to any other geom in the environment
+
+        Returns:
+            bool: True if any geom in @geoms_1 is in contact with any geom in @geoms_2.
+        """
+        return self._get_contact_index().check_contact(geoms_1, geoms_2)
+
+    def get_contacts(self, model):
+        """
+        Checks for any contacts with @model (as defined by @model's contact_geoms) and returns the set of
+        geom names currently in contact with that model (excluding the geoms that are part of the model itself).
+
+        Args:
+            model (MujocoModel): Model to check contacts for.
+
+        Returns:
+            set: Unique geoms that are actively in contact with this model.
+        """
+        return self._get_contact_index().get_contacts(model)
+
     def convert_rel_to_abs_action(self, rel_action):
         # if moving mobile base, there is no notion of absolute actions.
         # use relative actions instead.
@@ -1549,8 +2492,29 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
         """
         super().update_state()
 
-        for fixtr in self.fixtures.values():
+        if getattr(self, "_fixture_state_sim", None) is not self.sim:
+            self._setup_fixture_state_refs()
+
+        start = time.perf_counter()
+        qpos = self.sim.data.qpos
+        num_updated = 0
+        for entry in self._stateful_fixtures:
+            fixtr, qpos_inds, last_qpos = entry
+            if qpos_inds is not None:
+                cur_qpos = qpos[qpos_inds]
+                if last_qpos is not None and np.all(
+                    np.abs(cur_qpos - last_qpos) <= self.FIXTURE_STATE_QPOS_TOL
+                ):
+                    continue
+                entry[2] = cur_qpos
             fixtr.update_state(self)
+            num_updated += 1
+
+        stats = self._fixture_update_stats
+        stats["steps"] += 1
+        stats["num_updated"] += num_updated
+        stats["num_skipped"] += len(self._stateful_fixtures) - num_updated
+        stats["time"] += time.perf_counter() - start
 
     def visualize(self, vis_settings):
         """
@@ -1679,6 +2643,23 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
                 return True
         return False
 
+    def get_fixture_index(self):
+        """
+        Returns the lookup index over the fixtures of the current scene, building it if needed
+
+        Returns:
+            FixtureIndex: fixture index
+        """
+        fixture_index = getattr(self, "_fixture_index", None)
+        if (
+            fixture_index is None
+            or fixture_index.fixtures is not self.fixtures
+            or len(fixture_index) != len(self.fixtures)
+        ):
+            fixture_index = FixtureIndex(self.fixtures)
+            self._fixture_index = fixture_index
+        return fixture_index
+
     def get_fixture(self, id, ref=None, size=(0.2, 0.2)):
         """
         search fixture by id (name, object, or type)
@@ -1700,16 +2681,13 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
         elif id in self.fixtures.keys():
             return self.fixtures[id]
 
+        fixture_index = self.get_fixture_index()
         if ref is None:
             # find all fixtures with names containing given name
             if isinstance(id, FixtureType) or isinstance(id, int):
-                matches = [
-                    name
-                    for (name, fxtr) in self.fixtures.items()
-                    if fixture_is_type(fxtr, id)
-                ]
+                matches = fixture_index.names_of_type(id)
             else:
-                matches = [name for name in self.fixtures.keys() if id in name]
+                matches = fixture_index.names_containing(id)
             if id == FixtureType.COUNTER or id == FixtureType.COUNTER_NON_CORNER:
                 matches = [
                     name
@@ -1725,9 +2703,8 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
 
             assert isinstance(id, FixtureType)
             cand_fixtures = []
-            for fxtr in self.fixtures.values():
-                if not fixture_is_type(fxtr, id):
-                    continue
+            for name in fixture_index.names_of_type(id):
+                fxtr = self.fixtures[name]
                 if fxtr is ref_fixture:
                     continue
                 if id == FixtureType.COUNTER:
@@ -1741,9 +2718,7 @@ class Tabletop(ManipulationEnv, metaclass=TabletopEnvMeta):
                 if OU.point_in_fixture(ref_fixture.pos, fxtr, only_2d=True):
                     return fxtr
             # if no fixture contains reference fixture, sample all close fixtures
-            dists = [
-                OU.fixture_pairwise_dist(ref_fixture, fxtr) for fxtr in cand_fixtures
-            ]
+            dists = fixture_index.pairwise_dists(ref_fixture, cand_fixtures)
             min_dist = np.min(dists)
             close_fixtures = [
                 fxtr for (fxtr, d) in zip(cand_fixtures, dists) if d - min_dist < 0.10
@@ -680,9 +680,8 @@ def create_pnp_class(
 
         current_qpos = self.sim.data.qpos.copy()
 
-        for name in self.sim.model.joint_names:
+        for name, qpos_addr in self.robot_joint_qpos_addr.items():
             if "robot0_" in name:
-                joint_id = self.sim.model.joint_name2id(name)
                 if name in cotrain_qpos:
                     # For joints in COTRAIN_REAL_MATCHED_ROBOT_INITIAL_POSE, apply pos + randomization
                     new_pos = cotrain_qpos[name] + self.rng.uniform(
@@ -690,8 +689,8 @@ def create_pnp_class(
                     )
                 else:
                     # For other joints, use current pos
-                    new_pos = current_qpos[joint_id]
-                self.sim.data.qpos[joint_id] = new_pos
+                    new_pos = current_qpos[qpos_addr]
+                self.sim.data.qpos[qpos_addr] = new_pos
 
         self.sim.forward()
 
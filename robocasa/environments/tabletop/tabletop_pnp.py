@@ -1968,11 +1968,11 @@ class PnPMilkPlateToPlateCotrain(PnPMilkPlateToPlate):
         super()._reset_internal()
         # Randomization for joints
         joint_rand_strength = 0.2
-        rand_joint_names = []
-        for name in self.sim.model.joint_names:
-            if "robot0_" in name:
-                rand_joint_names.append(name)
-        joint_ids = [self.sim.model.joint_name2id(name) for name in rand_joint_names]
+        joint_ids = [
+            qpos_addr
+            for name, qpos_addr in self.robot_joint_qpos_addr.items()
+            if "robot0_" in name
+        ]
         joint_pos = np.array(COTRAIN_REAL_MATCHED_ROBOT_INITIAL_POSE)
         new_joint_pos = np.array(joint_pos) + self.rng.uniform(
             -joint_rand_strength, joint_rand_strength, len(joint_pos)
@@ -2068,11 +2068,11 @@ class PnPAppleToPlateCotrain(PnPAppleToPlate):
         super()._reset_internal()
         # Randomization for joints
         joint_rand_strength = 0.2
-        rand_joint_names = []
-        for name in self.sim.model.joint_names:
-            if "robot0_" in name:
-                rand_joint_names.append(name)
-        joint_ids = [self.sim.model.joint_name2id(name) for name in rand_joint_names]
+        joint_ids = [
+            qpos_addr
+            for name, qpos_addr in self.robot_joint_qpos_addr.items()
+            if "robot0_" in name
+        ]
         joint_pos = np.array(COTRAIN_REAL_MATCHED_ROBOT_INITIAL_POSE)
         new_joint_pos = np.array(joint_pos) + self.rng.uniform(
             -joint_rand_strength, joint_rand_strength, len(joint_pos)
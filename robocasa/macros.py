@@ -18,6 +18,22 @@ SPACEMOUSE_PRODUCT_ID = 50741
 
 DATASET_BASE_PATH = None
 
+# whether to reuse procedurally generated fixture models across scene rebuilds.
+# fixtures with identical configurations are deep-copied from a cached template
+# instead of regenerating their xml from scratch
+CACHE_FIXTURE_MODELS = True
+# maximum number of fixture templates kept in the cache
+FIXTURE_MODEL_CACHE_SIZE = 512
+
+# directory of the content-hashed cache of converted mesh and texture files (see utils/asset_cache.py).
+# if None, defaults to ~/.cache/robocasa/assets
+ASSET_CACHE_DIR = None
+
+# whether to import environment modules on first use of one of their environments instead of when importing
+# robocasa. code iterating over robosuite's registered environments or calling robosuite.make instead of robocasa.make
+# must call robocasa.import_all_envs() first
+LAZY_ENV_IMPORTS = True
+
 try:
     from robocasa.macros_private import *
 except ImportError:
@@ -7,4 +7,4 @@ from robocasa.models.fixtures.microwave import Microwave
 from robocasa.models.fixtures.counter import Counter
 from robocasa.models.fixtures.fixture_stack import FixtureStack
 
-from robocasa.models.fixtures.fixture_utils import fixture_is_type
+from robocasa.models.fixtures.fixture_utils import fixture_is_type, FixtureIndex
@@ -826,6 +826,12 @@ class Drawer(Cabinet):
             )
         self.set_bounds_sites(int_sites)
 
+    def get_state_joints(self):
+        """
+        the interior bounding box only moves with the drawer slide joint
+        """
+        return ["{}_slidejoint".format(self.name)]
+
     def set_door_state(self, min, max, env, rng):
         """
         Sets how open the drawer is. Chooses a random amount between min and max.
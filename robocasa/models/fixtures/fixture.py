@@ -248,6 +248,23 @@ class Fixture(MujocoXMLObject):
         """
         return
 
+    @property
+    def is_stateful(self):
+        """
+        whether the fixture has an internal state that needs to be updated during simulation.
+        by default, fixtures that override update_state are considered stateful
+        """
+        return type(self).update_state is not Fixture.update_state
+
+    def get_state_joints(self):
+        """
+        returns the names of the joints that the fixture state is computed from. the environment
+        only calls update_state when one of these joints has moved. returns None if the state
+        depends on more than joint positions (e.g. gripper contacts), in which case update_state
+        is called every step
+        """
+        return None
+
     @property
     def pos(self):
         return string_to_array(self._obj.get("pos"))
@@ -1,3 +1,5 @@
+import numpy as np
+
 from robocasa.models.fixtures import *
 
 
@@ -104,3 +106,82 @@ def fixture_is_type(fixture, fixture_type):
         return isinstance(fixture, Counter) and "corner" not in fixture.name
     else:
         raise ValueError
+
+
+class FixtureIndex:
+    """
+    Lookup structure over the fixtures of a scene. Matches by type and by name are computed
+    once per query and reused, and the exterior bounding box points of all fixtures are cached
+    so that distances between fixtures can be computed in a single vectorized operation.
+
+    The index must be rebuilt whenever fixtures are added or moved
+
+    Args:
+        fixtures (dict): maps fixture names to fixture objects
+    """
+
+    def __init__(self, fixtures):
+        self.fixtures = fixtures
+        self.names = list(fixtures.keys())
+        self._type_matches = dict()
+        self._name_matches = dict()
+        self._ext_points = dict()
+
+    def __len__(self):
+        return len(self.names)
+
+    def names_of_type(self, fixture_type):
+        """
+        Returns:
+            list: names of fixtures of the given type, in scene order
+        """
+        if fixture_type not in self._type_matches:
+            self._type_matches[fixture_type] = [
+                name
+                for (name, fxtr) in self.fixtures.items()
+                if fixture_is_type(fxtr, fixture_type)
+            ]
+        return self._type_matches[fixture_type]
+
+    def names_containing(self, substring):
+        """
+        Returns:
+            list: names of fixtures whose name contains the given string, in scene order
+        """
+        if substring not in self._name_matches:
+            self._name_matches[substring] = [
+                name for name in self.names if substring in name
+            ]
+        return self._name_matches[substring]
+
+    def ext_points(self, fixture):
+        """
+        Returns:
+            np.array: (8, 3) array of the exterior bounding box points of the fixture in world frame
+        """
+        key = id(fixture)
+        if key not in self._ext_points:
+            self._ext_points[key] = np.array(
+                fixture.get_ext_sites(all_points=True, relative=False)
+            )
+        return self._ext_points[key]
+
+    def pairwise_dists(self, ref, fixtures):
+        """
+        Computes the distance between a reference fixture and each given fixture, as the
+        minimum distance between their exterior bounding box points
+
+        Args:
+            ref (Fixture): reference fixture
+
+            fixtures (list): fixtures to compute the distance to
+
+        Returns:
+            np.array: distance to each fixture
+        """
+        if len(fixtures) == 0:
+            return np.zeros(0)
+        ref_points = self.ext_points(ref)
+        points = np.stack([self.ext_points(fxtr) for fxtr in fixtures])
+        diffs = points[:, :, None, :] - ref_points[None, None, :, :]
+        return np.min(np.linalg.norm(diffs, axis=-1), axis=(1, 2))
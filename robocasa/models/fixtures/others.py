@@ -84,6 +84,10 @@ class Box(BoxObject):
         self.pos = pos
         self._obj.set("pos", a2s(pos))
 
+    @property
+    def is_stateful(self):
+        return False
+
     def update_state(self, env):
         pass
 
@@ -250,6 +254,10 @@ class Wall(BoxObject):
             raise ValueError()
         return side_rots[self.wall_side]
 
+    @property
+    def is_stateful(self):
+        return False
+
     def update_state(self, env):
         pass
 
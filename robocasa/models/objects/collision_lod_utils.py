@@ -0,0 +1,277 @@
+"""
+Utilities for building simplified collision variants (levels of detail) of object models.
+
+Variants are written next to the original model.xml as model_lod_<lod>.xml and only differ in their
+collision geoms, so visual appearance, sites and spawn regions are unchanged:
+    - "capped": each collision mesh keeps its convex pieces, but the convex hull of every piece is capped
+        to a maximum number of vertices (mesh maxhullvert)
+    - "merged": all convex pieces of the object are merged into a single convex hull, capped to a maximum
+        number of vertices
+"""
+
+import os
+import struct
+import xml.etree.ElementTree as ET
+from copy import deepcopy
+
+import numpy as np
+from robosuite.utils.mjcf_utils import array_to_string, string_to_array
+from scipy.spatial import ConvexHull
+
+import robocasa.macros as macros
+from robocasa.utils.collision_utils import (
+    get_collision_mask,
+    get_default_classes,
+    get_geom_attrib,
+)
+
+# "full" refers to the original model.xml
+COLLISION_LODS = ("full", "capped", "merged")
+MERGED_MESH_NAME = "collision_lod_merged"
+
+
+def get_collision_lod_path(mjcf_path, lod):
+    """
+    Returns the path of the collision variant @lod of an object model
+
+    Args:
+        mjcf_path (str): path to the original model.xml
+
+        lod (str or None): collision level of detail, one of COLLISION_LODS. None is the same as "full"
+
+    Returns:
+        str: path to the variant xml
+    """
+    if lod is None or lod == "full":
+        return mjcf_path
+    if lod not in COLLISION_LODS:
+        raise ValueError(
+            "Invalid collision lod: {}. Must be one of {}".format(lod, COLLISION_LODS)
+        )
+    return os.path.join(os.path.dirname(mjcf_path), "model_lod_{}.xml".format(lod))
+
+
+def resolve_collision_lod_path(mjcf_path, lod):
+    """
+    Same as get_collision_lod_path, but falls back to the original model if the variant has not been built
+
+    Returns:
+        str: path to the xml to load
+    """
+    lod_path = get_collision_lod_path(mjcf_path, lod)
+    if not os.path.exists(lod_path):
+        if macros.VERBOSE:
+            print(
+                "Collision lod {} not built for {}, using full model".format(
+                    lod, mjcf_path
+                )
+            )
+        return mjcf_path
+    return lod_path
+
+
+def load_mesh_vertices(path):
+    """
+    Loads the vertices of an OBJ or STL (binary or ascii) mesh file
+
+    Returns:
+        np.array: (N, 3) vertices
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".obj":
+        verts = []
+        with open(path, "r") as f:
+            for line in f:
+                if line.startswith("v "):
+                    verts.append([float(x) for x in line.split()[1:4]])
+        return np.array(verts).reshape(-1, 3)
+    if ext == ".stl":
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) >= 84:
+            n_tri = struct.unpack("<I", data[80:84])[0]
+            if len(data) == 84 + 50 * n_tri:
+                tris = np.frombuffer(
+                    data[84:],
+                    dtype=np.dtype(
+                        [("normal", "<f4", 3), ("v", "<f4", (3, 3)), ("attr", "<u2")]
+                    ),
+                    count=n_tri,
+                )
+                return tris["v"].reshape(-1, 3).astype(np.float64)
+        verts = [
+            [float(x) for x in line.split()[1:4]]
+            for line in data.decode("utf8", errors="ignore").splitlines()
+            if line.strip().startswith("vertex")
+        ]
+        return np.array(verts).reshape(-1, 3)
+    raise ValueError("Unsupported mesh format: {}".format(path))
+
+
+def _quat_to_mat(quat):
+    """
+    Converts a MuJoCo (w, x, y, z) quaternion to a rotation matrix
+    """
+    w, x, y, z = np.array(quat) / np.linalg.norm(quat)
+    return np.array(
+        [
+            [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+            [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+            [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+        ]
+    )
+
+
+def _is_collision_mesh_geom(classes, geom, class_name):
+    """
+    Returns whether @geom is a mesh that collides with anything, with its type and collision bitmasks
+    resolved through the default classes of the model
+    """
+    return get_geom_attrib(
+        classes, geom, class_name, "type"
+    ) == "mesh" and get_collision_mask(classes, geom, class_name) != (0, 0)
+
+
+def _get_collision_geoms(root):
+    """
+    Returns:
+        list: (parent body, geom) for every collision mesh geom of the model, in document order
+    """
+    classes = get_default_classes(root)
+    pairs = []
+
+    def _add(body, childclass):
+        childclass = body.get("childclass", childclass)
+        for geom in body.findall("geom"):
+            if _is_collision_mesh_geom(
+                classes, geom, geom.get("class", childclass)
+            ):
+                pairs.append((body, geom))
+        for child in body.findall("body"):
+            _add(child, childclass)
+
+    for body in root.find("worldbody").findall("body"):
+        _add(body, "main")
+    return pairs
+
+
+def _get_mesh_dir(root, mjcf_path):
+    compiler = root.find("compiler")
+    mesh_dir = ""
+    if compiler is not None:
+        mesh_dir = compiler.get("meshdir", compiler.get("assetdir", ""))
+    return os.path.join(os.path.dirname(mjcf_path), mesh_dir)
+
+
+def build_capped_lod(root, max_hull_vertices):
+    """
+    Caps the convex hull of every collision mesh of the model
+
+    Returns:
+        ET.Element: root of the variant model, or None if the model has no collision meshes
+    """
+    root = deepcopy(root)
+    mesh_names = set(geom.get("mesh") for (_, geom) in _get_collision_geoms(root))
+    if len(mesh_names) == 0:
+        return None
+    for mesh in root.find("asset").findall("mesh"):
+        if mesh.get("name") in mesh_names:
+            mesh.set("maxhullvert", str(max_hull_vertices))
+    return root
+
+
+def build_merged_lod(root, mjcf_path, max_hull_vertices):
+    """
+    Replaces all collision meshes of the model by the convex hull of their union
+
+    Returns:
+        ET.Element: root of the variant model, or None if the collision geoms can't be merged (no collision
+            meshes, pieces attached to different bodies, or unsupported geom frames)
+    """
+    root = deepcopy(root)
+    pairs = _get_collision_geoms(root)
+    if len(pairs) == 0 or len(set(id(body) for (body, _) in pairs)) > 1:
+        return None
+
+    asset = root.find("asset")
+    meshes = {mesh.get("name"): mesh for mesh in asset.findall("mesh")}
+    mesh_dir = _get_mesh_dir(root, mjcf_path)
+
+    all_verts = []
+    for _, geom in pairs:
+        if any(
+            geom.get(k) is not None for k in ("euler", "axisangle", "xyaxes", "zaxis")
+        ):
+            return None
+        mesh = meshes[geom.get("mesh")]
+        if mesh.get("vertex") is not None:
+            verts = string_to_array(mesh.get("vertex")).reshape(-1, 3)
+        else:
+            verts = load_mesh_vertices(os.path.join(mesh_dir, mesh.get("file")))
+        if mesh.get("scale") is not None:
+            verts = verts * string_to_array(mesh.get("scale"))
+        if geom.get("quat") is not None:
+            verts = verts @ _quat_to_mat(string_to_array(geom.get("quat"))).T
+        if geom.get("pos") is not None:
+            verts = verts + string_to_array(geom.get("pos"))
+        all_verts.append(verts)
+    all_verts = np.concatenate(all_verts, axis=0)
+    hull_verts = all_verts[ConvexHull(all_verts).vertices]
+
+    # keep the first collision geom (and its attributes) as the merged geom, remove the other collision
+    # geoms. Visual geoms are left untouched
+    body, merged_geom = pairs[0]
+    for _, geom in pairs[1:]:
+        body.remove(geom)
+    for k in ("pos", "quat"):
+        merged_geom.attrib.pop(k, None)
+    merged_geom.set("mesh", MERGED_MESH_NAME)
+
+    used_meshes = set(geom.get("mesh") for geom in root.find("worldbody").iter("geom"))
+    for name, mesh in meshes.items():
+        if name not in used_meshes:
+            asset.remove(mesh)
+    merged_mesh = ET.SubElement(asset, "mesh")
+    merged_mesh.set("name", MERGED_MESH_NAME)
+    merged_mesh.set("vertex", array_to_string(np.round(hull_verts.flatten(), 6)))
+    merged_mesh.set("maxhullvert", str(max_hull_vertices))
+    return root
+
+
+def build_collision_lods(
+    mjcf_path, lods=("capped", "merged"), max_hull_vertices=32, overwrite=False
+):
+    """
+    Builds the collision variants of an object model and writes them next to the model
+
+    Args:
+        mjcf_path (str): path to the original model.xml
+
+        lods (tuple): variants to build
+
+        max_hull_vertices (int): maximum number of vertices of each convex hull
+
+        overwrite (bool): if True, rebuilds variants that already exist
+
+    Returns:
+        dict: maps each variant to one of "built", "exists" or "skipped"
+    """
+    root = ET.parse(mjcf_path).getroot()
+    status = dict()
+    for lod in lods:
+        lod_path = get_collision_lod_path(mjcf_path, lod)
+        if lod_path == mjcf_path:
+            continue
+        if os.path.exists(lod_path) and not overwrite:
+            status[lod] = "exists"
+            continue
+        if lod == "capped":
+            lod_root = build_capped_lod(root, max_hull_vertices)
+        else:
+            lod_root = build_merged_lod(root, mjcf_path, max_hull_vertices)
+        if lod_root is None:
+            status[lod] = "skipped"
+            continue
+        ET.ElementTree(lod_root).write(lod_path, encoding="utf-8")
+        status[lod] = "built"
+    return status
@@ -52,6 +52,9 @@ class ObjCat:
         aigen_cat (bool): True if the object is an AI-generated object otherwise use obj_registry. Kept for backwards compatibility
 
         obj_registry (str): the object registry the category belongs to, one of ["objaverse", "aigen", "infinigen", "sketchfab", "lightwheel"]
+
+        collision_lod (str): collision level of detail of the object models, one of ["full", "capped", "merged"].
+            Simplified variants are built with build_collision_lods.py. None uses the full collision meshes
     """
 
     def __init__(
@@ -74,6 +77,7 @@ class ObjCat:
         priority=None,
         aigen_cat=False,
         obj_registry="objaverse",
+        collision_lod=None,
     ):
         self.name = name
         if not isinstance(types, tuple):
@@ -94,6 +98,7 @@ class ObjCat:
         self.density = density
         self.friction = friction
         self.priority = priority
+        self.collision_lod = collision_lod
         self.exclude = exclude or []
 
         if model_folders is None:
@@ -126,6 +131,7 @@ class ObjCat:
                 friction=self.friction,
                 priority=self.priority,
                 margin=self.margin,
+                collision_lod=self.collision_lod,
             )
         )
 
@@ -10,10 +10,17 @@ from robosuite.models.objects import MujocoXMLObject
 from robosuite.utils.mjcf_utils import array_to_string, string_to_array
 from robosuite.environments.robot_env import RobotEnv
 
+from robocasa.models.objects.collision_lod_utils import resolve_collision_lod_path
+
 
 class MJCFObject(MujocoXMLObject):
     """
     Blender object with support for changing the scaling
+
+    If @collision_lod is set (one of "full", "capped", "merged"), the corresponding simplified collision variant
+    of the model is loaded instead, if it has been built with build_collision_lods.py
+
+    If @asset_cache (AssetCache) is set, mesh and texture files of the model are redirected to their cached versions
     """
 
     def __init__(
@@ -29,6 +36,8 @@ class MJCFObject(MujocoXMLObject):
         rgba=None,
         priority=None,
         static=False,
+        collision_lod=None,
+        asset_cache=None,
     ):
         # get scale in x, y, z
         if isinstance(scale, float):
@@ -51,7 +60,7 @@ class MJCFObject(MujocoXMLObject):
         self.rgba = rgba
 
         # read default xml
-        xml_path = mjcf_path
+        xml_path = resolve_collision_lod_path(mjcf_path, collision_lod)
         folder = os.path.dirname(xml_path)
         tree = ET.parse(xml_path)
         root = tree.getroot()
@@ -59,6 +68,8 @@ class MJCFObject(MujocoXMLObject):
         # write modified xml (and make sure to postprocess any paths just in case)
         xml_str = ET.tostring(root, encoding="utf8").decode("utf8")
         xml_str = self.postprocess_model_xml(xml_str)
+        if asset_cache is not None:
+            xml_str = asset_cache.redirect_xml_string(xml_str, base_dir=folder)
         time_str = str(time.time()).replace(".", "_")
         new_xml_path = os.path.join(folder, "{}_{}.xml".format(time_str, os.getpid()))
         f = open(new_xml_path, "w")
@@ -263,17 +274,21 @@ class MJCFObject(MujocoXMLObject):
         if not env.check_contact(self, obj):
             return -1
         obj_pos = env.sim.data.body_xpos[env.sim.model.body_name2id(obj.root_body)]
+        # use the environment's precomputed id table if available
+        spawn_geom_ids = getattr(env, "obj_spawn_geom_ids", {}).get(self.name, None)
+        if spawn_geom_ids is None:
+            spawn_geom_ids = [
+                env.sim.model.geom_name2id(spawn.get("name")) for spawn in self.spawns
+            ]
         distances = []
         for spawn_id in range(len(self.spawns)):
-            spawn_pos = env.sim.data.get_geom_xpos(self.spawns[spawn_id].get("name"))
+            spawn_pos = env.sim.data.geom_xpos[spawn_geom_ids[spawn_id]]
             distance = np.linalg.norm(spawn_pos - obj_pos)
             distances.append((spawn_id, distance))
         distances = sorted(distances, key=lambda item: item[1])
         obj_geom_ids = [env.sim.model.geom_name2id(g) for g in obj.contact_geoms]
         for spawn_id, distance in distances:
-            spawn_geom_id = env.sim.model.geom_name2id(
-                self.spawns[spawn_id].get("name")
-            )
+            spawn_geom_id = spawn_geom_ids[spawn_id]
             for obj_geom_id in obj_geom_ids:
                 real_distance = mujoco.mj_geomDistance(
                     m=env.sim.model._model,
@@ -1,5 +1,4 @@
 import numpy as np
-import yaml
 from robosuite.utils.mjcf_utils import array_to_string as a2s
 from robosuite.utils.mjcf_utils import string_to_array as s2a
 
@@ -109,12 +108,10 @@ def create_fixtures_from_yaml(layout_yaml_path, style_yaml_path, rng=None):
     """
 
     # load style
-    with open(style_yaml_path, "r") as f:
-        style = yaml.safe_load(f)
+    style = load_yaml(style_yaml_path)
 
     # load arena
-    with open(layout_yaml_path, "r") as f:
-        arena_config = yaml.safe_load(f)
+    arena_config = load_yaml(layout_yaml_path)
 
     # contains all fixtures with updated configs
     arena = list()
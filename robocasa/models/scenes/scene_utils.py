@@ -1,9 +1,13 @@
+import os
 from collections import OrderedDict
 from copy import deepcopy
+
+import numpy as np
 import yaml
 from robosuite.utils.mjcf_utils import xml_path_completion
 
 import robocasa
+import robocasa.macros as macros
 
 
 # second keyword corresponds to positive end of axis
@@ -28,6 +32,74 @@ IGNORE_ARGS = [
 # arguments used to point to other fixtures
 ATTACH_ARGS = ["interior_obj", "stack_on", "attach_to"]
 
+# parsed yaml files, keyed by path. entries are invalidated when the file is modified
+_YAML_CACHE = dict()
+
+# fixture templates, keyed by the (processed) fixture configuration
+_FIXTURE_CACHE = OrderedDict()
+_FIXTURE_CACHE_STATS = {"hits": 0, "misses": 0, "uncacheable": 0}
+
+
+def load_yaml(path):
+    """
+    Loads a yaml file, reusing the parsed contents if the file was loaded before and
+    has not been modified since. A copy is returned, so callers are free to modify it
+
+    Args:
+        path (str): path to the yaml file
+
+    Returns:
+        dict: parsed contents of the yaml file
+    """
+    mtime = os.path.getmtime(path)
+    entry = _YAML_CACHE.get(path, None)
+    if entry is None or entry[0] != mtime:
+        with open(path, "r") as f:
+            entry = (mtime, yaml.safe_load(f))
+        _YAML_CACHE[path] = entry
+    return deepcopy(entry[1])
+
+
+def _freeze_config(value):
+    """
+    Converts a fixture configuration into a hashable key. Raises TypeError if the
+    configuration contains values that cannot be compared by value (e.g. other fixtures)
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze_config(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_config(v) for v in value)
+    if isinstance(value, np.ndarray):
+        return ("ndarray", value.shape, tuple(value.flatten().tolist()))
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, type):
+        return (value.__module__, value.__qualname__)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError("Cannot use {} in fixture cache key".format(type(value)))
+
+
+def clear_fixture_cache():
+    """
+    Clears the cached yaml files and fixture templates
+    """
+    _YAML_CACHE.clear()
+    _FIXTURE_CACHE.clear()
+    for k in _FIXTURE_CACHE_STATS:
+        _FIXTURE_CACHE_STATS[k] = 0
+
+
+def get_fixture_cache_stats():
+    """
+    Returns:
+        dict: number of cache hits, misses, and uncacheable fixture configurations,
+            as well as the current number of cached templates
+    """
+    stats = dict(_FIXTURE_CACHE_STATS)
+    stats["size"] = len(_FIXTURE_CACHE)
+    return stats
+
 
 def initialize_fixture(config, cur_fixtures, rng=None):
     """
@@ -39,6 +111,8 @@ def initialize_fixture(config, cur_fixtures, rng=None):
                        Serves as the arguments to initialize the fixture
 
         cur_fixtures (dict): dictionary containing the current fixtures
+
+        rng (np.random.Generator): random number generator assigned to the fixture
     """
 
     config = deepcopy(config)
@@ -62,6 +136,21 @@ def initialize_fixture(config, cur_fixtures, rng=None):
         # need position to initialize fixture, adjusted later fo relative positioning
         config["pos"] = [0.0, 0.0, 0.0]
 
+    # fixtures that point to other fixtures depend on their state and are not cached
+    cache_key = None
+    if macros.CACHE_FIXTURE_MODELS and not any(k in config for k in ATTACH_ARGS):
+        try:
+            cache_key = _freeze_config(
+                (class_type, name, {k: v for k, v in config.items() if k != "rng"})
+            )
+        except TypeError:
+            _FIXTURE_CACHE_STATS["uncacheable"] += 1
+
+    if cache_key is not None and cache_key in _FIXTURE_CACHE:
+        _FIXTURE_CACHE_STATS["hits"] += 1
+        _FIXTURE_CACHE.move_to_end(cache_key)
+        return _copy_fixture_template(_FIXTURE_CACHE[cache_key], rng)
+
     # update fixture pointers
     for k in ATTACH_ARGS:
         if k in config:
@@ -70,9 +159,33 @@ def initialize_fixture(config, cur_fixtures, rng=None):
     config["rng"] = rng
     fixture = class_type(name=name, **config)
     # print(class_type, name, type(fixture))
+
+    if cache_key is not None:
+        # fixture construction does not consume the rng, so the generated model only
+        # depends on the configuration and can be reused for identical configurations
+        _FIXTURE_CACHE_STATS["misses"] += 1
+        template = _copy_fixture_template(fixture, None)
+        if hasattr(template, "rng"):
+            template.rng = None
+        _FIXTURE_CACHE[cache_key] = template
+        while len(_FIXTURE_CACHE) > macros.FIXTURE_MODEL_CACHE_SIZE:
+            _FIXTURE_CACHE.popitem(last=False)
     return fixture
 
 
+def _copy_fixture_template(fixture, rng):
+    """
+    Deep copies a fixture without duplicating its random number generator. The copy is
+    assigned the given generator (or a fresh one, matching fixture construction)
+    """
+    fixture_rng = getattr(fixture, "rng", None)
+    memo = {id(fixture_rng): None} if fixture_rng is not None else dict()
+    copy = deepcopy(fixture, memo)
+    if hasattr(copy, "rng"):
+        copy.rng = rng if rng is not None else np.random.default_rng()
+    return copy
+
+
 def load_style_config(style, fixture_config):
     """
     Loads the style information for a given fixture. Style information can consist of
@@ -99,8 +212,7 @@ def load_style_config(style, fixture_config):
         f"fixtures/fixture_registry/{fixture_type}.yaml",
         root=robocasa.models.assets_root,
     )
-    with open(yaml_path, "r") as f:
-        default_configs = yaml.safe_load(f)
+    default_configs = load_yaml(yaml_path)
 
     # find which configuration to use
     if type(fixture_style) == dict and "config_name" not in fixture_config:
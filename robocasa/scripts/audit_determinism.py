@@ -0,0 +1,261 @@
+"""
+Audits whether the recorded actions of a dataset deterministically reproduce its recorded states.
+
+Every episode is restored to its initial state and its actions are replayed open-loop in a pool of worker
+processes, each holding one environment. After each step, the simulation state is compared against the
+recorded state of the next step. Episodes are restored with the legacy reset + reload path by default,
+or with the single-compile path with --single_compile, so that both can be audited. Each episode is classified as:
+    - "deterministic": the max abs state error never exceeds --det_tol
+    - "drifting": the error exceeds --det_tol but stays below --diverge_tol
+    - "diverged": the error exceeds --diverge_tol at some step
+    - "error": the replay raised an exception
+
+The report is written as json, with a summary and per episode the classification, the first step whose
+error exceeds each tolerance, and the max and final errors (optionally the error of every step). The script
+exits with a non-zero status if any episode diverged or failed.
+
+Example:
+    python robocasa/scripts/audit_determinism.py --dataset /path/to/demo.hdf5 --num_workers 8 --report audit.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import traceback
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import h5py
+import numpy as np
+from termcolor import colored
+from tqdm import tqdm
+
+import robocasa
+from robocasa.scripts.playback_dataset import get_env_metadata_from_dataset, reset_to
+
+CLASSIFICATIONS = ["deterministic", "drifting", "diverged", "error"]
+
+# environment of each worker process, created once by init_worker
+_worker_env = None
+
+
+def make_env(dataset):
+    env_meta = get_env_metadata_from_dataset(dataset_path=dataset)
+    env_kwargs = env_meta["env_kwargs"]
+    env_kwargs["env_name"] = env_meta["env_name"]
+    env_kwargs["has_renderer"] = False
+    env_kwargs["has_offscreen_renderer"] = False
+    env_kwargs["use_camera_obs"] = False
+    env_kwargs.pop("env_lang", None)
+    return robocasa.make(**env_kwargs)
+
+
+def init_worker(dataset):
+    global _worker_env
+    _worker_env = make_env(dataset)
+
+
+def get_step_errors(env, initial_state, states, actions, single_compile=False):
+    """
+    Replays @actions from @initial_state, restored with the legacy reset + reload path unless
+    @single_compile is set
+
+    Returns:
+        np.array: max abs error between the simulation state after step i and the recorded state i + 1
+    """
+    reset_to(env, initial_state, single_compile=single_compile)
+    errors = np.zeros(len(actions) - 1)
+    for i in range(len(actions) - 1):
+        env.step(actions[i])
+        errors[i] = np.max(np.abs(env.sim.get_state().flatten() - states[i + 1]))
+    return errors
+
+
+def classify(errors, det_tol, diverge_tol):
+    """
+    Returns:
+        dict: classification of an episode from its per-step errors, along with the first step whose error
+            exceeds each tolerance (None if it never does)
+    """
+
+    def first_step_above(tol):
+        above = np.flatnonzero(errors > tol)
+        return int(above[0]) if len(above) > 0 else None
+
+    first_drift_step = first_step_above(det_tol)
+    first_divergence_step = first_step_above(diverge_tol)
+    if first_divergence_step is not None:
+        classification = "diverged"
+    elif first_drift_step is not None:
+        classification = "drifting"
+    else:
+        classification = "deterministic"
+    return dict(
+        classification=classification,
+        first_drift_step=first_drift_step,
+        first_divergence_step=first_divergence_step,
+    )
+
+
+def audit_episode(
+    dataset, ep, actions_key, det_tol, diverge_tol, save_errors, single_compile=False
+):
+    """
+    Replays the actions of episode @ep in the environment of the current worker
+
+    Returns:
+        dict: audit result of the episode
+    """
+    result = dict(episode=ep)
+    try:
+        with h5py.File(dataset, "r") as f:
+            ep_grp = f["data/{}".format(ep)]
+            states = ep_grp["states"][()]
+            actions = ep_grp[actions_key][()]
+            initial_state = dict(
+                states=states[0],
+                model=ep_grp.attrs["model_file"],
+                ep_meta=ep_grp.attrs.get("ep_meta", None),
+            )
+        assert len(states) == len(actions)
+        errors = get_step_errors(
+            _worker_env, initial_state, states, actions, single_compile=single_compile
+        )
+    except Exception:
+        result.update(classification="error", traceback=traceback.format_exc())
+        return result
+
+    result["length"] = len(actions)
+    result.update(classify(errors, det_tol, diverge_tol))
+    result["max_error"] = float(np.max(errors)) if len(errors) > 0 else 0.0
+    result["final_error"] = float(errors[-1]) if len(errors) > 0 else 0.0
+    if save_errors:
+        result["errors"] = errors.tolist()
+    return result
+
+
+def get_demos(dataset, filter_key=None, n=None):
+    """
+    Returns:
+        list: episode names in the dataset (or in filter mask @filter_key), sorted by number
+    """
+    with h5py.File(dataset, "r") as f:
+        if filter_key is not None:
+            demos = [
+                elem.decode("utf-8")
+                for elem in np.array(f["mask/{}".format(filter_key)])
+            ]
+        else:
+            demos = list(f["data"].keys())
+    demos = sorted(demos, key=lambda x: int(x[5:]))
+    if n is not None:
+        demos = demos[:n]
+    return demos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", type=str, required=True, help="path to hdf5 dataset")
+    parser.add_argument(
+        "--filter_key",
+        type=str,
+        default=None,
+        help="(optional) filter key, to select a subset of trajectories in the file",
+    )
+    parser.add_argument(
+        "--n",
+        type=int,
+        default=None,
+        help="(optional) number of episodes to audit",
+    )
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        default=os.cpu_count(),
+        help="number of worker processes",
+    )
+    parser.add_argument(
+        "--actions_key",
+        type=str,
+        default="actions",
+        help="dataset key of the actions to replay",
+    )
+    parser.add_argument(
+        "--det_tol",
+        type=float,
+        default=1e-9,
+        help="max abs state error up to which an episode counts as deterministic",
+    )
+    parser.add_argument(
+        "--diverge_tol",
+        type=float,
+        default=1e-2,
+        help="max abs state error above which an episode counts as diverged",
+    )
+    parser.add_argument(
+        "--save_errors",
+        action="store_true",
+        help="include the error of every step in the report",
+    )
+    parser.add_argument(
+        "--single_compile",
+        action="store_true",
+        help="restore episodes with the single-compile path instead of the legacy reset + reload",
+    )
+    parser.add_argument(
+        "--report",
+        type=str,
+        default=None,
+        help="path of the json report. Defaults to <dataset>_determinism.json",
+    )
+    args = parser.parse_args()
+    assert args.det_tol <= args.diverge_tol
+
+    if args.report is None:
+        args.report = args.dataset.split(".hdf5")[0] + "_determinism.json"
+
+    demos = get_demos(args.dataset, filter_key=args.filter_key, n=args.n)
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=args.num_workers,
+        initializer=init_worker,
+        initargs=(args.dataset,),
+    ) as executor:
+        futures = [
+            executor.submit(
+                audit_episode,
+                args.dataset,
+                ep,
+                args.actions_key,
+                args.det_tol,
+                args.diverge_tol,
+                args.save_errors,
+                args.single_compile,
+            )
+            for ep in demos
+        ]
+        for future in tqdm(as_completed(futures), total=len(futures)):
+            results.append(future.result())
+    results = sorted(results, key=lambda x: int(x["episode"][5:]))
+
+    counts = Counter(r["classification"] for r in results)
+    report = dict(
+        dataset=os.path.abspath(args.dataset),
+        filter_key=args.filter_key,
+        actions_key=args.actions_key,
+        det_tol=args.det_tol,
+        diverge_tol=args.diverge_tol,
+        single_compile=args.single_compile,
+        summary={c: counts.get(c, 0) for c in CLASSIFICATIONS},
+        episodes=results,
+    )
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=4)
+
+    for c in CLASSIFICATIONS:
+        color = "green" if c == "deterministic" else "yellow" if c == "drifting" else "red"
+        print(colored("{:>14}: {}".format(c, counts.get(c, 0)), color))
+    print("wrote report to {}".format(args.report))
+    if counts.get("diverged", 0) > 0 or counts.get("error", 0) > 0:
+        sys.exit(1)
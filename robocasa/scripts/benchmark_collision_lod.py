@@ -0,0 +1,128 @@
+"""
+Compares full and simplified object collision meshes (see build_collision_lods.py) by replaying the
+actions of recorded demonstrations. For every collision lod, each episode is rebuilt from its episode
+meta data (so that objects load the selected collision variant), set to the recorded initial state and
+stepped with the recorded actions. Reports the mean step time, the final object position deviation
+and the agreement of the success check with the full collision meshes.
+
+Example:
+    python robocasa/scripts/benchmark_collision_lod.py --dataset /path/to/demo.hdf5 --n 20
+"""
+
+import argparse
+import json
+import time
+
+import h5py
+import numpy as np
+from termcolor import colored
+
+import robocasa
+from robocasa.scripts.playback_dataset import get_env_metadata_from_dataset
+
+
+def make_env(dataset, collision_lod):
+    env_meta = get_env_metadata_from_dataset(dataset_path=dataset)
+    env_kwargs = env_meta["env_kwargs"]
+    env_kwargs["env_name"] = env_meta["env_name"]
+    env_kwargs["has_renderer"] = False
+    env_kwargs["has_offscreen_renderer"] = False
+    env_kwargs["use_camera_obs"] = False
+    env_kwargs["collision_lod"] = collision_lod
+    env_kwargs.pop("env_lang", None)
+    return robocasa.make(**env_kwargs)
+
+
+def replay_episode(env, ep_meta, initial_state, actions):
+    """
+    Rebuilds the scene of an episode and replays its actions
+
+    Returns:
+        tuple: success at the end of the episode, final object positions, mean step time
+    """
+    env.set_ep_meta(ep_meta)
+    env.reset()
+    env.sim.set_state_from_flattened(initial_state)
+    env.sim.forward()
+    env.invalidate_contact_index()
+
+    t = time.perf_counter()
+    for action in actions:
+        env.step(action)
+    step_time = (time.perf_counter() - t) / len(actions)
+
+    obj_pos = np.array(
+        [env.sim.data.body_xpos[env.obj_body_id[name]] for name in sorted(env.objects)]
+    )
+    return bool(env._check_success()), obj_pos, step_time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", type=str, required=True, help="path to hdf5 dataset")
+    parser.add_argument(
+        "--n",
+        type=int,
+        default=None,
+        help="(optional) number of episodes to replay",
+    )
+    parser.add_argument(
+        "--lods",
+        type=str,
+        nargs="+",
+        default=["capped", "merged"],
+        help="simplified collision variants to compare against the full meshes",
+    )
+    args = parser.parse_args()
+
+    episodes = []
+    with h5py.File(args.dataset, "r") as f:
+        demos = sorted(f["data"].keys(), key=lambda x: int(x[5:]))
+        if args.n is not None:
+            demos = demos[: args.n]
+        for ep in demos:
+            ep_grp = f["data/{}".format(ep)]
+            episodes.append(
+                dict(
+                    ep_meta=json.loads(ep_grp.attrs["ep_meta"]),
+                    initial_state=ep_grp["states"][0],
+                    actions=ep_grp["actions"][()],
+                )
+            )
+
+    results = dict()
+    for lod in ["full"] + args.lods:
+        env = make_env(args.dataset, collision_lod=lod)
+        results[lod] = [replay_episode(env, **ep) for ep in episodes]
+        env.close()
+
+    full_success = np.array([r[0] for r in results["full"]])
+    full_step_time = np.mean([r[2] for r in results["full"]])
+    print(
+        "{:>8}: step time {:.2f} ms, success rate {:.2f}".format(
+            "full", full_step_time * 1e3, np.mean(full_success)
+        )
+    )
+    for lod in args.lods:
+        success = np.array([r[0] for r in results[lod]])
+        step_time = np.mean([r[2] for r in results[lod]])
+        pos_err = np.mean(
+            [
+                np.max(np.linalg.norm(r[1] - r_full[1], axis=-1))
+                for r, r_full in zip(results[lod], results["full"])
+            ]
+        )
+        print(
+            colored(
+                "{:>8}: step time {:.2f} ms ({:.2f}x), success rate {:.2f}, "
+                "success agreement {:.2f}, mean max object deviation {:.3f} m".format(
+                    lod,
+                    step_time * 1e3,
+                    full_step_time / step_time,
+                    np.mean(success),
+                    np.mean(success == full_success),
+                    pos_err,
+                ),
+                "green",
+            )
+        )
@@ -0,0 +1,99 @@
+"""
+Benchmarks random window reads from one or more hdf5 datasets, as done by training data loaders: each read
+picks a random episode and start step and reads --window consecutive steps of every key. Reports windows
+and megabytes (uncompressed) read per second, e.g. to compare a dataset before and after
+optimize_dataset_layout.py. The same episodes and windows are read from every dataset.
+
+Example:
+    python robocasa/scripts/benchmark_dataset_reads.py --datasets demo.hdf5 demo_opt.hdf5 --window 16 \
+        --keys actions obs/robot0_agentview_left_image
+"""
+
+import argparse
+import os
+import time
+
+import h5py
+import numpy as np
+from termcolor import colored
+
+
+def sample_windows(dataset, window, n, seed=0):
+    """
+    Samples random windows of a dataset
+
+    Returns:
+        list: (episode name, start step) of each window
+    """
+    with h5py.File(dataset, "r") as f:
+        lengths = {
+            ep: f["data/{}/actions".format(ep)].shape[0] for ep in f["data"].keys()
+        }
+    eps = sorted(ep for ep, length in lengths.items() if length >= window)
+    assert len(eps) > 0, "no episode is at least {} steps long".format(window)
+    rng = np.random.default_rng(seed)
+    windows = []
+    for _ in range(n):
+        ep = eps[rng.integers(len(eps))]
+        windows.append((ep, int(rng.integers(lengths[ep] - window + 1))))
+    return windows
+
+
+def benchmark_reads(dataset, windows, window, keys):
+    """
+    Reads each window of @windows
+
+    Returns:
+        tuple: windows read per second, uncompressed megabytes read per second
+    """
+    n_bytes = 0
+    t = time.perf_counter()
+    with h5py.File(dataset, "r") as f:
+        for ep, start in windows:
+            ep_grp = f["data/{}".format(ep)]
+            for k in keys:
+                n_bytes += ep_grp[k][start : start + window].nbytes
+    elapsed = time.perf_counter() - t
+    return len(windows) / elapsed, n_bytes / elapsed / 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--datasets",
+        type=str,
+        nargs="+",
+        required=True,
+        help="paths to hdf5 datasets holding the same episodes",
+    )
+    parser.add_argument("--window", type=int, default=16, help="window length")
+    parser.add_argument(
+        "--keys",
+        type=str,
+        nargs="+",
+        default=["actions"],
+        help="keys to read, relative to the episode groups",
+    )
+    parser.add_argument("--n", type=int, default=1000, help="number of windows to read")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    windows = sample_windows(args.datasets[0], args.window, args.n, seed=args.seed)
+    # short warm-up pass over each dataset, so that file and metadata caching does not favor later datasets
+    for dataset in args.datasets:
+        benchmark_reads(dataset, windows[: max(1, args.n // 10)], args.window, args.keys)
+    for dataset in args.datasets:
+        windows_per_sec, mb_per_sec = benchmark_reads(
+            dataset, windows, args.window, args.keys
+        )
+        print(
+            colored(
+                "{}: {:.1f} windows/s, {:.1f} MB/s, file size {:.1f} MB".format(
+                    dataset,
+                    windows_per_sec,
+                    mb_per_sec,
+                    os.path.getsize(dataset) / 1e6,
+                ),
+                "green",
+            )
+        )
@@ -0,0 +1,158 @@
+"""
+Compares an environment with and without fixture collision filtering (filter_fixture_collisions).
+
+Both environments are created with the same seed and stepped with the same random actions. At every
+step, the contacts that involve at least one non-fixture geom (robot- and object-vs-fixture contacts,
+robot-object contacts, ...) must be identical. Also reports the mean number of contacts and the mean
+step time of both environments.
+
+Example:
+    python robocasa/scripts/benchmark_fixture_collisions.py --env PnPCupToDrawerClose --robot GR1ArmsOnly
+"""
+
+import argparse
+import time
+
+import numpy as np
+from robosuite.controllers import load_composite_controller_config
+from termcolor import colored
+
+import robocasa
+
+
+def make_env(args, filter_fixture_collisions):
+    return robocasa.make(
+        env_name=args.env,
+        robots=args.robot,
+        controller_configs=load_composite_controller_config(
+            controller=None, robot=args.robot
+        ),
+        has_renderer=False,
+        has_offscreen_renderer=False,
+        use_camera_obs=False,
+        ignore_done=True,
+        seed=args.seed,
+        filter_fixture_collisions=filter_fixture_collisions,
+    )
+
+
+def get_static_geom_ids(env):
+    """
+    Returns:
+        np.array: boolean mask over geoms, True for geoms attached to the world or part of a fixture
+            or static distractor subtree
+    """
+    model = env.sim.model
+    static_roots = set(
+        model.body_name2id(name) for name in env._get_static_collision_bodies()
+    )
+    static_roots.add(0)
+    geom_roots = model.body_rootid[model.geom_bodyid]
+    return np.array([root in static_roots for root in geom_roots])
+
+
+def get_dynamic_contacts(env, static_geoms):
+    """
+    Returns:
+        set: name pairs of the active contacts involving at least one non-static geom
+    """
+    data = env.sim.data
+    contacts = set()
+    for i in range(data.ncon):
+        g1, g2 = data.contact[i].geom1, data.contact[i].geom2
+        if static_geoms[g1] and static_geoms[g2]:
+            continue
+        names = sorted([str(env.sim.model.geom_id2name(g)) for g in (g1, g2)])
+        contacts.add(tuple(names))
+    return contacts
+
+
+def rollout(env, actions):
+    """
+    Steps the environment through a sequence of actions
+
+    Returns:
+        tuple: per-step dynamic contacts, per-step number of contacts, mean step time
+    """
+    static_geoms = get_static_geom_ids(env)
+    contacts, ncon = [], []
+    step_time = 0.0
+    for action in actions:
+        t = time.perf_counter()
+        env.step(action)
+        step_time += time.perf_counter() - t
+        contacts.append(get_dynamic_contacts(env, static_geoms))
+        ncon.append(env.sim.data.ncon)
+    return contacts, ncon, step_time / len(actions)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--env", type=str, required=True, help="environment name")
+    parser.add_argument("--robot", type=str, default="GR1ArmsOnly", help="robot name")
+    parser.add_argument(
+        "--n_steps", type=int, default=200, help="number of steps per episode"
+    )
+    parser.add_argument("--n_episodes", type=int, default=3, help="number of episodes")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    envs = dict(
+        unfiltered=make_env(args, filter_fixture_collisions=False),
+        filtered=make_env(args, filter_fixture_collisions=True),
+    )
+    rng = np.random.default_rng(args.seed)
+    low, high = envs["unfiltered"].action_spec
+
+    results = {name: dict(ncon=[], step_time=[]) for name in envs}
+    all_match = True
+    for ep in range(args.n_episodes):
+        actions = rng.uniform(low, high, size=(args.n_steps, len(low)))
+        ep_contacts = dict()
+        for name, env in envs.items():
+            env.reset()
+            contacts, ncon, step_time = rollout(env, actions)
+            ep_contacts[name] = contacts
+            results[name]["ncon"].extend(ncon)
+            results[name]["step_time"].append(step_time)
+
+        mismatch = [
+            i
+            for i in range(args.n_steps)
+            if ep_contacts["unfiltered"][i] != ep_contacts["filtered"][i]
+        ]
+        if len(mismatch) > 0:
+            all_match = False
+            i = mismatch[0]
+            print(
+                colored(
+                    "episode {}: robot / object contacts differ at step {}: {}".format(
+                        ep, i, ep_contacts["unfiltered"][i] ^ ep_contacts["filtered"][i]
+                    ),
+                    "red",
+                )
+            )
+        else:
+            print(colored("episode {}: robot / object contacts match".format(ep), "green"))
+
+    print("filter stats: {}".format(envs["filtered"].fixture_collision_filter_stats))
+    for name, res in results.items():
+        print(
+            "{:>10}: mean ncon {:.1f}, mean step time {:.2f} ms".format(
+                name, np.mean(res["ncon"]), np.mean(res["step_time"]) * 1e3
+            )
+        )
+    print(
+        colored(
+            "speedup: {:.2f}x".format(
+                np.mean(results["unfiltered"]["step_time"])
+                / np.mean(results["filtered"]["step_time"])
+            ),
+            "green",
+        )
+    )
+
+    for env in envs.values():
+        env.close()
+    if not all_match:
+        raise SystemExit(1)
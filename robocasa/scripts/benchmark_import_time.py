@@ -0,0 +1,131 @@
+"""
+Measures the import time of robocasa in fresh interpreters, both for the package alone and up to the creation
+of a single environment class, and lists the slowest imported modules (from python -X importtime).
+
+Pass --save_baseline to record the measured times, and --baseline to fail (exit status 1) if any measured time
+regresses by more than --tolerance relative to a recorded baseline.
+
+Example:
+    python robocasa/scripts/benchmark_import_time.py --save_baseline import_time.json
+    python robocasa/scripts/benchmark_import_time.py --baseline import_time.json --tolerance 0.2
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+import numpy as np
+from termcolor import colored
+
+# statements timed in a fresh interpreter. robosuite is imported beforehand and not counted
+BENCHMARKS = {
+    "import robocasa": "import robocasa",
+    "get env class": "import robocasa; robocasa.get_env_class({env!r})",
+}
+
+
+def time_statement(statement, n):
+    """
+    Runs @statement in @n fresh interpreters
+
+    Returns:
+        float: median time of the statement in seconds
+    """
+    code = (
+        "import time, robosuite; t = time.perf_counter(); {}; "
+        "print(time.perf_counter() - t)".format(statement)
+    )
+    times = []
+    for _ in range(n):
+        out = subprocess.run(
+            [sys.executable, "-c", code], check=True, capture_output=True, text=True
+        ).stdout
+        times.append(float(out.strip().splitlines()[-1]))
+    return float(np.median(times))
+
+
+def get_slowest_imports(statement, k=10):
+    """
+    Returns:
+        list: (cumulative time in seconds, module) of the @k imports of @statement with the largest cumulative
+            time, as reported by python -X importtime
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        imports.append((int(cumulative) / 1e6, module.strip()))
+    return sorted(imports, reverse=True)[:k]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--env",
+        type=str,
+        default="PnPCupToDrawerClose",
+        help="environment whose class is loaded in the second benchmark",
+    )
+    parser.add_argument("--n", type=int, default=5, help="number of runs per benchmark")
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=None,
+        help="(optional) json file of baseline times to check against",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed relative regression with respect to the baseline",
+    )
+    parser.add_argument(
+        "--save_baseline",
+        type=str,
+        default=None,
+        help="(optional) json file to save the measured times to",
+    )
+    args = parser.parse_args()
+
+    results = dict()
+    for name, statement in BENCHMARKS.items():
+        results[name] = time_statement(statement.format(env=args.env), args.n)
+        print("{:>20}: {:.3f} s".format(name, results[name]))
+
+    print("slowest imports of robocasa (cumulative):")
+    for t, module in get_slowest_imports("import robocasa"):
+        print("    {:<60} {:.3f} s".format(module, t))
+
+    if args.save_baseline is not None:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=4)
+        print("saved baseline to {}".format(args.save_baseline))
+
+    if args.baseline is not None:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressed = False
+        for name, t in results.items():
+            if name not in baseline:
+                continue
+            limit = baseline[name] * (1 + args.tolerance)
+            ok = t <= limit
+            regressed = regressed or not ok
+            print(
+                colored(
+                    "{:>20}: {:.3f} s, baseline {:.3f} s, limit {:.3f} s".format(
+                        name, t, baseline[name], limit
+                    ),
+                    "green" if ok else "red",
+                )
+            )
+        if regressed:
+            sys.exit(1)
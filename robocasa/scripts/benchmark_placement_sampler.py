@@ -0,0 +1,106 @@
+"""
+Compares the uniform rejection sampler with the occupancy-raster sampler (OccupancyRasterSampler) on the
+object placements of an environment.
+
+For each sampler, an environment is created and its object placements are re-sampled --n_trials times on
+top of the placed fixtures. Reports the fraction of trials that placed all objects, the accept rate of the
+candidate placements and the mean sampling time, as well as the mean reset time and how often each stage of
+the placement retries of the environment (placement_retry_stats) was triggered during the resets.
+
+Example:
+    python robocasa/scripts/benchmark_placement_sampler.py --env PnPCupToDrawerClose --robot GR1ArmsOnly
+"""
+
+import argparse
+import time
+
+import numpy as np
+from robosuite.controllers import load_composite_controller_config
+from robosuite.utils.errors import RandomizationError
+from termcolor import colored
+
+import robocasa
+
+
+def make_env(args, placement_sampler):
+    return robocasa.make(
+        env_name=args.env,
+        robots=args.robot,
+        controller_configs=load_composite_controller_config(
+            controller=None, robot=args.robot
+        ),
+        has_renderer=False,
+        has_offscreen_renderer=False,
+        use_camera_obs=False,
+        ignore_done=True,
+        seed=args.seed,
+        placement_sampler=placement_sampler,
+    )
+
+
+def benchmark(env, n_trials):
+    """
+    Re-samples the object placements of @env @n_trials times
+
+    Returns:
+        dict: success rate, accept rate and mean sampling time
+    """
+    n_success, n_candidates, n_accepted = 0, 0, 0
+    sample_time = 0.0
+    for _ in range(n_trials):
+        initializer = env._get_placement_initializer(env.object_cfgs)
+        t = time.perf_counter()
+        try:
+            initializer.sample(placed_objects=env.fxtr_placements)
+            n_success += 1
+        except RandomizationError:
+            pass
+        sample_time += time.perf_counter() - t
+        for sampler in initializer.samplers.values():
+            n_candidates += sampler.num_candidates
+            n_accepted += sampler.num_accepted
+    return dict(
+        success_rate=n_success / n_trials,
+        accept_rate=n_accepted / max(n_candidates, 1),
+        sample_time=sample_time / n_trials,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--env", type=str, required=True, help="environment name")
+    parser.add_argument("--robot", type=str, default="GR1ArmsOnly", help="robot name")
+    parser.add_argument(
+        "--n_scenes", type=int, default=5, help="number of scenes (resets)"
+    )
+    parser.add_argument(
+        "--n_trials", type=int, default=20, help="number of samplings per scene"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for placement_sampler in ["uniform", "raster"]:
+        env = make_env(args, placement_sampler)
+        results = []
+        reset_time = 0.0
+        for _ in range(args.n_scenes):
+            t = time.perf_counter()
+            env.reset()
+            reset_time += time.perf_counter() - t
+            results.append(benchmark(env, args.n_trials))
+        retry_stats = env.placement_retry_stats
+        env.close()
+        print(
+            colored(
+                "{:>8}: success rate {:.3f}, accept rate {:.4f}, mean sampling time {:.2f} ms, "
+                "mean reset time {:.2f} s".format(
+                    placement_sampler,
+                    np.mean([r["success_rate"] for r in results]),
+                    np.mean([r["accept_rate"] for r in results]),
+                    np.mean([r["sample_time"] for r in results]) * 1e3,
+                    reset_time / args.n_scenes,
+                ),
+                "green",
+            )
+        )
+        print("{:>8}  placement retries: {}".format("", retry_stats))
@@ -0,0 +1,97 @@
+"""
+Benchmarks restoring recorded episodes from a dataset, comparing the single-compile
+restore path (Tabletop.reset_to_state) against the legacy reset + reload path.
+
+Example:
+    python robocasa/scripts/benchmark_reset_to.py --dataset /path/to/demo.hdf5 --n 20
+"""
+
+import argparse
+import time
+
+import h5py
+import numpy as np
+from termcolor import colored
+
+from robocasa.scripts.playback_dataset import make_env_from_args, reset_to
+
+
+def load_initial_states(dataset, n=None):
+    """
+    Loads the initial state (model xml, ep_meta and first simulation state) of each episode
+
+    Returns:
+        list: initial state dicts, as expected by reset_to
+    """
+    initial_states = []
+    with h5py.File(dataset, "r") as f:
+        demos = sorted(f["data"].keys(), key=lambda x: int(x[5:]))
+        if n is not None:
+            demos = demos[:n]
+        for ep in demos:
+            ep_grp = f["data/{}".format(ep)]
+            initial_states.append(
+                dict(
+                    states=ep_grp["states"][0],
+                    model=ep_grp.attrs["model_file"],
+                    ep_meta=ep_grp.attrs.get("ep_meta", None),
+                )
+            )
+    return initial_states
+
+
+def benchmark(env, initial_states, single_compile):
+    """
+    Restores each initial state once
+
+    Returns:
+        tuple: episodes restored per second, max abs deviation from the recorded states
+    """
+    max_err = 0.0
+    t = time.perf_counter()
+    for state in initial_states:
+        reset_to(env, state, single_compile=single_compile)
+        err = np.max(np.abs(env.sim.get_state().flatten() - state["states"]))
+        max_err = max(max_err, err)
+    elapsed = time.perf_counter() - t
+    return len(initial_states) / elapsed, max_err
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", type=str, required=True, help="path to hdf5 dataset")
+    parser.add_argument(
+        "--n",
+        type=int,
+        default=None,
+        help="(optional) number of episodes to restore",
+    )
+    args = parser.parse_args()
+
+    # arguments expected by make_env_from_args
+    args.use_abs_actions = False
+    args.render = False
+    args.verbose = False
+
+    initial_states = load_initial_states(args.dataset, n=args.n)
+    env = make_env_from_args(args)
+
+    results = dict()
+    for name, single_compile in [("reset + reload", False), ("single compile", True)]:
+        eps_per_sec, max_err = benchmark(env, initial_states, single_compile)
+        results[name] = eps_per_sec
+        print(
+            "{:>15}: {:.2f} episodes/s (max state deviation {:.2e})".format(
+                name, eps_per_sec, max_err
+            )
+        )
+    env.close()
+
+    print(
+        colored(
+            "speedup: {:.2f}x".format(
+                results["single compile"] / results["reset + reload"]
+            ),
+            "green",
+        )
+    )
@@ -0,0 +1,99 @@
+"""
+Compares worker start methods (see robocasa/utils/prewarm_utils.py): launches a set of workers that each build
+an environment, reset it and take one step, and reports the time from launch to the first step and the memory
+of each worker while all workers are alive.
+
+With "fork", the parent is prewarmed once before the workers are launched; the time this takes is reported
+separately.
+
+Example:
+    python robocasa/scripts/benchmark_worker_prewarm.py --env PnPCupToDrawerClose --robot GR1ArmsOnly \
+        --num_workers 8 --start_methods spawn forkserver fork
+"""
+
+import argparse
+import time
+
+import numpy as np
+from termcolor import colored
+
+from robocasa.utils.prewarm_utils import get_memory_stats, get_mp_context
+
+
+def worker_main(env_name, robot, t_launch, results, barrier):
+    from robocasa.utils.gym_utils.gymnasium_basic import create_env_robosuite
+
+    env, _ = create_env_robosuite(env_name=env_name, robots=robot, enable_render=False)
+    env.reset()
+    env.step(np.zeros(env.action_dim))
+    ttfs = time.time() - t_launch
+    # measure memory once all workers are up, so that pss accounts for the pages they share
+    barrier.wait()
+    results.put(dict(ttfs=ttfs, **get_memory_stats()))
+    env.close()
+
+
+def run_workers(ctx, env_name, robot, num_workers):
+    results = ctx.Queue()
+    barrier = ctx.Barrier(num_workers)
+    t_launch = time.time()
+    workers = [
+        ctx.Process(
+            target=worker_main, args=(env_name, robot, t_launch, results, barrier)
+        )
+        for _ in range(num_workers)
+    ]
+    for w in workers:
+        w.start()
+    stats = [results.get() for _ in workers]
+    for w in workers:
+        w.join()
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--env", type=str, required=True, help="environment name")
+    parser.add_argument("--robot", type=str, default="GR1ArmsOnly", help="robot name")
+    parser.add_argument("--num_workers", type=int, default=4, help="number of workers")
+    parser.add_argument(
+        "--start_methods",
+        type=str,
+        nargs="+",
+        default=["spawn", "forkserver", "fork"],
+        choices=["spawn", "forkserver", "fork"],
+        help="start methods to compare. fork prewarms this process, so it is run last",
+    )
+    parser.add_argument(
+        "--no_prebuild",
+        action="store_true",
+        help="with fork, only import modules in the parent instead of also building the environment once",
+    )
+    args = parser.parse_args()
+
+    # prewarming with fork changes this process, so it must not affect the other start methods
+    start_methods = sorted(args.start_methods, key=lambda m: m == "fork")
+    for start_method in start_methods:
+        t = time.time()
+        ctx = get_mp_context(
+            start_method,
+            env_name=None if args.no_prebuild else args.env,
+            robot=args.robot,
+        )
+        prewarm_time = time.time() - t
+        stats = run_workers(ctx, args.env, args.robot, args.num_workers)
+        print(
+            colored(
+                "{:>10}: time to first step {:.2f} s (max {:.2f} s), prewarm {:.2f} s, per worker rss {:.0f} MB, "
+                "pss {:.0f} MB, private {:.0f} MB".format(
+                    start_method,
+                    np.mean([s["ttfs"] for s in stats]),
+                    np.max([s["ttfs"] for s in stats]),
+                    prewarm_time,
+                    np.mean([s["rss"] for s in stats]),
+                    np.mean([s["pss"] for s in stats]),
+                    np.mean([s["private"] for s in stats]),
+                ),
+                "green",
+            )
+        )
@@ -0,0 +1,79 @@
+"""
+Pre-builds the asset cache (see robocasa/utils/asset_cache.py) for all object models of the object
+registries and all fixture / arena models, so that environments created with use_asset_cache=True
+only ever read converted files.
+
+Example:
+    python robocasa/scripts/build_asset_cache.py --max_texture_res 512
+"""
+
+import argparse
+import os
+import time
+import xml.etree.ElementTree as ET
+
+from tqdm import tqdm
+
+import robocasa
+from robocasa.models.objects.kitchen_object_utils import OBJ_CATEGORIES, OBJ_REGISTRIES
+from robocasa.utils.asset_cache import AssetCache
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        default=None,
+        help="(optional) cache directory. Defaults to macros.ASSET_CACHE_DIR",
+    )
+    parser.add_argument(
+        "--max_texture_res",
+        type=int,
+        default=1024,
+        help="maximum resolution of cached textures",
+    )
+    parser.add_argument(
+        "--registries",
+        type=str,
+        nargs="+",
+        default=["objaverse", "sketchfab", "lightwheel"],
+        choices=OBJ_REGISTRIES,
+        help="object registries to process",
+    )
+    args = parser.parse_args()
+
+    xml_paths = set(
+        path
+        for cat in OBJ_CATEGORIES.values()
+        for reg in args.registries
+        if reg in cat
+        for path in cat[reg].mjcf_paths
+    )
+    for subdir in ["fixtures", "arenas", "scenes"]:
+        for root, _, files in os.walk(
+            os.path.join(robocasa.models.assets_root, subdir)
+        ):
+            xml_paths.update(os.path.join(root, f) for f in files if f.endswith(".xml"))
+
+    cache = AssetCache(cache_dir=args.cache_dir, max_texture_res=args.max_texture_res)
+    failed = []
+    t = time.time()
+    for xml_path in tqdm(sorted(xml_paths)):
+        try:
+            root = ET.parse(xml_path).getroot()
+            cache.redirect_xml(root, base_dir=os.path.dirname(xml_path))
+        except Exception as e:
+            failed.append((xml_path, e))
+
+    print(
+        "processed {} models in {:.1f}s into {}".format(
+            len(xml_paths), time.time() - t, cache.cache_dir
+        )
+    )
+    print(
+        "converted files: {}, already cached: {}, unchanged: {}".format(
+            cache.stats["misses"], cache.stats["hits"], cache.stats["passthrough"]
+        )
+    )
+    for xml_path, e in failed:
+        print("failed: {} ({})".format(xml_path, e))
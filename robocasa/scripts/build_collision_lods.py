@@ -0,0 +1,77 @@
+"""
+Builds simplified collision variants (model_lod_capped.xml, model_lod_merged.xml) of all object models
+in the object registries. Variants are written next to each model.xml and can be selected through the
+collision_lod argument of ObjCat, MJCFObject or the tabletop environments.
+
+Example:
+    python robocasa/scripts/build_collision_lods.py --registries objaverse lightwheel --max_hull_vertices 32
+"""
+
+import argparse
+from collections import Counter
+
+from tqdm import tqdm
+
+from robocasa.models.objects.collision_lod_utils import build_collision_lods
+from robocasa.models.objects.kitchen_object_utils import OBJ_CATEGORIES, OBJ_REGISTRIES
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--registries",
+        type=str,
+        nargs="+",
+        default=["objaverse", "sketchfab", "lightwheel"],
+        choices=OBJ_REGISTRIES,
+        help="object registries to process",
+    )
+    parser.add_argument(
+        "--lods",
+        type=str,
+        nargs="+",
+        default=["capped", "merged"],
+        choices=["capped", "merged"],
+        help="collision variants to build",
+    )
+    parser.add_argument(
+        "--max_hull_vertices",
+        type=int,
+        default=32,
+        help="maximum number of vertices of each convex hull",
+    )
+    parser.add_argument(
+        "--overwrite", action="store_true", help="rebuild existing variants"
+    )
+    args = parser.parse_args()
+
+    mjcf_paths = sorted(
+        set(
+            path
+            for cat in OBJ_CATEGORIES.values()
+            for reg in args.registries
+            if reg in cat
+            for path in cat[reg].mjcf_paths
+        )
+    )
+
+    counts = {lod: Counter() for lod in args.lods}
+    failed = []
+    for mjcf_path in tqdm(mjcf_paths):
+        try:
+            status = build_collision_lods(
+                mjcf_path,
+                lods=args.lods,
+                max_hull_vertices=args.max_hull_vertices,
+                overwrite=args.overwrite,
+            )
+        except Exception as e:
+            failed.append((mjcf_path, e))
+            continue
+        for lod, s in status.items():
+            counts[lod][s] += 1
+
+    print("processed {} models".format(len(mjcf_paths)))
+    for lod, c in counts.items():
+        print("{:>8}: {}".format(lod, dict(c)))
+    for mjcf_path, e in failed:
+        print("failed: {} ({})".format(mjcf_path, e))
@@ -0,0 +1,66 @@
+"""
+Builds the episode index sidecar of an hdf5 dataset (see robocasa/utils/dataset_index.py) and prints a
+summary of its contents. Optionally lists the episodes matching a set of filters.
+
+Example:
+    python robocasa/scripts/build_dataset_index.py --dataset /path/to/demo.hdf5
+    python robocasa/scripts/build_dataset_index.py --dataset /path/to/demo.hdf5 --layout_ids 1 2 --obj_cats apple
+"""
+
+import argparse
+import time
+from collections import Counter
+
+from robocasa.utils.dataset_index import build_episode_index, load_episode_index
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", type=str, required=True, help="path to hdf5 dataset")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="rebuild the index even if an up-to-date one exists",
+    )
+    parser.add_argument("--layout_ids", type=int, nargs="+", default=None)
+    parser.add_argument("--style_ids", type=int, nargs="+", default=None)
+    parser.add_argument("--obj_cats", type=str, nargs="+", default=None)
+    parser.add_argument("--lang", type=str, default=None)
+    parser.add_argument("--min_length", type=int, default=None)
+    args = parser.parse_args()
+
+    t = time.perf_counter()
+    if args.force:
+        index = build_episode_index(args.dataset)
+    else:
+        index = load_episode_index(args.dataset)
+    print("loaded index in {:.3f} s".format(time.perf_counter() - t))
+
+    print(
+        "{} episodes, {} samples, {} layouts, {} styles".format(
+            len(index),
+            index.total_length,
+            len(set(index["layout_id"].tolist())),
+            len(set(index["style_id"].tolist())),
+        )
+    )
+    cat_counts = Counter(index["obj_cats"].tolist())
+    print("most common object categories:")
+    for cat, count in cat_counts.most_common(10):
+        print("    {:<30} {}".format(cat, count))
+
+    filters = dict(
+        layout_ids=args.layout_ids,
+        style_ids=args.style_ids,
+        obj_cats=args.obj_cats,
+        lang=args.lang,
+        min_length=args.min_length,
+    )
+    if any(v is not None for v in filters.values()):
+        t = time.perf_counter()
+        selected = index.select(**filters)
+        print(
+            "{} matching episodes (selected in {:.2f} ms):".format(
+                len(selected), (time.perf_counter() - t) * 1e3
+            )
+        )
+        print(" ".join(index.get_names(selected)))
@@ -0,0 +1,75 @@
+"""
+Generates a scene bank (see robocasa/utils/scene_bank.py): resets an environment the given number of times and
+saves each scene's episode meta data, compiled model and settled initial state. Optionally compares the time of
+a regular reset against loading a scene from the bank.
+
+Environments created with scene_bank=<bank dir> load scene k with env.reset_to_scene(k), or through the gym
+wrapper with env.reset(options={"scene_index": k}).
+
+Example:
+    python robocasa/scripts/build_scene_bank.py --env PnPCupToDrawerClose --robot GR1ArmsOnly --num_scenes 50 \
+        --out /path/to/bank --mjb --benchmark
+"""
+
+import argparse
+import time
+
+import numpy as np
+from termcolor import colored
+
+from robocasa.utils.gym_utils.gymnasium_basic import create_env_robosuite
+from robocasa.utils.scene_bank import generate_scene_bank
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--env", type=str, required=True, help="environment name")
+    parser.add_argument("--robot", type=str, default="GR1ArmsOnly", help="robot name")
+    parser.add_argument("--num_scenes", type=int, default=50, help="number of scenes")
+    parser.add_argument("--out", type=str, required=True, help="bank directory")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the environment")
+    parser.add_argument(
+        "--mjb",
+        action="store_true",
+        help="also save the compiled models in MuJoCo's binary format, for faster loading",
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="compare the time of regular resets against loading scenes from the bank",
+    )
+    args = parser.parse_args()
+
+    env, _ = create_env_robosuite(
+        env_name=args.env, robots=args.robot, enable_render=False, seed=args.seed
+    )
+    generate_scene_bank(env, args.out, args.num_scenes, save_mjb=args.mjb)
+    print(colored("saved {} scenes to {}".format(args.num_scenes, args.out), "green"))
+
+    if args.benchmark:
+        n = min(args.num_scenes, 10)
+        t = time.perf_counter()
+        for _ in range(n):
+            env.reset()
+        reset_time = (time.perf_counter() - t) / n
+        env.close()
+
+        env, _ = create_env_robosuite(
+            env_name=args.env, robots=args.robot, enable_render=False, scene_bank=args.out
+        )
+        max_err = 0.0
+        t = time.perf_counter()
+        for k in range(n):
+            env.reset_to_scene(k)
+        bank_time = (time.perf_counter() - t) / n
+        for k in range(n):
+            env.reset_to_scene(k)
+            scene = env.scene_bank.load_scene(k)
+            max_err = max(
+                max_err, np.max(np.abs(env.sim.get_state().flatten() - scene["state"]))
+            )
+        print(
+            "reset {:.3f} s, load scene from bank {:.3f} s ({:.1f}x), max state error {:.2e}".format(
+                reset_time, bank_time, reset_time / bank_time, max_err
+            )
+        )
+    env.close()
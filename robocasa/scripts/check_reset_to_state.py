@@ -0,0 +1,92 @@
+"""
+Checks that Tabletop.reset_to_state restores recorded episodes, including tasks whose model build or reset
+reads the object placements (shelf level, tiered basket level and laptop tasks).
+
+For each environment, a scene is generated and recorded, a different scene is generated, and the recorded
+one is restored with reset_to_state. The restored simulation state must equal the recorded state, and the
+object placements must match the restored object poses, otherwise an AssertionError is raised.
+
+Example:
+    python robocasa/scripts/check_reset_to_state.py --envs PnPObjectsToShelfLevel TabletopLaptopOpen
+"""
+
+import argparse
+
+import numpy as np
+from termcolor import colored
+
+from robocasa.utils.gym_utils.gymnasium_basic import create_env_robosuite
+
+
+def check_reset_to_state(env, atol):
+    """
+    Records the current scene of @env, resets to a new scene and restores the recorded one
+
+    Returns:
+        list: descriptions of the mismatches found
+    """
+    model_xml = env.sim.model.get_xml()
+    ep_meta = env.get_ep_meta()
+    state = env.sim.get_state().flatten()
+
+    env.reset()
+    env.reset_to_state(model_xml, ep_meta, state)
+
+    mismatches = []
+    if not np.array_equal(env.sim.get_state().flatten(), state):
+        mismatches.append("restored simulation state differs from the recorded state")
+    for name, (pos, quat, obj) in env.object_placements.items():
+        body_id = env.sim.model.body_name2id(obj.root_body)
+        if not np.allclose(env.sim.data.body_xpos[body_id], pos, atol=atol):
+            mismatches.append("placement position of {} differs".format(name))
+        # q and -q are the same orientation
+        xquat = env.sim.data.body_xquat[body_id]
+        if not (
+            np.allclose(xquat, quat, atol=atol) or np.allclose(xquat, -quat, atol=atol)
+        ):
+            mismatches.append("placement orientation of {} differs".format(name))
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--envs",
+        type=str,
+        nargs="+",
+        default=[
+            "PnPObjectsToShelfLevel",
+            "PnPObjectsToTieredBasketLevel",
+            "TabletopLaptopOpen",
+        ],
+        help="environment names",
+    )
+    parser.add_argument("--robot", type=str, default="GR1ArmsOnly", help="robot name")
+    parser.add_argument(
+        "--atol",
+        type=float,
+        default=1e-6,
+        help="tolerance of the comparison between object placements and poses",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    failures = []
+    for env_name in args.envs:
+        env, _ = create_env_robosuite(
+            env_name=env_name,
+            robots=args.robot,
+            enable_render=False,
+            seed=args.seed,
+        )
+        env.reset()
+        mismatches = check_reset_to_state(env, args.atol)
+        env.close()
+        if len(mismatches) > 0:
+            failures.extend("{}: {}".format(env_name, m) for m in mismatches)
+            print(colored("{}: {}".format(env_name, "; ".join(mismatches)), "red"))
+        else:
+            print(colored("{}: restored".format(env_name), "green"))
+
+    if len(failures) > 0:
+        raise AssertionError("\n".join(failures))
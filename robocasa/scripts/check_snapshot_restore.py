@@ -0,0 +1,148 @@
+"""
+Checks that env.snapshot() / env.restore() reproduce rollouts exactly.
+
+Runs a random rollout, takes a snapshot, records the branch that follows, restores the
+snapshot and replays the same actions. The trajectories of all branches (full MuJoCo integration
+state, controller torques and observations after every step) must be bit-identical, otherwise an
+AssertionError is raised. Also reports the time taken by snapshot and restore.
+
+Example:
+    python robocasa/scripts/check_snapshot_restore.py --env PnPCupToDrawerClose --robot GR1ArmsOnly
+"""
+
+import argparse
+import time
+
+import numpy as np
+from termcolor import colored
+
+import robocasa  # noqa: F401
+import robocasa.utils.snapshot_utils as SnapshotUtils
+from robocasa.utils.gym_utils.gymnasium_basic import create_env_robosuite
+
+
+def rollout(env, actions):
+    """
+    Steps the environment through a sequence of actions
+
+    Returns:
+        list: one dict per step with the integration state, controller torques and observations
+    """
+    trajectory = []
+    for action in actions:
+        obs, _, _, _ = env.step(action)
+        step = {
+            "mj_state": SnapshotUtils.get_mj_state(env.sim),
+            "torques": np.concatenate(
+                [np.asarray(robot.torques, dtype=float).ravel() for robot in env.robots]
+            ),
+        }
+        step.update({"obs/" + k: np.asarray(v) for k, v in obs.items()})
+        trajectory.append(step)
+    return trajectory
+
+
+def find_mismatch(trajectory, ref_trajectory):
+    """
+    Returns:
+        tuple or None: (step, key, max abs diff) of the first difference between two trajectories
+    """
+    for j, (step, ref_step) in enumerate(zip(trajectory, ref_trajectory)):
+        for k in ref_step:
+            if k not in step or not np.array_equal(step[k], ref_step[k]):
+                diff = (
+                    np.max(np.abs(step[k] - ref_step[k]))
+                    if k in step and step[k].shape == ref_step[k].shape
+                    else np.inf
+                )
+                return j, k, diff
+    return None
+
+
+def check_snapshot_restore(env, warmup_steps, branch_steps, num_branches, seed):
+    """
+    Branches @num_branches times from a snapshot taken after @warmup_steps random actions and
+    compares each branch against the first one
+
+    Raises:
+        AssertionError: [Branch trajectory differs from the reference trajectory]
+    """
+    rng = np.random.default_rng(seed)
+    low, high = env.action_spec
+
+    env.reset()
+    rollout(env, rng.uniform(low, high, size=(warmup_steps, len(low))))
+
+    t = time.perf_counter()
+    snap = env.snapshot()
+    snapshot_time = time.perf_counter() - t
+
+    actions = rng.uniform(low, high, size=(branch_steps, len(low)))
+    ref_trajectory = rollout(env, actions)
+
+    mismatches = []
+    restore_times = []
+    for i in range(num_branches):
+        t = time.perf_counter()
+        env.restore(snap)
+        restore_times.append(time.perf_counter() - t)
+
+        mismatch = find_mismatch(rollout(env, actions), ref_trajectory)
+        if mismatch is not None:
+            mismatches.append(
+                "branch {}: diverged at step {} in {} (max abs diff {:.3e})".format(
+                    i, *mismatch
+                )
+            )
+            print(colored(mismatches[-1], "red"))
+        else:
+            print(colored("branch {}: bit-identical".format(i), "green"))
+
+    print(
+        "snapshot: {:.1f} us, restore: {:.1f} us (mean over {} restores)".format(
+            snapshot_time * 1e6, np.mean(restore_times) * 1e6, num_branches
+        )
+    )
+    if len(mismatches) > 0:
+        raise AssertionError("\n".join(mismatches))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--env", type=str, required=True, help="environment name")
+    parser.add_argument("--robot", type=str, default="GR1ArmsOnly", help="robot name")
+    parser.add_argument(
+        "--warmup_steps",
+        type=int,
+        default=20,
+        help="number of steps before taking the snapshot",
+    )
+    parser.add_argument(
+        "--branch_steps",
+        type=int,
+        default=50,
+        help="number of steps in each branch",
+    )
+    parser.add_argument(
+        "--num_branches",
+        type=int,
+        default=3,
+        help="number of times to restore the snapshot",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    env, _ = create_env_robosuite(
+        env_name=args.env,
+        robots=args.robot,
+        enable_render=False,
+        seed=args.seed,
+    )
+    check_snapshot_restore(
+        env,
+        warmup_steps=args.warmup_steps,
+        branch_steps=args.branch_steps,
+        num_branches=args.num_branches,
+        seed=args.seed,
+    )
+    env.close()
@@ -0,0 +1,149 @@
+"""
+Replays the actions of recorded demonstrations under each physics profile (see
+robocasa/utils/physics_profiles.py) and compares the resulting trajectories against the default profile.
+Reports the mean step time, the joint position divergence over the episode, the final object position
+divergence and the agreement of the success labels with the default profile.
+
+Example:
+    python robocasa/scripts/compare_physics_profiles.py --dataset /path/to/demo.hdf5 --n 20
+"""
+
+import argparse
+import time
+
+import h5py
+import numpy as np
+from termcolor import colored
+
+import robocasa
+from robocasa.scripts.playback_dataset import get_env_metadata_from_dataset, reset_to
+from robocasa.utils.physics_profiles import PHYSICS_PROFILES
+
+
+def make_env(dataset, physics_profile):
+    env_meta = get_env_metadata_from_dataset(dataset_path=dataset)
+    env_kwargs = env_meta["env_kwargs"]
+    env_kwargs["env_name"] = env_meta["env_name"]
+    env_kwargs["has_renderer"] = False
+    env_kwargs["has_offscreen_renderer"] = False
+    env_kwargs["use_camera_obs"] = False
+    env_kwargs["physics_profile"] = physics_profile
+    env_kwargs.pop("env_lang", None)
+    return robocasa.make(**env_kwargs)
+
+
+def replay_episode(env, initial_state, actions):
+    """
+    Restores the initial state of an episode and replays its actions
+
+    Returns:
+        dict: joint positions after each step, final object positions, whether the task succeeded at any
+            step and at the last step, and the mean step time
+    """
+    reset_to(env, initial_state)
+    qpos = []
+    success_any = False
+    t = time.perf_counter()
+    for action in actions:
+        env.step(action)
+        qpos.append(np.array(env.sim.data.qpos))
+        success_any = success_any or bool(env._check_success())
+    step_time = (time.perf_counter() - t) / len(actions)
+    obj_pos = np.array(
+        [env.sim.data.body_xpos[env.obj_body_id[name]] for name in sorted(env.objects)]
+    )
+    return dict(
+        qpos=np.array(qpos),
+        obj_pos=obj_pos,
+        success_any=success_any,
+        success_final=bool(env._check_success()),
+        step_time=step_time,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", type=str, required=True, help="path to hdf5 dataset")
+    parser.add_argument(
+        "--n",
+        type=int,
+        default=None,
+        help="(optional) number of episodes to replay",
+    )
+    parser.add_argument(
+        "--profiles",
+        type=str,
+        nargs="+",
+        default=[p for p in PHYSICS_PROFILES if p != "default"],
+        choices=list(PHYSICS_PROFILES.keys()),
+        help="physics profiles to compare against the default profile",
+    )
+    args = parser.parse_args()
+
+    episodes = []
+    with h5py.File(args.dataset, "r") as f:
+        demos = sorted(f["data"].keys(), key=lambda x: int(x[5:]))
+        if args.n is not None:
+            demos = demos[: args.n]
+        for ep in demos:
+            ep_grp = f["data/{}".format(ep)]
+            episodes.append(
+                dict(
+                    initial_state=dict(
+                        states=ep_grp["states"][0],
+                        model=ep_grp.attrs["model_file"],
+                        ep_meta=ep_grp.attrs.get("ep_meta", None),
+                    ),
+                    actions=ep_grp["actions"][()],
+                )
+            )
+
+    results = dict()
+    for profile in ["default"] + [p for p in args.profiles if p != "default"]:
+        env = make_env(args.dataset, physics_profile=profile)
+        results[profile] = [replay_episode(env, **ep) for ep in episodes]
+        env.close()
+
+    ref = results["default"]
+    ref_step_time = np.mean([r["step_time"] for r in ref])
+    print(
+        "{:>10}: step time {:.2f} ms, success rate {:.2f}".format(
+            "default",
+            ref_step_time * 1e3,
+            np.mean([r["success_any"] for r in ref]),
+        )
+    )
+    for profile, res in results.items():
+        if profile == "default":
+            continue
+        step_time = np.mean([r["step_time"] for r in res])
+        qpos_div = [
+            np.max(np.abs(r["qpos"] - r_ref["qpos"])) for r, r_ref in zip(res, ref)
+        ]
+        obj_div = [
+            np.max(np.linalg.norm(r["obj_pos"] - r_ref["obj_pos"], axis=-1))
+            for r, r_ref in zip(res, ref)
+        ]
+        agree_any = np.mean(
+            [r["success_any"] == r_ref["success_any"] for r, r_ref in zip(res, ref)]
+        )
+        agree_final = np.mean(
+            [r["success_final"] == r_ref["success_final"] for r, r_ref in zip(res, ref)]
+        )
+        print(
+            colored(
+                "{:>10}: step time {:.2f} ms ({:.2f}x), success rate {:.2f}, success agreement {:.2f} "
+                "(final step {:.2f}), max qpos divergence {:.3e} (mean over episodes), "
+                "final object divergence {:.3f} m".format(
+                    profile,
+                    step_time * 1e3,
+                    ref_step_time / step_time,
+                    np.mean([r["success_any"] for r in res]),
+                    agree_any,
+                    agree_final,
+                    np.mean(qpos_div),
+                    np.mean(obj_div),
+                ),
+                "green",
+            )
+        )
@@ -0,0 +1,195 @@
+"""
+Rewrites an hdf5 dataset with chunk shapes and compression tuned for training reads.
+
+Training samples fixed-length windows of a few keys at random positions. With the default chunking of the
+recorded datasets such a window touches many small chunks, or a few chunks much longer than the window. This
+script stores each selected key chunked along time in blocks of --window steps, so that a window read touches
+at most two chunks, and compresses them with the chosen filter. Other datasets are copied unchanged. All
+attributes (env_args, model_file, ep_meta, ...) and filter masks are preserved.
+
+Use benchmark_dataset_reads.py to compare random window reads before and after.
+
+Example:
+    python robocasa/scripts/optimize_dataset_layout.py --dataset /path/to/demo.hdf5 --output /path/to/demo_opt.hdf5 \
+        --window 16 --keys actions obs/robot0_agentview_left_image --compression lzf
+"""
+
+import argparse
+import os
+
+import h5py
+from tqdm import tqdm
+
+
+def matches_keys(key, keys):
+    """
+    Returns whether the dataset @key (relative to its episode group, e.g. "obs/robot0_eef_pos") is selected
+    by @keys. A key selects itself and everything under it, e.g. "obs" selects all observations
+    """
+    if keys is None:
+        return True
+    return any(key == k or key.startswith(k + "/") for k in keys)
+
+
+def copy_attrs(src, dst):
+    for k, v in src.attrs.items():
+        dst.attrs[k] = v
+
+
+def copy_episode(src_grp, dst_grp, window, keys, compression, compression_opts, shuffle):
+    """
+    Copies the datasets of an episode group, rechunking the selected ones
+
+    Returns:
+        int: number of rechunked datasets
+    """
+    n_rechunked = 0
+    copy_attrs(src_grp, dst_grp)
+    for name, src in src_grp.items():
+        if isinstance(src, h5py.Group):
+            # keys relative to the subgroup, None if the whole subgroup is selected
+            sub_keys = None
+            if keys is not None and name not in keys:
+                sub_keys = [k[len(name) + 1 :] for k in keys if k.startswith(name + "/")]
+            sub_grp = dst_grp.create_group(name)
+            n_rechunked += copy_episode(
+                src,
+                sub_grp,
+                window,
+                sub_keys,
+                compression,
+                compression_opts,
+                shuffle,
+            )
+            continue
+        if (
+            not matches_keys(name, keys)
+            or src.ndim == 0
+            or src.shape[0] == 0
+            or src.dtype.kind == "O"
+        ):
+            src_grp.copy(src, dst_grp, name=name)
+            continue
+        chunks = (min(window, src.shape[0]),) + src.shape[1:]
+        dst = dst_grp.create_dataset(
+            name,
+            data=src[()],
+            chunks=chunks,
+            compression=compression,
+            compression_opts=compression_opts,
+            shuffle=shuffle and compression is not None,
+        )
+        copy_attrs(src, dst)
+        n_rechunked += 1
+    return n_rechunked
+
+
+def optimize_dataset(
+    dataset,
+    output,
+    window=16,
+    keys=None,
+    compression="lzf",
+    compression_opts=None,
+    shuffle=True,
+):
+    """
+    Writes a copy of @dataset to @output with the selected keys of every episode chunked in blocks of @window
+    steps and compressed with @compression
+
+    Args:
+        dataset (str): path to the input dataset
+
+        output (str): path to the output dataset
+
+        window (int): number of time steps per chunk, i.e. the length of the windows read during training
+
+        keys (list): keys to rechunk, relative to the episode groups (e.g. "actions", "obs" or
+            "obs/robot0_eef_pos"). If None, all datasets are rechunked
+
+        compression (str): "gzip", "lzf" or None
+
+        compression_opts (int): compression level for gzip
+
+        shuffle (bool): whether to apply the byte shuffle filter before compression
+    """
+    assert os.path.abspath(dataset) != os.path.abspath(output)
+    n_rechunked = 0
+    with h5py.File(dataset, "r") as f_in, h5py.File(output, "w") as f_out:
+        copy_attrs(f_in, f_out)
+        for name, src in f_in.items():
+            if name != "data":
+                # filter masks and any other top-level groups are copied as they are
+                f_in.copy(src, f_out, name=name)
+                continue
+            data_grp = f_out.create_group("data")
+            copy_attrs(src, data_grp)
+            for ep in tqdm(list(src.keys())):
+                ep_grp = data_grp.create_group(ep)
+                n_rechunked += copy_episode(
+                    src[ep],
+                    ep_grp,
+                    window,
+                    keys,
+                    compression,
+                    compression_opts,
+                    shuffle,
+                )
+    print(
+        "rechunked {} datasets, size {:.1f} MB -> {:.1f} MB".format(
+            n_rechunked,
+            os.path.getsize(dataset) / 1e6,
+            os.path.getsize(output) / 1e6,
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", type=str, required=True, help="path to hdf5 dataset")
+    parser.add_argument(
+        "--output", type=str, required=True, help="path to write the optimized dataset to"
+    )
+    parser.add_argument(
+        "--window",
+        type=int,
+        default=16,
+        help="length of the windows read during training, used as the chunk length",
+    )
+    parser.add_argument(
+        "--keys",
+        type=str,
+        nargs="+",
+        default=None,
+        help="(optional) keys read during training, relative to the episode groups (e.g. actions obs/robot0_eef_pos). "
+        "Defaults to all keys",
+    )
+    parser.add_argument(
+        "--compression",
+        type=str,
+        default="lzf",
+        choices=["gzip", "lzf", "none"],
+        help="compression filter",
+    )
+    parser.add_argument(
+        "--compression_level",
+        type=int,
+        default=None,
+        help="(optional) gzip compression level",
+    )
+    parser.add_argument(
+        "--no_shuffle",
+        action="store_true",
+        help="disable the byte shuffle filter",
+    )
+    args = parser.parse_args()
+
+    optimize_dataset(
+        args.dataset,
+        args.output,
+        window=args.window,
+        keys=args.keys,
+        compression=None if args.compression == "none" else args.compression,
+        compression_opts=args.compression_level,
+        shuffle=not args.no_shuffle,
+    )
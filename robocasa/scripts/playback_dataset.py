@@ -236,7 +236,7 @@ class ObservationKeyToModalityDict(dict):
         return super(ObservationKeyToModalityDict, self).__getitem__(item)
 
 
-def reset_to(env, state):
+def reset_to(env, state, single_compile=False):
     """
     Reset to a specific simulator state.
 
@@ -245,11 +245,25 @@ def reset_to(env, state):
             - states (np.ndarray): initial state of the mujoco environment
             - model (str): mujoco scene xml
 
+        single_compile (bool): if True and supported by the environment, restores the model and
+            state with a single model compilation instead of resetting and reloading the xml. This
+            path skips settling, so controllers are not advanced the way the legacy reset advances
+            them; it is opt-in until both paths are shown to replay identically
+
     Returns:
         observation (dict): observation dictionary after setting the simulator state (only
             if "states" is in @state)
     """
     should_ret = False
+    if (
+        single_compile
+        and "model" in state
+        and "states" in state
+        and hasattr(env, "reset_to_state")
+    ):
+        # single-compile restore path
+        env.reset_to_state(state["model"], state.get("ep_meta", None), state["states"])
+        return None
     if "model" in state:
         if state.get("ep_meta", None) is not None:
             # set relevant episode information
@@ -281,6 +295,9 @@ def reset_to(env, state):
     if "states" in state:
         env.sim.set_state_from_flattened(state["states"])
         env.sim.forward()
+        if hasattr(env, "invalidate_contact_index"):
+            # contacts cached for the previous state are no longer valid
+            env.invalidate_contact_index()
         should_ret = True
 
     # update state as needed
@@ -330,7 +347,7 @@ def make_env_from_args(args):
         )
     if "env_lang" in env_kwargs:
         env_kwargs.pop("env_lang")
-    env = robosuite.make(**env_kwargs)
+    env = robocasa.make(**env_kwargs)
     return env
 
 
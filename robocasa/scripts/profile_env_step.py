@@ -0,0 +1,47 @@
+"""
+Profiles the sections of environment steps (physics substeps, controllers, post action, reward, success
+check, observable sensors, camera renders and gym wrapper post-processing) with random actions, prints
+a summary table and optionally appends the statistics to a JSON lines file.
+
+Example:
+    python robocasa/scripts/profile_env_step.py --env PnPCupToDrawerClose --robot GR1ArmsOnly --out profile.jsonl
+"""
+
+import argparse
+
+import robocasa  # noqa: F401
+from robocasa.utils.gym_utils.gymnasium_basic import RoboCasaEnv
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--env", type=str, required=True, help="environment name")
+    parser.add_argument("--robot", type=str, default="GR1ArmsOnly", help="robot name")
+    parser.add_argument("--n_steps", type=int, default=200, help="number of steps")
+    parser.add_argument(
+        "--no_render", action="store_true", help="disable camera observations"
+    )
+    parser.add_argument(
+        "--out",
+        type=str,
+        default=None,
+        help="(optional) JSON lines file to append the statistics to",
+    )
+    args = parser.parse_args()
+
+    env = RoboCasaEnv(
+        env_name=args.env,
+        robots_name=args.robot,
+        enable_render=not args.no_render,
+        profile_steps=True,
+    )
+    env.reset(seed=0)
+    # discard samples from reset
+    env.env.step_profiler.reset()
+    for _ in range(args.n_steps):
+        env.step(env.action_space.sample())
+
+    print(env.env.step_profiler.summary())
+    if args.out is not None:
+        env.env.dump_step_profile(args.out, robot=args.robot, n_steps=args.n_steps)
+        print("wrote step profile to {}".format(args.out))
+    env.close()
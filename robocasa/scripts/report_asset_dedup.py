@@ -0,0 +1,95 @@
+"""
+Reports the effect of asset deduplication (dedup_assets) on sampled scenes. For each scene, the compiled
+model is deduplicated and both versions are compiled again, to compare the number of assets, the asset
+file bytes loaded, the compile time and the size of the MjModel buffer.
+
+Example:
+    python robocasa/scripts/report_asset_dedup.py --env PnPCupToDrawerClose --n_scenes 10
+"""
+
+import argparse
+import time
+import xml.etree.ElementTree as ET
+
+import mujoco
+import numpy as np
+
+import robocasa  # noqa: F401
+from robocasa.utils.asset_dedup import dedup_assets
+from robocasa.utils.gym_utils.gymnasium_basic import create_env_robosuite
+
+
+def compile_model(xml_str, n_repeats):
+    """
+    Returns:
+        tuple: compiled model, mean compile time
+    """
+    t = time.perf_counter()
+    for _ in range(n_repeats):
+        model = mujoco.MjModel.from_xml_string(xml_str)
+    return model, (time.perf_counter() - t) / n_repeats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--env", type=str, required=True, help="environment name")
+    parser.add_argument("--robot", type=str, default="GR1ArmsOnly", help="robot name")
+    parser.add_argument("--n_scenes", type=int, default=10, help="number of scenes")
+    parser.add_argument(
+        "--n_repeats", type=int, default=3, help="number of compiles per model"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    env, _ = create_env_robosuite(
+        env_name=args.env,
+        robots=args.robot,
+        enable_render=False,
+        seed=args.seed,
+    )
+
+    rows = []
+    for i in range(args.n_scenes):
+        env.reset()
+        xml_str = env.sim.model.get_xml()
+        root = ET.fromstring(xml_str)
+        stats = dedup_assets(root)
+        dedup_xml_str = ET.tostring(root).decode("utf8")
+
+        model, compile_time = compile_model(xml_str, args.n_repeats)
+        dedup_model, dedup_compile_time = compile_model(dedup_xml_str, args.n_repeats)
+        rows.append(
+            [
+                stats["bytes_saved"],
+                compile_time,
+                dedup_compile_time,
+                model.nbuffer,
+                dedup_model.nbuffer,
+            ]
+        )
+        print(
+            "scene {}: removed {} meshes, {} textures, {} materials, {:.2f} MB of asset files; "
+            "compile {:.0f} -> {:.0f} ms; MjModel {:.1f} -> {:.1f} MB".format(
+                i,
+                stats["meshes"],
+                stats["textures"],
+                stats["materials"],
+                stats["bytes_saved"] / 1e6,
+                compile_time * 1e3,
+                dedup_compile_time * 1e3,
+                model.nbuffer / 1e6,
+                dedup_model.nbuffer / 1e6,
+            )
+        )
+    env.close()
+
+    rows = np.array(rows)
+    print(
+        "mean: {:.2f} MB of asset files saved, compile {:.0f} -> {:.0f} ms, MjModel {:.1f} -> {:.1f} MB".format(
+            np.mean(rows[:, 0]) / 1e6,
+            np.mean(rows[:, 1]) * 1e3,
+            np.mean(rows[:, 2]) * 1e3,
+            np.mean(rows[:, 3]) / 1e6,
+            np.mean(rows[:, 4]) / 1e6,
+        )
+    )
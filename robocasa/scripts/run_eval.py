@@ -0,0 +1,241 @@
+"""
+Evaluates a policy on a task suite over many seeds (see robocasa/utils/eval_utils.py).
+
+The (task, seed) pairs are sharded across a pool of worker processes, and each result is written to the
+result store (.db / .sqlite for SQLite, .jsonl for JSON lines) as soon as it finishes. Rerunning the same
+command after an interruption skips completed pairs and retries failed ones. Throughput and success rate are
+reported live, and success rates per task at the end.
+
+Example:
+    python robocasa/scripts/run_eval.py --suite 24dc_eval --seeds 50 --policy my_policies:make_policy \
+        --results eval.db --num_workers 8
+
+    # check that each pair of the suite starts from the same initial state when run twice
+    python robocasa/scripts/run_eval.py --suite 24dc_eval --seeds 2 --check_determinism
+
+    # serve a policy from a separate process, then evaluate it through the socket
+    python robocasa/scripts/run_eval.py --serve localhost:6000 --policy my_policies:make_policy
+    python robocasa/scripts/run_eval.py --suite pnp --seeds 10 --policy socket://localhost:6000 --results eval.jsonl
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from termcolor import colored
+from tqdm import tqdm
+
+from robocasa.utils.eval_utils import (
+    TASK_SUITES,
+    check_determinism,
+    get_completed_pairs,
+    get_task_suite,
+    init_worker,
+    load_policy_factory,
+    make_result_store,
+    run_episode,
+    serve_policy,
+)
+from robocasa.utils.prewarm_utils import get_mp_context
+
+
+def run_determinism_check(executor, tasks, seeds):
+    """
+    Runs every (task, seed) pair twice and reports the pairs whose initial states differ
+
+    Returns:
+        bool: True if all pairs are reproducible
+    """
+    futures = [
+        executor.submit(check_determinism, task, seed)
+        for task in tasks
+        for seed in seeds
+    ]
+    all_match = True
+    for future in tqdm(as_completed(futures), total=len(futures)):
+        result = future.result()
+        if result["error"] is not None or not result["match"]:
+            all_match = False
+            tqdm.write(
+                colored(
+                    "[NOT REPRODUCIBLE] {} seed {}{}".format(
+                        result["task"],
+                        result["seed"],
+                        ":\n" + result["error"] if result["error"] is not None else "",
+                    ),
+                    "red",
+                )
+            )
+    if all_match:
+        print(colored("all {} pairs are reproducible".format(len(futures)), "green"))
+    return all_match
+
+
+def print_summary(results):
+    by_task = defaultdict(list)
+    for r in results:
+        if r["error"] is None:
+            by_task[r["task"]].append(bool(r["success"]))
+    for task in sorted(by_task):
+        successes = by_task[task]
+        print(
+            "{:<70} {:>5} episodes, success rate {:.3f}".format(
+                task, len(successes), sum(successes) / len(successes)
+            )
+        )
+    all_successes = [s for successes in by_task.values() for s in successes]
+    if len(all_successes) > 0:
+        print(
+            colored(
+                "{} episodes, success rate {:.3f}".format(
+                    len(all_successes), sum(all_successes) / len(all_successes)
+                ),
+                "green",
+            )
+        )
+    n_errors = sum(r["error"] is not None for r in results)
+    if n_errors > 0:
+        print(colored("{} episodes failed with an error".format(n_errors), "red"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--suite", type=str, default=None, choices=TASK_SUITES, help="task suite"
+    )
+    parser.add_argument(
+        "--tasks",
+        type=str,
+        nargs="+",
+        default=None,
+        help="(optional) environment names to evaluate instead of a suite",
+    )
+    parser.add_argument(
+        "--seeds",
+        type=int,
+        default=10,
+        help="number of seeds per task, starting from --seed_offset",
+    )
+    parser.add_argument("--seed_offset", type=int, default=0)
+    parser.add_argument(
+        "--policy",
+        type=str,
+        default="random",
+        help='policy: "random", "socket://host:port" or "module.path:factory"',
+    )
+    parser.add_argument(
+        "--robot",
+        type=str,
+        default="GR1ArmsAndWaistFourierHands",
+        help="robot name, used to build the environment id",
+    )
+    parser.add_argument(
+        "--env_id_format",
+        type=str,
+        default="gr1_unified/{task}_{robot}_Env",
+        help="format of the gym environment ids",
+    )
+    parser.add_argument(
+        "--max_steps", type=int, default=720, help="maximum number of steps per episode"
+    )
+    parser.add_argument(
+        "--results",
+        type=str,
+        default="eval_results.db",
+        help="result store, .db / .sqlite for SQLite or .jsonl for JSON lines",
+    )
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        default=os.cpu_count(),
+        help="number of worker processes",
+    )
+    parser.add_argument(
+        "--start_method",
+        type=str,
+        default="fork",
+        choices=["spawn", "forkserver", "fork"],
+        help="start method of the workers. fork and forkserver start them prewarmed (see prewarm_utils.py)",
+    )
+    parser.add_argument(
+        "--check_determinism",
+        action="store_true",
+        help="instead of evaluating, check that running each pair twice gives the same initial state",
+    )
+    parser.add_argument(
+        "--serve",
+        type=str,
+        default=None,
+        help="(optional) host:port to serve --policy on instead of evaluating",
+    )
+    args = parser.parse_args()
+
+    if args.serve is not None:
+        host, port = args.serve.rsplit(":", 1)
+        serve_policy(load_policy_factory(args.policy), (host, int(port)))
+
+    assert (args.suite is None) != (args.tasks is None), "pass either --suite or --tasks"
+    tasks = args.tasks if args.tasks is not None else get_task_suite(args.suite)
+    seeds = range(args.seed_offset, args.seed_offset + args.seeds)
+    env_id_format = args.env_id_format.replace("{robot}", args.robot)
+
+    if args.check_determinism:
+        with ProcessPoolExecutor(
+            max_workers=args.num_workers,
+            mp_context=get_mp_context(args.start_method),
+            initializer=init_worker,
+            initargs=(args.policy, env_id_format, dict()),
+        ) as executor:
+            sys.exit(0 if run_determinism_check(executor, tasks, seeds) else 1)
+
+    store = make_result_store(args.results)
+    completed = get_completed_pairs(store)
+    # task-major order, so that consecutive pairs of a worker can reuse its environment
+    pairs = [
+        (task, seed)
+        for task in tasks
+        for seed in seeds
+        if (task, seed) not in completed
+    ]
+    print(
+        "{} tasks x {} seeds, {} pairs already completed, {} to run".format(
+            len(tasks), len(seeds), len(tasks) * len(seeds) - len(pairs), len(pairs)
+        )
+    )
+
+    n_success = 0
+    t = time.time()
+    with ProcessPoolExecutor(
+        max_workers=args.num_workers,
+        mp_context=get_mp_context(args.start_method),
+        initializer=init_worker,
+        initargs=(args.policy, env_id_format, dict()),
+    ) as executor:
+        futures = [
+            executor.submit(run_episode, task, seed, args.max_steps)
+            for task, seed in pairs
+        ]
+        progress = tqdm(as_completed(futures), total=len(futures))
+        for i, future in enumerate(progress):
+            result = future.result()
+            store.add(result)
+            n_success += result["success"]
+            if result["error"] is not None:
+                tqdm.write(
+                    colored(
+                        "[ERROR] {} seed {}:\n{}".format(
+                            result["task"], result["seed"], result["error"]
+                        ),
+                        "red",
+                    )
+                )
+            progress.set_postfix(
+                episodes_per_min="{:.1f}".format((i + 1) / (time.time() - t) * 60),
+                success_rate="{:.3f}".format(n_success / (i + 1)),
+            )
+
+    print_summary(store.get_results())
+    store.close()
@@ -0,0 +1,299 @@
+"""
+Content-hashed cache of compile-ready mesh and texture assets.
+
+Compiling a scene re-reads and decodes every mesh and texture file it references. The asset cache stores
+converted copies of these files that are cheaper to load:
+    - OBJ meshes that are only used by collision geoms that are not rendered are converted to binary STL,
+        which MuJoCo loads without text parsing
+    - textures larger than a maximum resolution are downscaled
+
+Cached files are named after the hash of the source file content and the conversion settings, so the
+same cache directory can be shared across processes, machines and asset versions. Files that do not
+benefit from conversion are not copied and keep their original path. Cached paths are local to the machine
+that built the cache: model xmls meant to be recorded must have their original paths restored with
+restore_xml_string.
+"""
+
+import hashlib
+import os
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+import robocasa.macros as macros
+from robocasa.utils.collision_utils import (
+    get_collision_mask,
+    get_default_classes,
+    get_geom_attrib,
+    get_geom_classes,
+)
+
+# bump to invalidate cached files after changing a conversion
+ASSET_CACHE_VERSION = 1
+
+STL_DTYPE = np.dtype([("normal", "<f4", 3), ("v", "<f4", (3, 3)), ("attr", "<u2")])
+
+# geom groups of visual geoms
+VISUAL_GEOM_GROUPS = ("1",)
+
+
+def get_default_asset_cache_dir():
+    if macros.ASSET_CACHE_DIR is not None:
+        return macros.ASSET_CACHE_DIR
+    return os.path.join(os.path.expanduser("~"), ".cache", "robocasa", "assets")
+
+
+def load_obj_triangles(path):
+    """
+    Loads the triangles of an OBJ mesh. Polygons are triangulated as fans
+
+    Returns:
+        np.array: (N, 3, 3) triangle vertices
+    """
+    verts = []
+    faces = []
+    with open(path, "r") as f:
+        for line in f:
+            if line.startswith("v "):
+                verts.append([float(x) for x in line.split()[1:4]])
+            elif line.startswith("f "):
+                inds = []
+                for token in line.split()[1:]:
+                    ind = int(token.split("/")[0])
+                    # obj indices are 1-based, negative indices are relative to the end
+                    inds.append(ind - 1 if ind > 0 else len(verts) + ind)
+                for i in range(1, len(inds) - 1):
+                    faces.append([inds[0], inds[i], inds[i + 1]])
+    verts = np.array(verts, dtype=np.float32).reshape(-1, 3)
+    faces = np.array(faces, dtype=np.int64).reshape(-1, 3)
+    return verts[faces]
+
+
+def write_binary_stl(path, triangles):
+    """
+    Writes triangles to a binary STL file. Normals are left at zero, as MuJoCo recomputes them
+    """
+    data = np.zeros(len(triangles), dtype=STL_DTYPE)
+    data["v"] = triangles
+    with open(path, "wb") as f:
+        f.write(b"\0" * 80)
+        f.write(np.array([len(triangles)], dtype="<u4").tobytes())
+        f.write(data.tobytes())
+
+
+def _is_rendered_geom(classes, geom, class_name):
+    """
+    Returns whether a geom is rendered with its mesh appearance: it has a material, a visible rgba, or
+    belongs to a visual geom group
+    """
+    if get_geom_attrib(classes, geom, class_name, "group") in VISUAL_GEOM_GROUPS:
+        return True
+    if get_geom_attrib(classes, geom, class_name, "material") is not None:
+        return True
+    rgba = get_geom_attrib(classes, geom, class_name, "rgba")
+    return rgba is not None and float(rgba.split()[3]) > 0
+
+
+class AssetCache:
+    """
+    Cache of converted mesh and texture files
+
+    Args:
+        cache_dir (str): directory of the cached files. If None, uses macros.ASSET_CACHE_DIR or
+            ~/.cache/robocasa/assets
+
+        max_texture_res (int): maximum width / height of cached textures. If None, textures are not cached
+
+        convert_meshes (bool): whether to convert OBJ meshes only used by unrendered collision geoms to
+            binary STL
+    """
+
+    def __init__(self, cache_dir=None, max_texture_res=1024, convert_meshes=True):
+        self.cache_dir = cache_dir or get_default_asset_cache_dir()
+        self.max_texture_res = max_texture_res
+        self.convert_meshes = convert_meshes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # maps (path, mtime, size, kind) to the resolved path, so that source files are only hashed once
+        self._resolved = dict()
+        # maps cached paths back to a source file they were converted from
+        self._sources = dict()
+        self.stats = dict(hits=0, misses=0, passthrough=0)
+
+    def _hash_file(self, path, kind):
+        h = hashlib.sha1()
+        settings = self.max_texture_res if kind == "texture" else None
+        h.update("{}:{}:{}".format(ASSET_CACHE_VERSION, kind, settings).encode())
+        with open(path, "rb") as f:
+            h.update(f.read())
+        return h.hexdigest()
+
+    def _write_atomic(self, cached_path, write_fn):
+        tmp_path = "{}.{}.tmp".format(cached_path, os.getpid())
+        write_fn(tmp_path)
+        os.replace(tmp_path, cached_path)
+
+    def _convert_mesh(self, path, digest):
+        if os.path.splitext(path)[1].lower() != ".obj":
+            return None
+        cached_path = os.path.join(self.cache_dir, "{}.stl".format(digest))
+        if not os.path.exists(cached_path):
+            triangles = load_obj_triangles(path)
+            if len(triangles) == 0:
+                return None
+            self._write_atomic(cached_path, lambda p: write_binary_stl(p, triangles))
+            self.stats["misses"] += 1
+        else:
+            self.stats["hits"] += 1
+        return cached_path
+
+    def _convert_texture(self, path, digest):
+        from PIL import Image
+
+        cached_path = os.path.join(self.cache_dir, "{}.png".format(digest))
+        if os.path.exists(cached_path):
+            self.stats["hits"] += 1
+            return cached_path
+        with Image.open(path) as img:
+            if max(img.size) <= self.max_texture_res:
+                return None
+            scale = self.max_texture_res / max(img.size)
+            size = (
+                max(1, round(img.size[0] * scale)),
+                max(1, round(img.size[1] * scale)),
+            )
+            img = img.resize(size, Image.LANCZOS)
+            self._write_atomic(
+                cached_path, lambda p: img.save(p, format="PNG", compress_level=1)
+            )
+        self.stats["misses"] += 1
+        return cached_path
+
+    def get_cached_path(self, path, kind):
+        """
+        Returns the path of the cached version of an asset file, converting it if needed
+
+        Args:
+            path (str): path to the source file
+
+            kind (str): "mesh" or "texture"
+
+        Returns:
+            str: path to the cached file, or @path if the file does not benefit from caching
+        """
+        if (
+            (kind == "mesh" and not self.convert_meshes)
+            or (kind == "texture" and self.max_texture_res is None)
+            or path.startswith(self.cache_dir)
+            or not os.path.isfile(path)
+        ):
+            return path
+        st = os.stat(path)
+        key = (path, st.st_mtime_ns, st.st_size, kind)
+        resolved = self._resolved.get(key, None)
+        if resolved is None:
+            digest = self._hash_file(path, kind)
+            if kind == "mesh":
+                resolved = self._convert_mesh(path, digest)
+            else:
+                resolved = self._convert_texture(path, digest)
+            if resolved is None:
+                resolved = path
+                self.stats["passthrough"] += 1
+            self._resolved[key] = resolved
+        if resolved != path:
+            self._sources[resolved] = path
+        return resolved
+
+    def redirect_xml(self, root, base_dir=None):
+        """
+        Redirects the mesh and texture file paths of a model to the cache. As STL files don't store normals
+        and texture coordinates, only meshes that are exclusively used by geoms that collide and are not
+        rendered (no material, no visible rgba, outside of the visual group) are converted. Geom attributes
+        are resolved through the default classes of the model
+
+        Args:
+            root (ET.Element): root of the model xml, modified in place
+
+            base_dir (str): directory relative file paths are resolved against. Relative paths are left
+                unchanged if None
+
+        Returns:
+            ET.Element: @root
+        """
+        asset = root.find("asset")
+        if asset is None:
+            return root
+
+        # meshes without a name are referenced by their file name
+        classes = get_default_classes(root)
+        visual_meshes = set()
+        for geom, class_name in get_geom_classes(root):
+            mesh = get_geom_attrib(classes, geom, class_name, "mesh")
+            if mesh is None:
+                continue
+            if get_collision_mask(
+                classes, geom, class_name
+            ) == (0, 0) or _is_rendered_geom(classes, geom, class_name):
+                visual_meshes.add(mesh)
+
+        for elem in asset:
+            path = elem.get("file")
+            if path is None or elem.tag not in ("mesh", "texture"):
+                continue
+            if elem.tag == "mesh":
+                mesh_name = elem.get(
+                    "name", os.path.splitext(os.path.basename(path))[0]
+                )
+                if mesh_name in visual_meshes:
+                    continue
+            if not os.path.isabs(path):
+                if base_dir is None:
+                    continue
+                path = os.path.join(base_dir, path)
+            cached_path = self.get_cached_path(path, elem.tag)
+            if cached_path != path:
+                elem.set("file", cached_path)
+        return root
+
+    def restore_xml(self, root):
+        """
+        Replaces the cached file paths of a model redirected by this cache by the paths of their source
+        files, so that the model can be loaded on machines that do not have the cache
+
+        Args:
+            root (ET.Element): root of the model xml, modified in place
+
+        Returns:
+            ET.Element: @root
+        """
+        asset = root.find("asset")
+        if asset is None:
+            return root
+        for elem in asset:
+            path = elem.get("file")
+            if path is not None and path in self._sources:
+                elem.set("file", self._sources[path])
+        return root
+
+    def restore_xml_string(self, xml_str):
+        """
+        Same as restore_xml, for a model given as a string
+
+        Returns:
+            str: model xml with the source asset paths
+        """
+        root = ET.fromstring(xml_str)
+        self.restore_xml(root)
+        return ET.tostring(root).decode("utf8")
+
+    def redirect_xml_string(self, xml_str, base_dir=None):
+        """
+        Same as redirect_xml, for a model given as a string
+
+        Returns:
+            str: model xml with redirected asset paths
+        """
+        root = ET.fromstring(xml_str)
+        self.redirect_xml(root, base_dir=base_dir)
+        return ET.tostring(root).decode("utf8")
@@ -0,0 +1,99 @@
+"""
+Deduplication of mesh, texture and material assets of a merged model.
+
+Each MJCFObject prefixes the names of its assets, so sampling the same object model several times (e.g.
+as task object and distractor) adds identical copies of every mesh and texture to the merged model, and
+MuJoCo loads and stores each copy separately. dedup_assets keeps a single asset for each set of assets
+with identical file content and attributes, and rewrites all references to the removed copies.
+"""
+
+import hashlib
+import os
+
+# maps (path, mtime, size) to the hash of the file content
+_FILE_DIGESTS = dict()
+
+# (asset tag, stats key, referencing tags, referencing attribute) in the order assets are deduplicated.
+# Materials are deduplicated last, as they may become identical once their textures are deduplicated
+DEDUP_ASSET_REFS = [
+    ("mesh", "meshes", ("geom",), "mesh"),
+    ("texture", "textures", ("material", "layer"), "texture"),
+    ("material", "materials", ("geom", "site", "skin"), "material"),
+]
+
+
+def get_file_digest(path):
+    """
+    Returns:
+        str: hash of the content of the file at @path, or None if the file does not exist
+    """
+    if not os.path.isfile(path):
+        return None
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    digest = _FILE_DIGESTS.get(key, None)
+    if digest is None:
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        _FILE_DIGESTS[key] = digest
+    return digest
+
+
+def _get_asset_key(elem):
+    """
+    Returns:
+        tuple: key identifying assets that are interchangeable. Assets referencing files are compared by
+            file content instead of path
+    """
+    attribs = dict(elem.attrib)
+    attribs.pop("name", None)
+    path = attribs.pop("file", None)
+    if path is not None:
+        digest = get_file_digest(path)
+        attribs["file"] = path if digest is None else digest
+    children = tuple((child.tag, tuple(sorted(child.attrib.items()))) for child in elem)
+    return (elem.tag, tuple(sorted(attribs.items())), children)
+
+
+def dedup_assets(root):
+    """
+    Removes duplicate mesh, texture and material assets from a model, modified in place
+
+    Args:
+        root (ET.Element): root of the model xml
+
+    Returns:
+        dict: number of removed assets per asset type, and the size in bytes of the asset files that are no
+            longer loaded
+    """
+    stats = dict(meshes=0, textures=0, materials=0, bytes_saved=0)
+    asset = root.find("asset")
+    if asset is None:
+        return stats
+
+    for tag, stats_key, ref_tags, ref_attrib in DEDUP_ASSET_REFS:
+        kept = dict()
+        renames = dict()
+        for elem in list(asset.findall(tag)):
+            name = elem.get("name")
+            if name is None:
+                continue
+            key = _get_asset_key(elem)
+            if key not in kept:
+                kept[key] = name
+                continue
+            renames[name] = kept[key]
+            asset.remove(elem)
+            stats[stats_key] += 1
+            if elem.get("file") is not None and os.path.isfile(elem.get("file")):
+                stats["bytes_saved"] += os.path.getsize(elem.get("file"))
+
+        if len(renames) == 0:
+            continue
+        for ref_tag in ref_tags:
+            for elem in root.iter(ref_tag):
+                ref = elem.get(ref_attrib)
+                if ref in renames:
+                    elem.set(ref_attrib, renames[ref])
+
+    return stats
@@ -0,0 +1,260 @@
+"""
+Utilities for filtering collisions between static parts of a scene at model build time.
+
+MuJoCo generates a contact candidate for two geoms g1 and g2 if
+(contype[g1] & conaffinity[g2]) or (contype[g2] & conaffinity[g1]) is non-zero.
+filter_static_collisions rewrites the collision bitmasks so that the static geoms of the given bodies
+never collide with each other, while collisions between these geoms and all other geoms (robots, objects,
+moving fixture parts such as doors and drawers) stay exactly the same.
+"""
+
+import xml.etree.ElementTree as ET
+
+# value of contype and conaffinity if not set on the geom or its default class
+DEFAULT_COLLISION_MASK = 1
+# contype and conaffinity are signed 32 bit integers
+NUM_COLLISION_BITS = 31
+
+
+def _collides(mask_1, mask_2):
+    """
+    Returns whether two geoms with (contype, conaffinity) masks @mask_1 and @mask_2 can collide
+    """
+    return bool((mask_1[0] & mask_2[1]) or (mask_2[0] & mask_1[1]))
+
+
+def get_default_classes(root):
+    """
+    Collects the geom defaults of each default class of the model
+
+    Returns:
+        dict: maps class name to (parent class name, geom attributes)
+    """
+    classes = dict()
+
+    def _add(default, parent):
+        name = default.get("class", "main")
+        geom = default.find("geom")
+        classes[name] = (parent, {} if geom is None else dict(geom.attrib))
+        for child in default.findall("default"):
+            _add(child, name)
+
+    for default in root.findall("default"):
+        _add(default, None)
+    return classes
+
+
+def _get_default_attrib(classes, class_name, attrib):
+    """
+    Looks up a geom attribute in a default class and its parents
+    """
+    while class_name is not None and class_name in classes:
+        parent, attribs = classes[class_name]
+        if attrib in attribs:
+            return attribs[attrib]
+        class_name = parent
+    return None
+
+
+def get_geom_attrib(classes, geom, class_name, attrib):
+    """
+    Returns the value of a geom attribute, set on the geom itself or inherited from its default class
+
+    Args:
+        classes (dict): default classes of the model, see get_default_classes
+        geom (ET.Element): geom
+        class_name (str): default class of the geom (its class attribute, or the childclass of its bodies)
+        attrib (str): attribute name
+
+    Returns:
+        str: value of the attribute, or None if it is set neither on the geom nor in its default classes
+    """
+    value = geom.get(attrib, None)
+    if value is None:
+        value = _get_default_attrib(classes, class_name, attrib)
+    return value
+
+
+def get_collision_mask(classes, geom, class_name):
+    """
+    Returns:
+        2-tuple: effective (contype, conaffinity) of a geom, see get_geom_attrib
+    """
+    mask = []
+    for attrib in ("contype", "conaffinity"):
+        value = get_geom_attrib(classes, geom, class_name, attrib)
+        mask.append(DEFAULT_COLLISION_MASK if value is None else int(value))
+    return tuple(mask)
+
+
+def _has_joint(body):
+    """
+    Returns whether @body can move relative to its parent
+    """
+    return body.find("joint") is not None or body.find("freejoint") is not None
+
+
+def _iter_geoms(body, childclass, in_subtree, moving, static_elems):
+    """
+    Iterates over all geoms below @body, along with their default class and whether they are static,
+    i.e. belong to a static body subtree and are not attached to a body that has a joint or descends
+    from one
+
+    Args:
+        body (ET.Element): body to iterate
+        childclass (str): default class inherited from the parent bodies
+        in_subtree (bool): whether @body is part of a static body subtree
+        moving (bool): whether @body or one of its ancestors has a joint
+        static_elems (set of ET.Element): root bodies of the static subtrees
+    """
+    in_subtree = in_subtree or body in static_elems
+    moving = moving or _has_joint(body)
+    childclass = body.get("childclass", childclass)
+    for geom in body.findall("geom"):
+        yield geom, geom.get("class", childclass), in_subtree and not moving
+    for child in body.findall("body"):
+        yield from _iter_geoms(child, childclass, in_subtree, moving, static_elems)
+
+
+def get_collision_masks(root, static_bodies, include_world_geoms=True):
+    """
+    Resolves the effective collision masks of all geoms of a model
+
+    Args:
+        root (ET.Element): root of the model xml
+        static_bodies (set of str): names of the root bodies of the static subtrees. Bodies with joints
+            and their descendants are never static
+        include_world_geoms (bool): whether geoms attached directly to the worldbody are static
+
+    Returns:
+        list: (geom, (contype, conaffinity), static) for each geom of the model
+    """
+    classes = get_default_classes(root)
+    worldbody = root.find("worldbody")
+    static_elems = set(
+        body for body in worldbody.iter("body") if body.get("name") in static_bodies
+    )
+    return [
+        (geom, get_collision_mask(classes, geom, class_name), static)
+        for geom, class_name, static in _get_geoms(
+            worldbody, static_elems, include_world_geoms
+        )
+    ]
+
+
+def _get_geoms(worldbody, static_elems, include_world_geoms):
+    """
+    Returns:
+        list: (geom, default class, static) for each geom of the model, see _iter_geoms
+    """
+    geoms = [
+        (geom, geom.get("class", "main"), include_world_geoms)
+        for geom in worldbody.findall("geom")
+    ]
+    for body in worldbody.findall("body"):
+        geoms.extend(_iter_geoms(body, "main", False, False, static_elems))
+    return geoms
+
+
+def get_geom_classes(root):
+    """
+    Returns:
+        list: (geom, default class) for each geom of the model. The default class is the class attribute of
+            the geom, or else the childclass inherited from its bodies
+    """
+    return [
+        (geom, class_name)
+        for geom, class_name, _ in _get_geoms(root.find("worldbody"), set(), False)
+    ]
+
+
+def filter_static_collisions(xml_str, static_bodies):
+    """
+    Rewrites the contype / conaffinity bitmasks of a model so that static geoms in the subtrees of
+    @static_bodies never collide with each other, while their collisions with all other geoms are
+    unchanged. Geoms of bodies with joints (doors, drawers, knobs) and of their descendants are not
+    static and keep colliding with everything.
+
+    Each distinct contype value C of the static geoms is replaced by a single unused bit B_C, and B_C
+    is added to the conaffinity of every other geom whose conaffinity overlaps with C. Static geoms keep
+    their conaffinity, which never contains any of the new bits, so no two static geoms can collide.
+    The new masks are verified exhaustively over all distinct mask combinations of the model.
+
+    Raises:
+        ValueError: [New masks change a collision other than between two static geoms]
+
+    Args:
+        xml_str (str): model xml
+        static_bodies (list of str): names of the root bodies of the static subtrees (e.g. fixtures)
+
+    Returns:
+        2-tuple:
+            - (str) model xml with filtered collisions. Unchanged if there is nothing to filter, or if
+                there are not enough unused collision bits
+            - (dict) statistics: number of static geoms, and number of distinct static mask pairs that
+                could collide before and after filtering
+    """
+    root = ET.fromstring(xml_str)
+    masks = get_collision_masks(root, set(static_bodies))
+
+    static_masks = set(m for (_, m, static) in masks if static and m != (0, 0))
+    other_masks = set(m for (_, m, static) in masks if not static)
+    stats = dict(
+        num_static_geoms=sum(1 for (_, m, static) in masks if static and m != (0, 0)),
+        static_pairs_before=sum(
+            _collides(m1, m2) for m1 in static_masks for m2 in static_masks
+        ),
+        static_pairs_after=0,
+    )
+    if stats["static_pairs_before"] == 0:
+        # nothing to filter (possibly already filtered)
+        return xml_str, stats
+
+    used_bits = 0
+    for _, (contype, conaffinity), _ in masks:
+        used_bits |= contype | conaffinity
+    free_bits = [
+        1 << i for i in reversed(range(NUM_COLLISION_BITS)) if not (used_bits >> i) & 1
+    ]
+    contypes = sorted(set(contype for (contype, _) in static_masks if contype != 0))
+    if len(free_bits) < len(contypes):
+        stats["static_pairs_after"] = stats["static_pairs_before"]
+        return xml_str, stats
+    new_bits = dict(zip(contypes, free_bits))
+
+    def _new_mask(mask, static):
+        contype, conaffinity = mask
+        if static:
+            return (new_bits.get(contype, 0), conaffinity)
+        for c, bit in new_bits.items():
+            if conaffinity & c:
+                conaffinity |= bit
+        return (contype, conaffinity)
+
+    # verify that only static-static collisions are removed
+    for m1, s1 in [(m, True) for m in static_masks] + [(m, False) for m in other_masks]:
+        for m2, s2 in [(m, False) for m in other_masks]:
+            if _collides(m1, m2) != _collides(_new_mask(m1, s1), _new_mask(m2, s2)):
+                raise ValueError(
+                    "Collision filtering changed collisions between masks {} and {}".format(
+                        m1, m2
+                    )
+                )
+    for m1 in static_masks:
+        for m2 in static_masks:
+            if _collides(_new_mask(m1, True), _new_mask(m2, True)):
+                raise ValueError(
+                    "Collision filtering kept collisions between static masks {} and {}".format(
+                        m1, m2
+                    )
+                )
+
+    for geom, mask, static in masks:
+        if static and mask == (0, 0):
+            continue
+        new_mask = _new_mask(mask, static)
+        if new_mask != mask:
+            geom.set("contype", str(new_mask[0]))
+            geom.set("conaffinity", str(new_mask[1]))
+
+    return ET.tostring(root).decode("utf8"), stats
@@ -0,0 +1,159 @@
+from collections import defaultdict
+
+import numpy as np
+from robosuite.models.base import MujocoModel
+
+
+class ContactIndex:
+    """
+    Index over the active contacts of a simulation. Contacts are read from sim.data.contact once
+    per update of the contact buffer and stored as a geom-level adjacency map, so that all contact
+    queries made between two updates share a single scan of the contact buffer.
+
+    The methods of @sim that recompute contacts (reset, forward, step, step1, step2) are wrapped to
+    count a generation of the contact buffer, and the index is rebuilt whenever the generation
+    changes. Callers that write to sim.data.contact directly should call invalidate()
+
+    Args:
+        sim (MjSim): simulation to index
+    """
+
+    def __init__(self, sim):
+        self.sim = sim
+        self._generation = 0
+        self._indexed_generation = None
+        self._geom_adj = dict()
+        # maps tuples of geom names to the set of corresponding geom ids
+        self._geom_ids_cache = dict()
+        self.stats = dict(scans=0, queries=0)
+        self._wrap_sim_updates()
+
+    def _wrap_sim_updates(self):
+        """
+        Wraps the methods of the simulation that recompute contacts, so that each call starts a new
+        generation of the contact buffer
+        """
+        for name in ["reset", "forward", "step", "step1", "step2"]:
+            method = getattr(self.sim, name)
+
+            def wrapped(*args, _method=method, **kwargs):
+                self._generation += 1
+                return _method(*args, **kwargs)
+
+            setattr(self.sim, name, wrapped)
+
+    def invalidate(self):
+        """
+        Forces the index to be rebuilt on the next query
+        """
+        self._generation += 1
+
+    def _update(self):
+        """
+        Rebuilds the index if the contact buffer was recomputed since it was last built
+        """
+        self.stats["queries"] += 1
+        if self._indexed_generation == self._generation:
+            return
+        self._indexed_generation = self._generation
+        self.stats["scans"] += 1
+
+        data = self.sim.data
+        ncon = data.ncon
+        geom_adj = defaultdict(set)
+        if ncon > 0:
+            geom1 = np.array(data.contact.geom1[:ncon]).tolist()
+            geom2 = np.array(data.contact.geom2[:ncon]).tolist()
+            for g1, g2 in zip(geom1, geom2):
+                geom_adj[g1].add(g2)
+                geom_adj[g2].add(g1)
+        self._geom_adj = geom_adj
+
+    def geom_ids(self, geoms):
+        """
+        Converts geoms to the set of their ids. Names that do not exist in the model are ignored
+
+        Args:
+            geoms (str or list of str or MujocoModel): an individual geom name or list of geom names or a model.
+                If a MujocoModel is specified, its contact_geoms are used
+
+        Returns:
+            frozenset: geom ids
+        """
+        if type(geoms) is str:
+            names = (geoms,)
+        elif isinstance(geoms, MujocoModel):
+            names = tuple(geoms.contact_geoms)
+        else:
+            names = tuple(geoms)
+
+        ids = self._geom_ids_cache.get(names, None)
+        if ids is None:
+            ids = set()
+            for name in names:
+                try:
+                    ids.add(self.sim.model.geom_name2id(name))
+                except ValueError:
+                    continue
+            ids = frozenset(ids)
+            self._geom_ids_cache[names] = ids
+        return ids
+
+    def check_contact(self, geoms_1, geoms_2=None):
+        """
+        Finds contact between two geom groups. Same semantics as robosuite's check_contact
+
+        Args:
+            geoms_1 (str or list of str or MujocoModel): an individual geom name or list of geom names or a model
+
+            geoms_2 (str or list of str or MujocoModel or None): another individual geom name or list of geom names
+                or a model. If None, will check any collision with @geoms_1 to any other geom in the environment
+
+        Returns:
+            bool: True if any geom in @geoms_1 is in contact with any geom in @geoms_2
+        """
+        self._update()
+        ids_1 = self.geom_ids(geoms_1)
+        ids_2 = None if geoms_2 is None else self.geom_ids(geoms_2)
+        for g in ids_1:
+            others = self._geom_adj.get(g, None)
+            if not others:
+                continue
+            if ids_2 is None or not others.isdisjoint(ids_2):
+                return True
+        return False
+
+    def get_contacts(self, model):
+        """
+        Returns the set of geom names currently in contact with @model, excluding the geoms of the model itself.
+        Same semantics as robosuite's get_contacts
+
+        Args:
+            model (MujocoModel): model to check contacts for
+
+        Returns:
+            set: unique geoms that are actively in contact with this model
+        """
+        assert isinstance(
+            model, MujocoModel
+        ), "Inputted model must be of type MujocoModel; got type {} instead!".format(
+            type(model)
+        )
+        self._update()
+        model_ids = self.geom_ids(model)
+        contact_ids = set()
+        for g in model_ids:
+            contact_ids.update(self._geom_adj.get(g, ()))
+        return set(
+            self.sim.model.geom_id2name(g) for g in contact_ids - model_ids
+        )
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: number of contact queries, number of contact buffer scans performed, and the number
+                of scans avoided by sharing the index across queries
+        """
+        stats = dict(self.stats)
+        stats["scans_avoided"] = stats["queries"] - stats["scans"]
+        return stats
@@ -0,0 +1,308 @@
+"""
+Columnar episode index stored next to a robomimic-style hdf5 dataset.
+
+Listing the episodes of a dataset with their length, layout, style, objects or language normally requires
+opening every data/demo_N group and parsing its ep_meta attribute. The index stores these fields once as
+numpy columns in a small .npz sidecar (<dataset>.index.npz), so that loaders can select episodes and map
+global sample indices to (episode, step) without touching the dataset.
+
+Object categories are stored as a flat array along with per-episode offsets into it. The index records the
+size and modification time of the dataset it was built from and is rejected if the dataset changed.
+"""
+
+import json
+import os
+
+import h5py
+import numpy as np
+
+INDEX_VERSION = 1
+
+# columns holding one value per episode
+EPISODE_COLUMNS = [
+    "name",
+    "length",
+    "offset",
+    "layout_id",
+    "style_id",
+    "success",
+    "lang",
+]
+
+
+def get_index_path(dataset_path):
+    """
+    Returns:
+        str: path of the index sidecar of a dataset
+    """
+    return dataset_path + ".index.npz"
+
+
+def _get_source_signature(dataset_path):
+    stat = os.stat(dataset_path)
+    return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+
+def _get_obj_cats(ep_meta):
+    cats = []
+    for cfg in ep_meta.get("object_cfgs", []):
+        cat = cfg.get("info", {}).get("cat", None)
+        if cat is not None:
+            cats.append(cat)
+    return cats
+
+
+def build_episode_index(dataset_path, index_path=None):
+    """
+    Scans a dataset once and writes its episode index
+
+    Args:
+        dataset_path (str): path to the hdf5 dataset
+
+        index_path (str): path to write the index to. Defaults to get_index_path(dataset_path)
+
+    Returns:
+        EpisodeIndex: the index
+    """
+    if index_path is None:
+        index_path = get_index_path(dataset_path)
+
+    rows = []
+    with h5py.File(dataset_path, "r") as f:
+        demos = sorted(f["data"].keys(), key=lambda x: int(x[5:]))
+        for ep in demos:
+            ep_grp = f["data/{}".format(ep)]
+            if "num_samples" in ep_grp.attrs:
+                length = int(ep_grp.attrs["num_samples"])
+            else:
+                length = ep_grp["actions"].shape[0]
+            ep_meta = ep_grp.attrs.get("ep_meta", None)
+            ep_meta = json.loads(ep_meta) if ep_meta is not None else {}
+            success = ep_grp.attrs.get("success", None)
+            rows.append(
+                dict(
+                    name=ep,
+                    length=length,
+                    layout_id=ep_meta.get("layout_id", -1),
+                    style_id=ep_meta.get("style_id", -1),
+                    success=-1 if success is None else int(bool(success)),
+                    lang=ep_meta.get("lang", ""),
+                    obj_cats=_get_obj_cats(ep_meta),
+                )
+            )
+
+    lengths = np.array([r["length"] for r in rows], dtype=np.int64)
+    obj_cats = [cat for r in rows for cat in r["obj_cats"]]
+    obj_cat_offsets = np.cumsum([0] + [len(r["obj_cats"]) for r in rows])
+    columns = dict(
+        version=np.array(INDEX_VERSION),
+        source=_get_source_signature(dataset_path),
+        name=np.array([r["name"] for r in rows], dtype=str),
+        length=lengths,
+        offset=np.cumsum(lengths) - lengths,
+        layout_id=np.array([r["layout_id"] for r in rows], dtype=np.int64),
+        style_id=np.array([r["style_id"] for r in rows], dtype=np.int64),
+        success=np.array([r["success"] for r in rows], dtype=np.int8),
+        lang=np.array([r["lang"] for r in rows], dtype=str),
+        obj_cats=np.array(obj_cats, dtype=str),
+        obj_cat_offsets=obj_cat_offsets.astype(np.int64),
+    )
+    # write through a file object, np.savez would otherwise append .npz to the path
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **columns)
+    os.replace(tmp_path, index_path)
+    return EpisodeIndex(columns)
+
+
+def load_episode_index(dataset_path, index_path=None, build_if_missing=True):
+    """
+    Loads the episode index of a dataset, (re)building it if it is missing or out of date
+
+    Args:
+        dataset_path (str): path to the hdf5 dataset
+
+        index_path (str): path of the index. Defaults to get_index_path(dataset_path)
+
+        build_if_missing (bool): if False, raise an error instead of building a missing or stale index
+
+    Returns:
+        EpisodeIndex: the index
+    """
+    if index_path is None:
+        index_path = get_index_path(dataset_path)
+    if os.path.exists(index_path):
+        with np.load(index_path) as data:
+            columns = {k: data[k] for k in data.files}
+        if int(columns["version"]) == INDEX_VERSION and np.array_equal(
+            columns["source"], _get_source_signature(dataset_path)
+        ):
+            return EpisodeIndex(columns)
+        if not build_if_missing:
+            raise ValueError(
+                "Episode index {} is out of date with {}".format(
+                    index_path, dataset_path
+                )
+            )
+    elif not build_if_missing:
+        raise ValueError("No episode index found at {}".format(index_path))
+    return build_episode_index(dataset_path, index_path=index_path)
+
+
+class EpisodeIndex:
+    """
+    Read-only view over the columns of an episode index
+
+    Args:
+        columns (dict): maps each column name to its numpy array
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        self._name_to_index = {name: i for i, name in enumerate(columns["name"])}
+        self._postings = dict()
+
+    def __len__(self):
+        return len(self.columns["name"])
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    @property
+    def total_length(self):
+        return int(np.sum(self.columns["length"]))
+
+    def get_index(self, name):
+        """
+        Returns:
+            int: position of episode @name (e.g. "demo_12") in the index
+        """
+        return self._name_to_index[name]
+
+    def get_obj_cats(self, i):
+        """
+        Returns:
+            list: object categories of episode @i
+        """
+        start, end = self.columns["obj_cat_offsets"][i : i + 2]
+        return self.columns["obj_cats"][start:end].tolist()
+
+    def get_episode(self, i):
+        """
+        Returns:
+            dict: all indexed fields of episode @i
+        """
+        ep = {k: self.columns[k][i].item() for k in EPISODE_COLUMNS}
+        ep["obj_cats"] = self.get_obj_cats(i)
+        return ep
+
+    def locate(self, sample):
+        """
+        Maps a global sample index (over all episodes, in index order) to an episode and a step
+
+        Returns:
+            tuple: episode position in the index, step within the episode
+        """
+        i = int(np.searchsorted(self.columns["offset"], sample, side="right")) - 1
+        return i, int(sample - self.columns["offset"][i])
+
+    def _get_postings(self, column):
+        """
+        Returns:
+            dict: maps each value of @column to the sorted positions of the episodes having it. Built on first use
+        """
+        if column not in self._postings:
+            if column == "obj_cats":
+                values = self.columns["obj_cats"]
+                owners = (
+                    np.searchsorted(
+                        self.columns["obj_cat_offsets"],
+                        np.arange(len(values)),
+                        side="right",
+                    )
+                    - 1
+                )
+            else:
+                values = self.columns[column]
+                owners = np.arange(len(values))
+            postings = dict()
+            for v in np.unique(values):
+                postings[v.item()] = np.unique(owners[values == v])
+            self._postings[column] = postings
+        return self._postings[column]
+
+    def select(
+        self,
+        layout_ids=None,
+        style_ids=None,
+        obj_cats=None,
+        lang=None,
+        success=None,
+        min_length=None,
+        max_length=None,
+    ):
+        """
+        Selects the episodes matching all the given filters. Filters left as None are not applied
+
+        Args:
+            layout_ids (int or list): allowed layout ids. An empty list selects no episode
+
+            style_ids (int or list): allowed style ids. An empty list selects no episode
+
+            obj_cats (str or list): object categories that must all be present in the episode
+
+            lang (str or list): allowed language instructions. An empty list selects no episode
+
+            success (bool): required success label. Episodes without a label never match
+
+            min_length (int): minimum episode length
+
+            max_length (int): maximum episode length
+
+        Returns:
+            np.array: sorted positions of the matching episodes in the index
+        """
+        selected = np.arange(len(self))
+
+        def intersect(column, values, match_all=False):
+            nonlocal selected
+            if not isinstance(values, (list, tuple, set)):
+                values = [values]
+            postings = self._get_postings(column)
+            empty = np.zeros(0, dtype=np.int64)
+            if match_all:
+                for v in values:
+                    selected = np.intersect1d(selected, postings.get(v, empty))
+            elif len(values) == 0:
+                # no allowed value, nothing can match
+                selected = empty
+            else:
+                allowed = [postings.get(v, empty) for v in values]
+                selected = np.intersect1d(selected, np.concatenate(allowed))
+
+        if layout_ids is not None:
+            intersect("layout_id", layout_ids)
+        if style_ids is not None:
+            intersect("style_id", style_ids)
+        if lang is not None:
+            intersect("lang", lang)
+        if obj_cats is not None:
+            intersect("obj_cats", obj_cats, match_all=True)
+        if success is not None:
+            intersect("success", int(success))
+
+        lengths = self.columns["length"][selected]
+        if min_length is not None:
+            selected = selected[lengths >= min_length]
+            lengths = self.columns["length"][selected]
+        if max_length is not None:
+            selected = selected[lengths <= max_length]
+        return selected
+
+    def get_names(self, inds=None):
+        """
+        Returns:
+            list: episode names (e.g. "demo_12") at positions @inds, or of all episodes if None
+        """
+        names = self.columns["name"] if inds is None else self.columns["name"][inds]
+        return names.tolist()
@@ -0,0 +1,401 @@
+"""
+Building blocks of the sharded, resumable evaluation harness (see robocasa/scripts/run_eval.py).
+
+Evaluation runs one episode per (task, seed) pair. Before each episode the environment rng, the global numpy
+rng and the action space are reseeded with the seed, so that the result of a pair does not depend on the
+pairs previously run by the same worker. Pairs are run in a pool of worker processes, and each
+result is written to a result store (SQLite or JSON lines) as soon as it finishes, so that an interrupted
+evaluation resumes without redoing completed pairs.
+
+Policies are created by a factory called with the task name and the action space of the environment, and
+must provide reset() and get_action(obs). Besides python callables ("module.path:factory"), a policy can be
+served from another process through a local socket ("socket://host:port", see serve_policy).
+"""
+
+import importlib
+import json
+import os
+import sqlite3
+import time
+import traceback
+from multiprocessing.connection import Client, Listener
+from threading import Thread
+
+import numpy as np
+
+# names of the task lists of tabletop_24dc.py making up each 24-DC suite
+TASK_SUITES_24DC = {
+    "24dc_pretrain": "pretrain_task_infos",
+    "24dc_posttrain": "posttrain_task_infos",
+    "24dc_eval": "eval_task_infos",
+}
+TASK_SUITES = list(TASK_SUITES_24DC.keys()) + ["pnp"]
+
+RESULT_FIELDS = [
+    "task",
+    "seed",
+    "success",
+    "length",
+    "reward",
+    "duration",
+    "worker",
+    "finished_at",
+    "error",
+]
+
+DEFAULT_AUTHKEY = b"robocasa"
+
+
+def get_task_suite(name):
+    """
+    Returns:
+        list: environment names of the tasks in suite @name
+    """
+    from robosuite.environments.base import REGISTERED_ENVS
+
+    if name in TASK_SUITES_24DC:
+        from robocasa.environments.tabletop import tabletop_24dc
+
+        task_infos = getattr(tabletop_24dc, TASK_SUITES_24DC[name])
+        return [info["class_name"] for info in task_infos]
+    if name == "pnp":
+        # registers the environments of the module
+        from robocasa.environments.tabletop import tabletop_pnp  # noqa: F401
+
+        return sorted(
+            env_name
+            for env_name, env_cls in REGISTERED_ENVS.items()
+            if env_cls.__module__ == "robocasa.environments.tabletop.tabletop_pnp"
+        )
+    raise ValueError(
+        "Invalid task suite: {}. Must be one of {}".format(name, TASK_SUITES)
+    )
+
+
+class SQLiteResultStore:
+    """
+    Stores evaluation results in a SQLite table keyed by (task, seed)
+
+    Args:
+        path (str): path to the database file
+    """
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "task TEXT, seed INTEGER, success INTEGER, length INTEGER, reward REAL, duration REAL, "
+            "worker INTEGER, finished_at REAL, error TEXT, PRIMARY KEY (task, seed))"
+        )
+        self.conn.commit()
+
+    def add(self, result):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results VALUES ({})".format(
+                ", ".join(["?"] * len(RESULT_FIELDS))
+            ),
+            [result[k] for k in RESULT_FIELDS],
+        )
+        self.conn.commit()
+
+    def get_results(self):
+        cursor = self.conn.execute(
+            "SELECT {} FROM results".format(", ".join(RESULT_FIELDS))
+        )
+        return [dict(zip(RESULT_FIELDS, row)) for row in cursor]
+
+    def close(self):
+        self.conn.close()
+
+
+class JSONLResultStore:
+    """
+    Stores evaluation results as JSON lines, one per finished (task, seed) pair. Later lines take precedence
+    over earlier lines of the same pair, and a truncated last line (e.g. after a crash) is ignored
+
+    Args:
+        path (str): path to the file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.f = open(path, "a")
+
+    def add(self, result):
+        self.f.write(json.dumps({k: result[k] for k in RESULT_FIELDS}) + "\n")
+        self.f.flush()
+        os.fsync(self.f.fileno())
+
+    def get_results(self):
+        results = dict()
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                results[(result["task"], result["seed"])] = result
+        return list(results.values())
+
+    def close(self):
+        self.f.close()
+
+
+def make_result_store(path):
+    """
+    Returns:
+        SQLiteResultStore or JSONLResultStore: result store at @path, chosen by its extension
+    """
+    ext = os.path.splitext(path)[1]
+    if ext in [".db", ".sqlite"]:
+        return SQLiteResultStore(path)
+    if ext == ".jsonl":
+        return JSONLResultStore(path)
+    raise ValueError("Invalid result store extension: {}".format(ext))
+
+
+def get_completed_pairs(store):
+    """
+    Returns:
+        set: (task, seed) pairs with a result in @store. Pairs that failed with an error are not included, so
+            they are retried
+    """
+    return set(
+        (r["task"], r["seed"]) for r in store.get_results() if r["error"] is None
+    )
+
+
+class RandomPolicy:
+    """
+    Policy sampling random actions, e.g. to test the harness
+    """
+
+    def __init__(self, task, action_space):
+        self.action_space = action_space
+
+    def reset(self):
+        pass
+
+    def get_action(self, obs):
+        return self.action_space.sample()
+
+
+class SocketPolicy:
+    """
+    Client of a policy served by serve_policy in another process
+
+    Args:
+        task (str): task name
+
+        action_space (gym.Space): action space of the environment
+
+        address (tuple): (host, port) of the policy server
+
+        authkey (bytes): authentication key of the policy server
+    """
+
+    def __init__(self, task, action_space, address, authkey=DEFAULT_AUTHKEY):
+        self.conn = Client(address, authkey=authkey)
+        self.conn.send(("init", dict(task=task, action_space=action_space)))
+        self.conn.recv()
+
+    def reset(self):
+        self.conn.send(("reset", None))
+        self.conn.recv()
+
+    def get_action(self, obs):
+        self.conn.send(("act", obs))
+        return self.conn.recv()
+
+
+def load_policy_factory(spec):
+    """
+    Resolves a policy specification into a policy factory
+
+    Args:
+        spec (str): "random", "socket://host:port" or "module.path:factory"
+
+    Returns:
+        function: factory creating a policy from the task name and the action space
+    """
+    if spec == "random":
+        return RandomPolicy
+    if spec.startswith("socket://"):
+        host, port = spec[len("socket://") :].rsplit(":", 1)
+        return lambda task, action_space: SocketPolicy(
+            task, action_space, (host, int(port))
+        )
+    if ":" not in spec:
+        raise ValueError("Invalid policy specification: {}".format(spec))
+    module_name, attr = spec.split(":", 1)
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def serve_policy(policy_factory, address, authkey=DEFAULT_AUTHKEY):
+    """
+    Serves policies over a local socket, one policy per connection, until interrupted. Stands in for a
+    remote policy server during development
+
+    Args:
+        policy_factory (function): factory creating a policy from the task name and the action space
+
+        address (tuple): (host, port) to listen on
+
+        authkey (bytes): authentication key clients must present
+    """
+
+    def handle(conn):
+        policy = None
+        with conn:
+            while True:
+                try:
+                    cmd, arg = conn.recv()
+                except EOFError:
+                    break
+                if cmd == "init":
+                    policy = policy_factory(arg["task"], arg["action_space"])
+                    conn.send(None)
+                elif cmd == "reset":
+                    policy.reset()
+                    conn.send(None)
+                elif cmd == "act":
+                    conn.send(policy.get_action(arg))
+
+    with Listener(address, authkey=authkey) as listener:
+        print("serving policy on {}:{}".format(*address))
+        while True:
+            Thread(target=handle, args=(listener.accept(),), daemon=True).start()
+
+
+# state of each evaluation worker process, set up by init_worker
+_worker = dict()
+
+
+def init_worker(policy_spec, env_id_format, env_kwargs):
+    """
+    Initializes an evaluation worker process
+    """
+    _worker["policy_factory"] = load_policy_factory(policy_spec)
+    _worker["env_id_format"] = env_id_format
+    _worker["env_kwargs"] = env_kwargs
+    _worker["task"] = None
+
+
+def _get_env_and_policy(task):
+    """
+    Returns the environment and policy of @task, reusing those of the previous pair if it had the same task
+    """
+    import gymnasium as gym
+
+    # registers the gym environments
+    import robocasa.utils.gym_utils  # noqa: F401
+
+    if _worker["task"] != task:
+        if _worker["task"] is not None:
+            _worker["env"].close()
+        _worker["task"] = None
+        env = gym.make(_worker["env_id_format"].format(task=task), **_worker["env_kwargs"])
+        _worker["policy"] = _worker["policy_factory"](task, env.action_space)
+        _worker["env"] = env
+        _worker["task"] = task
+    return _worker["env"], _worker["policy"]
+
+
+def seed_env(env, seed):
+    """
+    Reseeds the rng of the robosuite environment underneath the gym environment @env in place. Scene
+    sampling, fixtures and placement samplers hold references to this generator, so they are reseeded too
+    """
+    rng = env.unwrapped.env.rng
+    rng.bit_generator.state = np.random.default_rng(seed).bit_generator.state
+
+
+def reset_pair(env, policy, seed):
+    """
+    Resets the environment and the policy for a (task, seed) pair
+
+    Returns:
+        2-tuple: observation and info returned by the environment reset
+    """
+    seed_env(env, seed)
+    obs, info = env.reset(seed=seed)
+    # e.g. the random policy samples from the environment's action space
+    env.action_space.seed(seed)
+    policy.reset()
+    return obs, info
+
+
+def _close_worker_env():
+    """
+    Closes the environment of the worker, which may be left in an inconsistent state after an error, so that
+    it is rebuilt for the next pair
+    """
+    if _worker["task"] is not None:
+        _worker["task"] = None
+        try:
+            _worker["env"].close()
+        except Exception:
+            pass
+
+
+def check_determinism(task, seed):
+    """
+    Resets the environment of the worker twice for the same (task, seed) pair and compares the initial
+    simulation states and models
+
+    Returns:
+        dict: task, seed, whether both initial states match, and the traceback of any error
+    """
+    result = dict(task=task, seed=seed, match=False, error=None)
+    try:
+        env, policy = _get_env_and_policy(task)
+        initial_states = []
+        for _ in range(2):
+            reset_pair(env, policy, seed)
+            sim = env.unwrapped.env.sim
+            initial_states.append((sim.get_state().flatten(), sim.model.get_xml()))
+        (state_1, xml_1), (state_2, xml_2) = initial_states
+        result["match"] = xml_1 == xml_2 and np.array_equal(state_1, state_2)
+    except Exception:
+        result["error"] = traceback.format_exc()
+        _close_worker_env()
+    return result
+
+
+def run_episode(task, seed, max_steps):
+    """
+    Evaluates the worker's policy on one (task, seed) pair. The episode ends on success, termination,
+    truncation or after @max_steps steps
+
+    Returns:
+        dict: result of the episode, with the fields of RESULT_FIELDS
+    """
+    result = dict(
+        task=task,
+        seed=seed,
+        success=False,
+        length=0,
+        reward=0.0,
+        worker=os.getpid(),
+        error=None,
+    )
+    t = time.perf_counter()
+    try:
+        env, policy = _get_env_and_policy(task)
+        obs, info = reset_pair(env, policy, seed)
+        for _ in range(max_steps):
+            obs, reward, terminated, truncated, info = env.step(policy.get_action(obs))
+            result["length"] += 1
+            result["reward"] += float(reward)
+            if info["success"]:
+                result["success"] = True
+                break
+            if terminated or truncated:
+                break
+    except Exception:
+        result["error"] = traceback.format_exc()
+        _close_worker_env()
+    result["success"] = bool(result["success"])
+    result["duration"] = time.perf_counter() - t
+    result["finished_at"] = time.time()
+    return result
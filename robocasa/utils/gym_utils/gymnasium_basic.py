@@ -3,8 +3,8 @@ from copy import deepcopy
 import gymnasium as gym
 import numpy as np
 import os
+import time
 import robocasa  # we need this to register environments  # noqa: F401
-import robosuite
 from gymnasium import spaces
 from robocasa.environments.tabletop.tabletop import Tabletop
 from robocasa.models.robots import (
@@ -17,7 +17,8 @@ from robocasa.models.robots import (
 from robosuite.controllers import load_composite_controller_config
 from robosuite.controllers.parts.arm.osc import OperationalSpaceController
 from robosuite.controllers.composite.composite_controller import HybridMobileBase
-from robosuite.environments.base import REGISTERED_ENVS
+
+from robocasa.utils.gym_utils.rollout_exporter import RolloutExporter
 
 
 ALLOWED_LANGUAGE_CHARSET = (
@@ -46,6 +47,8 @@ def create_env_robosuite(
     layout_and_style_ids=None,
     layout_ids=None,
     style_ids=None,
+    profile_steps=False,
+    scene_bank=None,
 ):
     if controller_configs is None:
         controller_configs = load_composite_controller_config(
@@ -67,10 +70,11 @@ def create_env_robosuite(
         camera_depths=False,
         seed=seed,
         translucent_robot=False,
+        profile_steps=profile_steps,
+        scene_bank=scene_bank,
     )
-    env_class = REGISTERED_ENVS[env_name]
-
-    env = robosuite.make(**env_kwargs)
+    # imports the robocasa module defining the environment if it is not registered yet
+    env = robocasa.make(**env_kwargs)
     return env, env_kwargs
 
 
@@ -84,6 +88,8 @@ class RoboCasaEnv(gym.Env):
         camera_heights=None,
         enable_render=True,
         dump_rollout_dataset_dir=None,
+        dump_rollout_format="hdf5",
+        dump_rollout_max_pending_episodes=4,
         **kwargs,  # Accept additional kwargs
     ):
         self.key_converter = make_key_converter(robots_name)
@@ -179,9 +185,22 @@ class RoboCasaEnv(gym.Env):
 
         self.observation_space = observation_space
 
+        # rollouts are buffered per episode and written from a background thread
         self.dump_rollout_dataset_dir = dump_rollout_dataset_dir
-        self.groot_exporter = None
-        self.np_exporter = None
+        self.rollout_exporter = None
+        if dump_rollout_dataset_dir is not None:
+            self.rollout_exporter = RolloutExporter(
+                out_dir=dump_rollout_dataset_dir,
+                env_name=env_name,
+                env_kwargs={
+                    k: v for k, v in self.env_kwargs.items() if k != "env_name"
+                },
+                file_format=dump_rollout_format,
+                max_pending_episodes=dump_rollout_max_pending_episodes,
+                fps=self.env.control_freq,
+            )
+        self._last_obs = None
+        self._last_state = None
 
     def get_basic_observation(self, raw_obs):
         raw_obs.update(gather_robot_observations(self.env))
@@ -212,10 +231,24 @@ class RoboCasaEnv(gym.Env):
 
     def reset(self, seed=None, options=None):
         np.random.seed(seed)
-        raw_obs = self.env.reset()
+        if self.rollout_exporter is not None:
+            self.rollout_exporter.end_episode()
+        if options is not None and "scene_index" in options:
+            # load a pre-generated scene of the environment's scene bank
+            raw_obs = self.env.reset_to_scene(options["scene_index"])
+        else:
+            raw_obs = self.env.reset()
         # return obs
         obs = self.get_basic_observation(raw_obs)
 
+        if self.rollout_exporter is not None:
+            self.rollout_exporter.start_episode(
+                ep_meta=self.env.get_ep_meta(),
+                model_file=self.env.get_model_xml(),
+            )
+            self._last_obs = obs
+            self._last_state = self.env.sim.get_state().flatten()
+
         info = {}
         info["success"] = False
         info["grasp_distractor_obj"] = False
@@ -223,6 +256,9 @@ class RoboCasaEnv(gym.Env):
         return obs, info
 
     def step(self, action_dict):
+        profiler = getattr(self.env, "step_profiler", None)
+        t = time.perf_counter()
+
         env_action = []
         for robot in self.env.robots:
             cc = robot.composite_controller
@@ -239,8 +275,12 @@ class RoboCasaEnv(gym.Env):
         assert len(action_dict) == 0, f"Unprocessed actions: {action_dict}"
         env_action = np.concatenate(env_action)
 
+        if profiler is not None:
+            profiler.record("wrapper/action", time.perf_counter() - t)
+
         raw_obs, reward, done, info = self.env.step(env_action)
 
+        t = time.perf_counter()
         obs = self.get_basic_observation(raw_obs)
 
         truncated = False
@@ -250,6 +290,21 @@ class RoboCasaEnv(gym.Env):
         if hasattr(self, "_check_grasp_distractor_obj"):
             info["grasp_distractor_obj"] = self._check_grasp_distractor_obj()
 
+        if self.rollout_exporter is not None:
+            self.rollout_exporter.add_step(
+                obs=self._last_obs,
+                action=env_action,
+                state=self._last_state,
+                reward=reward,
+                done=done,
+                success=info["success"],
+            )
+            self._last_obs = obs
+            self._last_state = self.env.sim.get_state().flatten()
+
+        if profiler is not None:
+            profiler.record("wrapper/observation", time.perf_counter() - t)
+
         return obs, reward, done, truncated, info
 
     def render(self):
@@ -258,4 +313,6 @@ class RoboCasaEnv(gym.Env):
         return self.render_cache
 
     def close(self):
+        if self.rollout_exporter is not None:
+            self.rollout_exporter.close()
         self.env.close()
@@ -6,6 +6,7 @@ import numpy as np
 from gymnasium import spaces
 from gymnasium.envs.registration import register
 
+import robocasa
 from robocasa.models.robots import GROOT_ROBOCASA_ENVS_ROBOTS
 from .gymnasium_basic import (
     REGISTERED_ENVS,
@@ -179,6 +180,7 @@ def create_gearbcrobocasa_env_class(env, robot, robot_alias):
     )
 
 
+robocasa.import_all_envs()
 for ENV in REGISTERED_ENVS:
     for ROBOT, ROBOT_ALIAS in GROOT_ROBOCASA_ENVS_ROBOTS.items():
         create_gearbcrobocasa_env_class(ENV, ROBOT, ROBOT_ALIAS)
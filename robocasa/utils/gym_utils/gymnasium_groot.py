@@ -6,6 +6,7 @@ import numpy as np
 from gymnasium import spaces
 from gymnasium.envs.registration import register
 
+import robocasa
 from robocasa.models.robots import GROOT_ROBOCASA_ENVS_ROBOTS
 from robocasa.models.robots.manipulators.gr1_robot import GR1ArmsOnly, GR1ArmsAndWaist
 from .gymnasium_basic import (
@@ -184,6 +185,7 @@ def create_grootrobocasa_env_class(env, robot, robot_alias):
         )
 
 
+robocasa.import_all_envs()
 for ENV in REGISTERED_ENVS:
     for ROBOT, ROBOT_ALIAS in GROOT_ROBOCASA_ENVS_ROBOTS.items():
         create_grootrobocasa_env_class(ENV, ROBOT, ROBOT_ALIAS)
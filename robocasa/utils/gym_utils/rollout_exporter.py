@@ -0,0 +1,269 @@
+"""
+Asynchronous export of environment rollouts to disk.
+
+Steps are buffered in memory for the current episode only. Finished episodes are handed to a background
+writer thread through a bounded queue, so env.step() never waits on disk I/O or compression. Memory is
+bounded by the current episode plus @max_pending_episodes finished episodes; if the writer falls further
+behind, finishing an episode (i.e. env.reset()) waits for it to catch up.
+
+Two formats are supported:
+    - "hdf5": a single robomimic-style file (data/demo_N with obs/<key>, actions, states, rewards, dones
+        and the model_file / ep_meta attributes), with time-chunked compressed datasets
+    - "parquet": per episode, a parquet file with the low-dimensional data, an mp4 video per camera and a
+        json file with the episode meta data
+"""
+
+import datetime
+import json
+import os
+import queue
+import threading
+import uuid
+
+import numpy as np
+
+# robomimic environment type of robosuite environments
+ROBOSUITE_ENV_TYPE = 1
+
+_STOP = object()
+
+
+class RolloutExporter:
+    """
+    Buffers rollouts and writes them from a background thread
+
+    Args:
+        out_dir (str): directory to write to
+
+        env_name (str): name of the environment, stored with the dataset
+
+        env_kwargs (dict): environment arguments, stored with the dataset
+
+        file_format (str): "hdf5" or "parquet"
+
+        max_pending_episodes (int): maximum number of finished episodes waiting to be written
+
+        chunk_steps (int): number of time steps per hdf5 chunk
+
+        compression (str): hdf5 compression filter of image observations ("gzip", "lzf" or None). Low-dimensional
+            data is always gzip compressed
+
+        fps (int): frame rate of exported videos
+    """
+
+    def __init__(
+        self,
+        out_dir,
+        env_name,
+        env_kwargs=None,
+        file_format="hdf5",
+        max_pending_episodes=4,
+        chunk_steps=16,
+        compression="lzf",
+        fps=20,
+    ):
+        assert file_format in ["hdf5", "parquet"], "invalid format: {}".format(
+            file_format
+        )
+        self.out_dir = out_dir
+        self.env_name = env_name
+        self.env_kwargs = env_kwargs or {}
+        self.file_format = file_format
+        self.chunk_steps = chunk_steps
+        self.compression = compression
+        self.fps = fps
+        os.makedirs(out_dir, exist_ok=True)
+
+        self.run_name = "{}_{}".format(
+            datetime.datetime.now().strftime("%Y%m%d_%H%M%S"), uuid.uuid4().hex[:8]
+        )
+        self._episode = None
+        self._num_episodes = 0
+        self._h5_file = None
+        self._error = None
+        self._queue = queue.Queue(maxsize=max_pending_episodes)
+        self._thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._thread.start()
+        self._closed = False
+
+    @property
+    def in_episode(self):
+        return self._episode is not None
+
+    def start_episode(self, ep_meta, model_file=None):
+        """
+        Starts buffering a new episode. An episode in progress is finished first
+
+        Args:
+            ep_meta (dict): episode meta data
+
+            model_file (str): model xml of the episode
+        """
+        if self.in_episode:
+            self.end_episode()
+        self._episode = dict(
+            ep_meta=ep_meta,
+            model_file=model_file,
+            obs=dict(),
+            actions=[],
+            states=[],
+            rewards=[],
+            dones=[],
+            success=False,
+        )
+
+    def add_step(self, obs, action, state, reward, done, success=False):
+        """
+        Buffers one step. @obs and @state are the observation and simulation state before @action is applied
+
+        Args:
+            obs (dict): observations. Non-array values (e.g. language) are skipped
+
+            action (np.array): action
+
+            state (np.array): flattened simulation state
+
+            reward (float): reward
+
+            done (bool): whether the episode terminated
+
+            success (bool): whether the task succeeded at this step
+        """
+        assert self.in_episode, "start_episode must be called before add_step"
+        ep = self._episode
+        for k, v in obs.items():
+            if isinstance(v, np.ndarray):
+                ep["obs"].setdefault(k, []).append(v)
+        ep["actions"].append(action)
+        ep["states"].append(state)
+        ep["rewards"].append(reward)
+        ep["dones"].append(done)
+        ep["success"] = ep["success"] or bool(success)
+
+    def end_episode(self):
+        """
+        Hands the current episode over to the writer thread. Empty episodes are discarded
+        """
+        self._raise_writer_error()
+        ep, self._episode = self._episode, None
+        if ep is None or len(ep["actions"]) == 0:
+            return
+        ep["index"] = self._num_episodes
+        self._num_episodes += 1
+        self._queue.put(ep)
+
+    def close(self):
+        """
+        Finishes the current episode, waits for all episodes to be written and closes the output files
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self.end_episode()
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._raise_writer_error()
+
+    def _raise_writer_error(self):
+        if self._error is not None:
+            raise RuntimeError("rollout writer failed") from self._error
+
+    def _writer_loop(self):
+        while True:
+            ep = self._queue.get()
+            if ep is _STOP:
+                break
+            if self._error is not None:
+                continue
+            try:
+                if self.file_format == "hdf5":
+                    self._write_hdf5(ep)
+                else:
+                    self._write_parquet(ep)
+            except Exception as e:
+                self._error = e
+        if self._h5_file is not None:
+            self._h5_file.close()
+            self._h5_file = None
+
+    def _get_env_args(self):
+        return json.dumps(
+            dict(
+                env_name=self.env_name,
+                type=ROBOSUITE_ENV_TYPE,
+                env_kwargs=self.env_kwargs,
+            ),
+            default=str,
+        )
+
+    def _create_dataset(self, grp, name, data, compression):
+        data = np.asarray(data)
+        chunks = None
+        if data.ndim > 0 and len(data) > 0:
+            chunks = (min(len(data), self.chunk_steps),) + data.shape[1:]
+        grp.create_dataset(name, data=data, chunks=chunks, compression=compression)
+
+    def _write_hdf5(self, ep):
+        import h5py
+
+        if self._h5_file is None:
+            path = os.path.join(self.out_dir, "{}.hdf5".format(self.run_name))
+            self._h5_file = h5py.File(path, "w")
+            data_grp = self._h5_file.create_group("data")
+            data_grp.attrs["env_args"] = self._get_env_args()
+            data_grp.attrs["total"] = 0
+
+        data_grp = self._h5_file["data"]
+        ep_grp = data_grp.create_group("demo_{}".format(ep["index"]))
+        ep_grp.attrs["ep_meta"] = json.dumps(ep["ep_meta"], default=str)
+        if ep["model_file"] is not None:
+            ep_grp.attrs["model_file"] = ep["model_file"]
+        ep_grp.attrs["num_samples"] = len(ep["actions"])
+        ep_grp.attrs["success"] = ep["success"]
+
+        for k in ["actions", "states", "rewards", "dones"]:
+            self._create_dataset(ep_grp, k, np.stack(ep[k]), "gzip")
+        obs_grp = ep_grp.create_group("obs")
+        for k, v in ep["obs"].items():
+            v = np.stack(v)
+            compression = self.compression if v.dtype == np.uint8 else "gzip"
+            self._create_dataset(obs_grp, k, v, compression)
+
+        data_grp.attrs["total"] += len(ep["actions"])
+        self._h5_file.flush()
+
+    def _write_parquet(self, ep):
+        import imageio
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        prefix = os.path.join(
+            self.out_dir, "{}_episode_{:06d}".format(self.run_name, ep["index"])
+        )
+        columns = {
+            k: [np.asarray(x).tolist() for x in ep[k]]
+            for k in ["actions", "states", "rewards", "dones"]
+        }
+        for k, v in ep["obs"].items():
+            if v[0].dtype == np.uint8 and v[0].ndim == 3:
+                with imageio.get_writer(
+                    "{}_{}.mp4".format(prefix, k), fps=self.fps
+                ) as writer:
+                    for frame in v:
+                        writer.append_data(frame)
+            else:
+                columns["obs.{}".format(k)] = [np.asarray(x).tolist() for x in v]
+        pq.write_table(pa.table(columns), "{}.parquet".format(prefix))
+
+        with open("{}.json".format(prefix), "w") as f:
+            json.dump(
+                dict(
+                    env_args=json.loads(self._get_env_args()),
+                    ep_meta=ep["ep_meta"],
+                    model_file=ep["model_file"],
+                    num_samples=len(ep["actions"]),
+                    success=ep["success"],
+                ),
+                f,
+                default=str,
+            )
@@ -1,3 +1,5 @@
+import xml.etree.ElementTree as ET
+
 import numpy as np
 import mujoco as mj
 import robosuite.utils.transform_utils as T
@@ -303,10 +305,10 @@ def fixture_pairwise_dist(f1, f2):
     """
     Gets the distance between two fixtures by finding the minimum distance between their exterior bounding box points
     """
-    f1_points = f1.get_ext_sites(all_points=True, relative=False)
-    f2_points = f2.get_ext_sites(all_points=True, relative=False)
+    f1_points = np.array(f1.get_ext_sites(all_points=True, relative=False))
+    f2_points = np.array(f2.get_ext_sites(all_points=True, relative=False))
 
-    all_dists = [np.linalg.norm(p1 - p2) for p1 in f1_points for p2 in f2_points]
+    all_dists = np.linalg.norm(f1_points[:, None, :] - f2_points[None, :, :], axis=-1)
     return np.min(all_dists)
 
 
@@ -390,15 +392,24 @@ def normalize_joint_value(raw, joint_min, joint_max):
     return (raw - joint_min) / (joint_max - joint_min)
 
 
+def get_spawn_geom_id(env, spawn):
+    """
+    Get the geom id of a spawn geom, using the environment's precomputed id table if available
+    """
+    spawn_name = spawn.get("name")
+    spawn_id = getattr(env, "spawn_geom_id", {}).get(spawn_name, None)
+    if spawn_id is None:
+        spawn_id = env.sim.model.geom_name2id(spawn_name)
+    return spawn_id
+
+
 def get_highest_spawn_region(env, receptacle):
     """
     Get the highest spawn region of a receptacle.
     """
     return max(
         receptacle.spawns,
-        key=lambda x: env.sim.data.geom_xpos[env.sim.model.geom_name2id(x.get("name"))][
-            2
-        ],
+        key=lambda x: env.sim.data.geom_xpos[get_spawn_geom_id(env, x)][2],
     )
 
 
@@ -416,11 +427,10 @@ def calculate_spawn_region(env, spawn):
       For sphere: (center, radius)
     """
     # Get spawn parameters from the simulation.
-    spawn_name = spawn.get("name")
-    spawn_id = env.sim.model.geom_name2id(spawn_name)
+    spawn_id = get_spawn_geom_id(env, spawn)
 
-    spawn_pos = env.sim.data.get_geom_xpos(spawn_name)
-    spawn_xmat = env.sim.data.get_geom_xmat(spawn_name)
+    spawn_pos = env.sim.data.geom_xpos[spawn_id]
+    spawn_xmat = env.sim.data.geom_xmat[spawn_id].reshape((3, 3))
     spawn_size = env.sim.model.geom_size[spawn_id]
     spawn_type = env.sim.model.geom_type[spawn_id]
     assert spawn_type in [
@@ -639,3 +649,109 @@ def obj_in_sphere_region(obj_points, p0, radius, min_num_points):
             num_points_in_region += 1
 
     return num_points_in_region >= min_num_points
+
+
+# (qpos size, qvel size) of each joint type
+JOINT_DOF_SIZES = {"free": (7, 6), "ball": (4, 3), "slide": (1, 1), "hinge": (1, 1)}
+
+
+def _get_joint_type(joint, class_name, joint_defaults):
+    if joint.tag == "freejoint":
+        return "free"
+    if joint.get("type") is not None:
+        return joint.get("type")
+    while class_name is not None:
+        parent, attribs = joint_defaults.get(class_name, (None, {}))
+        if "type" in attribs:
+            return attribs["type"]
+        class_name = parent
+    return "hinge"
+
+
+def get_recorded_body_poses(model_xml, state, body_names):
+    """
+    Returns the world poses of bodies directly under the worldbody of a recorded model in a recorded
+    simulation state, without compiling the model. Bodies with a free joint take their pose from the qpos of
+    the joint in @state, static bodies from their pos and quat in @model_xml. qpos addresses follow the
+    order of the joints in the xml, as assigned by MuJoCo
+
+    Args:
+        model_xml (str): recorded model xml
+
+        state (np.array): recorded flattened simulation state (time, qpos, qvel)
+
+        body_names (list of str): names of the bodies
+
+    Returns:
+        dict: maps each body name to (pos, quat), with quat in (w, x, y, z) order
+
+    Raises:
+        ValueError: [State size does not match the joints of the model, or body not found]
+    """
+    root = ET.fromstring(model_xml)
+
+    joint_defaults = dict()
+
+    def _add_defaults(default, parent):
+        name = default.get("class", "main")
+        joint = default.find("joint")
+        joint_defaults[name] = (parent, {} if joint is None else dict(joint.attrib))
+        for child in default.findall("default"):
+            _add_defaults(child, name)
+
+    for default in root.findall("default"):
+        _add_defaults(default, None)
+
+    # qpos address and type of every joint, in xml order
+    joints = dict()
+    nq, nv = 0, 0
+
+    def _add_joints(body, childclass):
+        nonlocal nq, nv
+        childclass = body.get("childclass", childclass)
+        for joint in body:
+            if joint.tag not in ("joint", "freejoint"):
+                continue
+            jnt_type = _get_joint_type(
+                joint, joint.get("class", childclass), joint_defaults
+            )
+            joints[id(joint)] = (nq, jnt_type)
+            nq += JOINT_DOF_SIZES[jnt_type][0]
+            nv += JOINT_DOF_SIZES[jnt_type][1]
+        for child in body.findall("body"):
+            _add_joints(child, childclass)
+
+    worldbody = root.find("worldbody")
+    for body in worldbody.findall("body"):
+        _add_joints(body, "main")
+    if len(state) != 1 + nq + nv:
+        raise ValueError(
+            "Recorded state of size {} does not match the model (nq={}, nv={})".format(
+                len(state), nq, nv
+            )
+        )
+    qpos = np.asarray(state)[1 : 1 + nq]
+
+    bodies = {body.get("name"): body for body in worldbody.findall("body")}
+    poses = dict()
+    for name in body_names:
+        if name not in bodies:
+            raise ValueError("Body {} not found in the recorded model".format(name))
+        body = bodies[name]
+        free_joints = [
+            joints[id(j)][0]
+            for j in body
+            if j.tag in ("joint", "freejoint") and joints[id(j)][1] == "free"
+        ]
+        if len(free_joints) > 0:
+            addr = free_joints[0]
+            poses[name] = (
+                qpos[addr : addr + 3].copy(),
+                qpos[addr + 3 : addr + 7].copy(),
+            )
+        else:
+            poses[name] = (
+                np.array(body.get("pos", "0 0 0").split(), dtype=float),
+                np.array(body.get("quat", "1 0 0 0").split(), dtype=float),
+            )
+    return poses
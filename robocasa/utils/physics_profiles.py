@@ -0,0 +1,56 @@
+"""
+Named physics profiles, trading contact accuracy for simulation speed.
+
+Each profile specifies whether to use robosuite's lite physics stepping and overrides of the MuJoCo solver
+<option> attributes of the model (solver, iterations, tolerance, cone, ...). Profiles never change the
+timestep: robosuite controllers are built around robosuite's SIMULATION_TIMESTEP. The "default" profile
+leaves the model unchanged.
+"""
+
+PHYSICS_PROFILES = {
+    "accurate": dict(
+        lite_physics=False,
+        option=dict(solver="Newton", iterations=100, ls_iterations=50, tolerance=1e-10),
+    ),
+    "default": dict(
+        lite_physics=True,
+        option=dict(),
+    ),
+    "fast": dict(
+        lite_physics=True,
+        option=dict(iterations=20, ls_iterations=10, tolerance=1e-6),
+    ),
+}
+
+
+def get_physics_profile(name):
+    """
+    Returns:
+        dict: settings of the physics profile @name
+    """
+    if name not in PHYSICS_PROFILES:
+        raise ValueError(
+            "Invalid physics profile: {}. Must be one of {}".format(
+                name, list(PHYSICS_PROFILES.keys())
+            )
+        )
+    return PHYSICS_PROFILES[name]
+
+
+def apply_physics_profile(root, profile):
+    """
+    Sets the solver <option> attributes of a model according to a physics profile
+
+    Args:
+        root (ET.Element): root of the model xml, modified in place
+
+        profile (dict): physics profile
+    """
+    if len(profile["option"]) == 0:
+        return
+    option = root.find("option")
+    if option is None:
+        option = root.makeelement("option", {})
+        root.insert(0, option)
+    for k, v in profile["option"].items():
+        option.set(k, str(v))
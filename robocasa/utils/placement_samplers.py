@@ -21,6 +21,19 @@ from robocasa.utils.object_utils import (
 )
 
 
+class ObjectPlacementError(RandomizationError):
+    """
+    Raised by a placement sampler when an object cannot be placed
+
+    Args:
+        obj_name (str): name of the object that could not be placed
+    """
+
+    def __init__(self, obj_name):
+        super().__init__("Cannot place object: {}".format(obj_name))
+        self.obj_name = obj_name
+
+
 class ObjectPositionSampler:
     """
     Base class of object placement sampler.
@@ -231,6 +244,20 @@ class UniformRandomSampler(ObjectPositionSampler):
         self.ensure_object_in_ref_region = ensure_object_in_ref_region
         self.ensure_object_out_of_ref_region = ensure_object_out_of_ref_region
 
+        # number of sampled candidate placements and of those that were valid, see accept_rate
+        self.num_candidates = 0
+        self.num_accepted = 0
+
+    @property
+    def accept_rate(self):
+        """
+        Returns:
+            float: fraction of sampled candidate placements that were valid, None if nothing was sampled yet
+        """
+        if self.num_candidates == 0:
+            return None
+        return self.num_accepted / self.num_candidates
+
     def _sample_x(self):
         """
         Samples the x location for a given object
@@ -261,6 +288,15 @@ class UniformRandomSampler(ObjectPositionSampler):
         Raises:
             ValueError: [Invalid rotation axis]
         """
+        return self._angle_to_quat(self._sample_angle())
+
+    def _sample_angle(self):
+        """
+        Samples the rotation angle for a given object
+
+        Returns:
+            float: sampled rotation angle about the rotation axis
+        """
         if self.rotation is None:
             rot_angle = self.rng.uniform(high=2 * np.pi, low=0)
         elif isinstance(self.rotation, collections.abc.Iterable):
@@ -271,7 +307,16 @@ class UniformRandomSampler(ObjectPositionSampler):
             rot_angle = self.rng.uniform(high=max(rotation), low=min(rotation))
         else:
             rot_angle = self.rotation
+        return rot_angle
+
+    def _angle_to_quat(self, rot_angle):
+        """
+        Returns:
+            np.array: quaternion in (w,x,y,z) form of a rotation by @rot_angle about the rotation axis
 
+        Raises:
+            ValueError: [Invalid rotation axis]
+        """
         # Return angle based on axis requested
         if self.rotation_axis == "x":
             return np.array([np.cos(rot_angle / 2), np.sin(rot_angle / 2), 0, 0])
@@ -287,6 +332,50 @@ class UniformRandomSampler(ObjectPositionSampler):
                 )
             )
 
+    def _get_object_quat(self, obj, quat):
+        """
+        Returns:
+            np.array: world quaternion in (w,x,y,z) form of @obj when sampled with rotation @quat, i.e. @quat
+                applied to the object's initial rotation, rotated by the reference rotation
+        """
+        ref_quat = convert_quat(
+            mat2quat(euler2mat([0, 0, self.reference_rot])), to="wxyz"
+        )
+        # multiply this quat by the object's initial rotation if it has the attribute specified
+        if hasattr(obj, "init_quat"):
+            quat = quat_multiply(quat, obj.init_quat)
+        return convert_quat(
+            quat_multiply(
+                convert_quat(ref_quat, to="xyzw"),
+                convert_quat(quat, to="xyzw"),
+            ),
+            to="wxyz",
+        )
+
+    def _get_candidate_sampler(
+        self, obj, placed_objects, base_offset, object_z, spawn_ref_obj
+    ):
+        """
+        Returns the function sampling candidate placements of @obj, which are then checked for validity.
+        Samples uniformly within the x and y ranges
+
+        Args:
+            obj (MujocoObject): object to place
+
+            placed_objects (dict): current placements, mapping object names to (pos, quat, MujocoObject)
+
+            base_offset (3-array): position the x and y ranges are relative to
+
+            object_z (float): z position of the object
+
+            spawn_ref_obj (MJCFObject): object whose spawn region @obj is placed in, or None
+
+        Returns:
+            function: returns a candidate (relative x, relative y, quat in (w,x,y,z) form relative to the
+                reference rotation and the object's initial rotation)
+        """
+        return lambda: (self._sample_x(), self._sample_y(), self._sample_quat())
+
     def sample(
         self, placed_objects=None, reference=None, neg_reference=None, on_top=True
     ):
@@ -372,11 +461,6 @@ class UniformRandomSampler(ObjectPositionSampler):
 
             success = False
 
-            # get reference rotation
-            ref_quat = convert_quat(
-                mat2quat(euler2mat([0, 0, self.reference_rot])), to="wxyz"
-            )
-
             ### get boundary points ###
             region_points = np.array(
                 [
@@ -391,10 +475,18 @@ class UniformRandomSampler(ObjectPositionSampler):
                 )
             region_points += base_offset
 
+            object_z = self.z_offset + base_offset[2]
+            if on_top:
+                object_z -= obj.bottom_offset[-1]
+
+            sample_candidate = self._get_candidate_sampler(
+                obj, placed_objects, base_offset, object_z, spawn_ref_obj
+            )
+
             for i in range(self.num_attempts):
-                # sample object coordinates
-                relative_x = self._sample_x()
-                relative_y = self._sample_y()
+                # sample object coordinates and rotation
+                relative_x, relative_y, quat = sample_candidate()
+                self.num_candidates += 1
 
                 # apply rotation
                 object_x, object_y = rotate_2d_point(
@@ -403,22 +495,8 @@ class UniformRandomSampler(ObjectPositionSampler):
 
                 object_x = object_x + base_offset[0]
                 object_y = object_y + base_offset[1]
-                object_z = self.z_offset + base_offset[2]
-                if on_top:
-                    object_z -= obj.bottom_offset[-1]
-
-                # random rotation
-                quat = self._sample_quat()
-                # multiply this quat by the object's initial rotation if it has the attribute specified
-                if hasattr(obj, "init_quat"):
-                    quat = quat_multiply(quat, obj.init_quat)
-                quat = convert_quat(
-                    quat_multiply(
-                        convert_quat(ref_quat, to="xyzw"),
-                        convert_quat(quat, to="xyzw"),
-                    ),
-                    to="wxyz",
-                )
+
+                quat = self._get_object_quat(obj, quat)
 
                 location_valid = True
 
@@ -504,15 +582,226 @@ class UniformRandomSampler(ObjectPositionSampler):
                     # location is valid, put the object down
                     pos = (object_x, object_y, object_z)
                     placed_objects[obj.name] = (pos, quat, obj)
+                    self.num_accepted += 1
                     success = True
                     break
 
             if not success:
-                raise RandomizationError(f"Cannot place object: {obj.name}")
+                raise ObjectPlacementError(obj.name)
 
         return placed_objects
 
 
+def _convex_hull(points):
+    """
+    Returns the convex hull of 2D @points as an array of vertices in counterclockwise order (monotone chain)
+    """
+    points = np.unique(np.round(points, 9), axis=0)
+    if len(points) < 3:
+        return points
+
+    def half_hull(pts):
+        chain = []
+        for p in pts:
+            while len(chain) >= 2:
+                a, b = chain[-1] - chain[-2], p - chain[-2]
+                if a[0] * b[1] - a[1] * b[0] > 0:
+                    break
+                chain.pop()
+            chain.append(p)
+        return chain
+
+    lower = half_hull(points)
+    upper = half_hull(points[::-1])
+    return np.array(lower[:-1] + upper[:-1])
+
+
+def _points_in_convex_polygon(points, polygon):
+    """
+    Returns:
+        np.array: mask of the 2D @points that lie inside or on the boundary of the convex @polygon, given by its
+            vertices in counterclockwise order
+    """
+    if len(polygon) < 3:
+        return np.zeros(len(points), dtype=bool)
+    edges = np.roll(polygon, -1, axis=0) - polygon
+    rel = points[:, None, :] - polygon[None, :, :]
+    cross = edges[None, :, 0] * rel[..., 1] - edges[None, :, 1] * rel[..., 0]
+    return np.all(cross >= -1e-12, axis=1)
+
+
+class OccupancyRasterSampler(UniformRandomSampler):
+    """
+    Places objects by sampling directly from the free space of the region instead of rejection sampling
+    uniformly over the whole region.
+
+    For each object, the region is rasterized into cells of size @cell_size and the rotation range into
+    @num_yaw_bins bins. For each bin, the footprints of the placed objects that overlap the object in height
+    are dilated by the object's footprint at the bin's center rotation (a Minkowski sum of the convex xy
+    footprints), and cells whose center lies in a dilated footprint, or that would put the object outside of
+    the region, are marked occupied. Candidates are sampled uniformly among the free (cell, bin) pairs, with a
+    uniform offset within the cell and a uniform rotation within the bin, and then checked with the same exact
+    checks as UniformRandomSampler. Placements are therefore always valid, and only valid placements within
+    about @cell_size (or a bin of rotation) of an obstacle can be missed.
+
+    Falls back to uniform rejection sampling for rotations about the x or y axis, for objects without a
+    bounding box, and when no cell is free. accept_rate reports the fraction of candidates that were valid.
+
+    Args:
+        cell_size (float): size of the raster cells
+
+        num_yaw_bins (int): number of bins each rotation range is divided into
+
+        See UniformRandomSampler for the other arguments.
+    """
+
+    def __init__(self, name, cell_size=0.01, num_yaw_bins=16, **kwargs):
+        self.cell_size = cell_size
+        self.num_yaw_bins = num_yaw_bins
+        super().__init__(name=name, **kwargs)
+
+    def _get_yaw_bins(self):
+        """
+        Returns:
+            list: (low, high, probability) of each rotation bin, following the distribution of _sample_angle
+        """
+        if self.rotation is None:
+            ranges = [(0, 2 * np.pi)]
+        elif isinstance(self.rotation, collections.abc.Iterable):
+            if isinstance(self.rotation[0], collections.abc.Iterable):
+                ranges = [(min(r), max(r)) for r in self.rotation]
+            else:
+                ranges = [(min(self.rotation), max(self.rotation))]
+        else:
+            ranges = [(self.rotation, self.rotation)]
+
+        bins = []
+        for low, high in ranges:
+            num_bins = self.num_yaw_bins if high > low else 1
+            edges = np.linspace(low, high, num_bins + 1)
+            for k in range(num_bins):
+                prob = 1.0 / (len(ranges) * num_bins)
+                bins.append((edges[k], edges[k + 1], prob))
+        return bins
+
+    def _to_region_frame(self, points, base_offset=None):
+        """
+        Returns:
+            np.array: xy coordinates of @points in the frame of the x and y ranges. If @base_offset is None,
+                @points are treated as directions and only rotated
+        """
+        points = np.array(points)[:, :2]
+        if base_offset is not None:
+            points = points - np.array(base_offset)[:2]
+        c, s = np.cos(self.reference_rot), np.sin(self.reference_rot)
+        return points @ np.array([[c, -s], [s, c]])
+
+    def _get_candidate_sampler(
+        self, obj, placed_objects, base_offset, object_z, spawn_ref_obj
+    ):
+        """
+        Returns the function sampling candidate placements of @obj from the free cells of the raster, see
+        UniformRandomSampler._get_candidate_sampler
+        """
+        uniform_sampler = super()._get_candidate_sampler(
+            obj, placed_objects, base_offset, object_z, spawn_ref_obj
+        )
+        from robocasa.models.fixtures import Fixture
+
+        def has_bbox(o):
+            return isinstance(o, MJCFObject) or isinstance(o, Fixture)
+
+        if self.rotation_axis != "z" or not has_bbox(obj):
+            return uniform_sampler
+
+        yaw_bins = self._get_yaw_bins()
+        footprints = []
+        for low, high, _ in yaw_bins:
+            quat = self._get_object_quat(obj, self._angle_to_quat((low + high) / 2))
+            obj_points = np.array(
+                obj.get_bbox_points(
+                    trans=np.zeros(3), rot=convert_quat(quat, to="xyzw")
+                )
+            )
+            footprints.append(_convex_hull(self._to_region_frame(obj_points)))
+        # rotations about z do not change the height of the bounding box
+        z_min = object_z + np.min(obj_points[:, 2])
+        z_max = object_z + np.max(obj_points[:, 2])
+
+        # footprints of the placed objects the object could collide with
+        obstacles = []
+        if self.ensure_valid_placement:
+            for pos, other_quat, other_obj in placed_objects.values():
+                # the object must be placed inside the spawn reference, not next to it
+                if other_obj is spawn_ref_obj or not has_bbox(other_obj):
+                    continue
+                points = np.array(
+                    other_obj.get_bbox_points(
+                        trans=pos, rot=convert_quat(other_quat, to="xyzw")
+                    )
+                )
+                if np.min(points[:, 2]) > z_max or z_min > np.max(points[:, 2]):
+                    continue
+                obstacles.append(
+                    _convex_hull(self._to_region_frame(points, base_offset))
+                )
+
+        # raster cell centers
+        x_min, x_max = min(self.x_range), max(self.x_range)
+        y_min, y_max = min(self.y_range), max(self.y_range)
+        nx = max(int(np.ceil((x_max - x_min) / self.cell_size)), 1)
+        ny = max(int(np.ceil((y_max - y_min) / self.cell_size)), 1)
+        cell_w, cell_h = (x_max - x_min) / nx, (y_max - y_min) / ny
+        xs = x_min + (np.arange(nx) + 0.5) * cell_w
+        ys = y_min + (np.arange(ny) + 0.5) * cell_h
+
+        free_cells, free_probs = [], []
+        for b, ((_, _, prob), footprint) in enumerate(zip(yaw_bins, footprints)):
+            free = np.ones((ny, nx), dtype=bool)
+            if self.ensure_object_boundary_in_range:
+                fp_min = np.min(footprint, axis=0)
+                fp_max = np.max(footprint, axis=0)
+                free[:, (xs + fp_min[0] < x_min) | (xs + fp_max[0] > x_max)] = False
+                free[(ys + fp_min[1] < y_min) | (ys + fp_max[1] > y_max), :] = False
+            for obstacle in obstacles:
+                # object centers for which the footprint overlaps the obstacle
+                dilated = _convex_hull(
+                    (obstacle[:, None, :] - footprint[None, :, :]).reshape(-1, 2)
+                )
+                lo, hi = np.min(dilated, axis=0), np.max(dilated, axis=0)
+                ix = (xs >= lo[0]) & (xs <= hi[0])
+                iy = (ys >= lo[1]) & (ys <= hi[1])
+                if not ix.any() or not iy.any():
+                    continue
+                centers = np.stack(np.meshgrid(xs[ix], ys[iy]), axis=-1)
+                occupied = _points_in_convex_polygon(centers.reshape(-1, 2), dilated)
+                free[np.ix_(iy, ix)] &= ~occupied.reshape(iy.sum(), ix.sum())
+            cells = np.flatnonzero(free)
+            free_cells.append(np.stack([np.full(len(cells), b), cells], axis=-1))
+            free_probs.append(np.full(len(cells), prob))
+
+        free_cells = np.concatenate(free_cells)
+        if len(free_cells) == 0:
+            return uniform_sampler
+        cdf = np.cumsum(np.concatenate(free_probs))
+        cdf /= cdf[-1]
+
+        def sample_candidate():
+            k = np.searchsorted(cdf, self.rng.random(), side="right")
+            b, cell = free_cells[min(k, len(cdf) - 1)]
+            iy, ix = divmod(cell, nx)
+            low, high, _ = yaw_bins[b]
+            relative_x = xs[ix] + self.rng.uniform(-0.5, 0.5) * cell_w
+            relative_y = ys[iy] + self.rng.uniform(-0.5, 0.5) * cell_h
+            return (
+                relative_x,
+                relative_y,
+                self._angle_to_quat(self.rng.uniform(high=high, low=low)),
+            )
+
+        return sample_candidate
+
+
 class SequentialCompositeSampler(ObjectPositionSampler):
     """
     Samples position for each object sequentially. Allows chaining
@@ -556,6 +845,23 @@ class SequentialCompositeSampler(ObjectPositionSampler):
         self.sample_args[sampler.name] = sample_args
         self.sampler_optional[sampler.name] = optional
 
+    @property
+    def accept_rate(self):
+        """
+        Returns:
+            float: fraction of the candidate placements sampled by all sub-samplers that were valid, None if
+                nothing was sampled yet
+        """
+        num_candidates = sum(
+            getattr(sampler, "num_candidates", 0) for sampler in self.samplers.values()
+        )
+        if num_candidates == 0:
+            return None
+        num_accepted = sum(
+            getattr(sampler, "num_accepted", 0) for sampler in self.samplers.values()
+        )
+        return num_accepted / num_candidates
+
     def hide(self, mujoco_objects):
         """
         Helper method to remove an object from the workspace.
@@ -0,0 +1,91 @@
+"""
+Prewarming of worker processes.
+
+Importing robocasa and robosuite, walking the object registry, registering the gym environments and generating
+the 24-DC task classes takes seconds in every worker process. With the "fork" start method, this is done once in
+the parent and workers are forked from it, sharing the imported modules, registries and fixture caches
+copy-on-write. Before forking, the garbage collector is frozen so that collections in the workers do not write to
+(and thereby copy) the pages of objects inherited from the parent.
+
+With the "forkserver" start method, the modules are preloaded into the fork server instead, which is safer when
+the parent runs threads but cannot prebuild environments.
+"""
+
+import gc
+import multiprocessing as mp
+
+# modules imported before forking workers. robocasa.utils.gym_utils imports all environment modules (object registry,
+# 24-DC classes) to register the gym environments
+PREWARM_MODULES = ["robocasa", "robocasa.utils.gym_utils"]
+
+
+def prewarm(env_name=None, robot=None):
+    """
+    Imports the modules of PREWARM_MODULES into the current process and optionally builds an environment once, so
+    that its fixture and object caches are populated. Then freezes the garbage collector
+
+    Args:
+        env_name (str): (optional) environment to build
+
+        robot (str): robot of the environment
+    """
+    import importlib
+
+    for module in PREWARM_MODULES:
+        importlib.import_module(module)
+
+    if env_name is not None:
+        from robocasa.utils.gym_utils.gymnasium_basic import create_env_robosuite
+
+        env, _ = create_env_robosuite(
+            env_name=env_name, robots=robot, enable_render=False
+        )
+        env.close()
+
+    gc.collect()
+    gc.freeze()
+
+
+def get_mp_context(start_method, env_name=None, robot=None):
+    """
+    Returns a multiprocessing context whose workers start prewarmed
+
+    Args:
+        start_method (str): "fork" to prewarm the current process and fork workers from it, "forkserver" to preload
+            the modules into the fork server, or "spawn" for unwarmed workers
+
+        env_name (str): (optional) environment to build while prewarming. Only used with "fork"
+
+        robot (str): robot of the environment
+
+    Returns:
+        multiprocessing.context.BaseContext: the context
+    """
+    ctx = mp.get_context(start_method)
+    if start_method == "fork":
+        prewarm(env_name=env_name, robot=robot)
+    elif start_method == "forkserver":
+        ctx.set_forkserver_preload(PREWARM_MODULES)
+    return ctx
+
+
+def get_memory_stats():
+    """
+    Returns the memory usage of the current process, read from /proc/self/smaps_rollup (Linux only)
+
+    Returns:
+        dict: resident (rss), proportional (pss), shared and private memory in MB. Memory shared copy-on-write
+            with other processes counts towards rss and shared, but only in part towards pss
+    """
+    fields = dict()
+    with open("/proc/self/smaps_rollup", "r") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return dict(
+        rss=fields["Rss"],
+        pss=fields["Pss"],
+        shared=fields["Shared_Clean"] + fields["Shared_Dirty"],
+        private=fields["Private_Clean"] + fields["Private_Dirty"],
+    )
@@ -0,0 +1,155 @@
+"""
+Lightweight wall-clock profiler for environment steps.
+
+Durations are recorded per named section into fixed-size ring buffers, so memory stays bounded however
+long the environment runs. Statistics and histograms are computed over the buffered samples on demand.
+"""
+
+import functools
+import json
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+
+# histogram bin edges in seconds, log-spaced from 1us to 10s
+HISTOGRAM_BIN_EDGES = np.logspace(-6, 1, 29)
+
+
+class _RingBuffer:
+    """
+    Fixed-size buffer of the most recent durations of a section, along with running totals over all samples
+    """
+
+    def __init__(self, size):
+        self.data = np.zeros(size)
+        self.size = size
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value):
+        self.data[self.count % self.size] = value
+        self.count += 1
+        self.total += value
+
+    def values(self):
+        return self.data[: min(self.count, self.size)]
+
+
+class StepProfiler:
+    """
+    Records durations of named code sections
+
+    Args:
+        buffer_size (int): number of most recent samples kept per section
+    """
+
+    def __init__(self, buffer_size=1000):
+        self.buffer_size = buffer_size
+        self._buffers = OrderedDict()
+
+    def record(self, name, duration):
+        """
+        Records a duration (in seconds) for section @name
+        """
+        buf = self._buffers.get(name, None)
+        if buf is None:
+            buf = self._buffers[name] = _RingBuffer(self.buffer_size)
+        buf.add(duration)
+
+    @contextmanager
+    def section(self, name):
+        """
+        Context manager timing the enclosed code as section @name
+        """
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - t)
+
+    def wrap(self, name, fn):
+        """
+        Wraps a function so that each of its calls is timed as section @name. Function attributes (e.g. the
+        modality of observable sensors) are preserved
+
+        Returns:
+            function: wrapped function
+        """
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - t)
+
+        return wrapper
+
+    def reset(self):
+        """
+        Clears all recorded samples
+        """
+        self._buffers = OrderedDict()
+
+    def get_stats(self, histogram=True):
+        """
+        Returns:
+            dict: maps each section to its statistics: number of calls and total time over all samples, and
+                mean, percentiles and maximum (in seconds) over the buffered samples. If @histogram is True,
+                also includes the counts of the buffered samples in HISTOGRAM_BIN_EDGES
+        """
+        stats = OrderedDict()
+        for name, buf in self._buffers.items():
+            values = buf.values()
+            p50, p90, p99 = np.percentile(values, [50, 90, 99])
+            section_stats = dict(
+                count=buf.count,
+                total=buf.total,
+                mean=float(np.mean(values)),
+                p50=float(p50),
+                p90=float(p90),
+                p99=float(p99),
+                max=float(np.max(values)),
+            )
+            if histogram:
+                counts, _ = np.histogram(values, bins=HISTOGRAM_BIN_EDGES)
+                section_stats["histogram"] = counts.tolist()
+            stats[name] = section_stats
+        return stats
+
+    def dump_jsonl(self, path, **extra):
+        """
+        Appends the current statistics to a JSON lines file, one line per section
+
+        Args:
+            path (str): path to the file
+
+            extra (dict): additional fields written on every line (e.g. env name, episode index)
+        """
+        wall_time = time.time()
+        with open(path, "a") as f:
+            for name, section_stats in self.get_stats().items():
+                line = dict(time=wall_time, section=name, **extra, **section_stats)
+                f.write(json.dumps(line) + "\n")
+
+    def summary(self):
+        """
+        Returns:
+            str: table of the mean and p99 time of each section, sorted by total time
+        """
+        stats = self.get_stats(histogram=False)
+        lines = [
+            "{:<40} {:>10} {:>10} {:>10} {:>10}".format(
+                "section", "calls", "mean (ms)", "p99 (ms)", "total (s)"
+            )
+        ]
+        for name, s in sorted(stats.items(), key=lambda x: -x[1]["total"]):
+            lines.append(
+                "{:<40} {:>10d} {:>10.3f} {:>10.3f} {:>10.2f}".format(
+                    name, s["count"], s["mean"] * 1e3, s["p99"] * 1e3, s["total"]
+                )
+            )
+        return "\n".join(lines)
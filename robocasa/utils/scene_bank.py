@@ -0,0 +1,140 @@
+"""
+Persistent banks of pre-generated, ready-to-run scenes.
+
+A scene bank is a directory holding a fixed set of scenes of one environment, so that every evaluation runs on
+exactly the same scenes regardless of random number generator paths or code changes in scene sampling. Each scene
+stores its episode meta data, its compiled model xml, its settled initial simulation state and optionally the
+compiled model in MuJoCo's binary format (MJB), which loads without parsing or compiling the xml:
+
+    <bank>/bank.json            environment name, robots, number of scenes, MuJoCo version
+    <bank>/scene_<k>.npz        ep_meta (json), model xml and initial state of scene k
+    <bank>/scene_<k>.mjb        (optional) compiled model of scene k
+
+Scenes are generated with build_scene_bank.py and loaded with Tabletop.reset_to_scene.
+"""
+
+import json
+import os
+
+import mujoco
+import numpy as np
+
+BANK_META_FILE = "bank.json"
+
+
+def _get_scene_prefix(bank_dir, index):
+    return os.path.join(bank_dir, "scene_{:06d}".format(index))
+
+
+def save_scene(env, bank_dir, index, save_mjb=False):
+    """
+    Saves the current scene of @env (right after a reset) as scene @index of a bank
+
+    Args:
+        env (Tabletop): environment
+
+        bank_dir (str): bank directory
+
+        index (int): index of the scene
+
+        save_mjb (bool): whether to also save the compiled model in binary format
+    """
+    prefix = _get_scene_prefix(bank_dir, index)
+    model_xml = env.get_model_xml()
+    np.savez_compressed(
+        prefix + ".npz",
+        ep_meta=np.array(json.dumps(env.get_ep_meta())),
+        model_xml=np.frombuffer(model_xml.encode("utf8"), dtype=np.uint8),
+        state=env.sim.get_state().flatten(),
+    )
+    if save_mjb:
+        mujoco.mj_saveModel(env.sim.model._model, prefix + ".mjb")
+
+
+def generate_scene_bank(env, bank_dir, num_scenes, save_mjb=False, verbose=True):
+    """
+    Resets @env @num_scenes times and saves each resulting scene into a new bank
+
+    Args:
+        env (Tabletop): environment
+
+        bank_dir (str): bank directory, created if needed
+
+        num_scenes (int): number of scenes
+
+        save_mjb (bool): whether to also save the compiled models in binary format
+
+        verbose (bool): whether to print progress
+    """
+    os.makedirs(bank_dir, exist_ok=True)
+    for k in range(num_scenes):
+        env.reset()
+        save_scene(env, bank_dir, k, save_mjb=save_mjb)
+        if verbose:
+            print("saved scene {}/{}".format(k + 1, num_scenes))
+
+    with open(os.path.join(bank_dir, BANK_META_FILE), "w") as f:
+        json.dump(
+            dict(
+                env_name=env.__class__.__name__,
+                robots=[robot.name for robot in env.robots],
+                num_scenes=num_scenes,
+                has_mjb=save_mjb,
+                mujoco_version=mujoco.__version__,
+            ),
+            f,
+            indent=4,
+        )
+
+
+class SceneBank:
+    """
+    Read access to a scene bank
+
+    Args:
+        bank_dir (str): bank directory
+    """
+
+    def __init__(self, bank_dir):
+        self.bank_dir = bank_dir
+        meta_path = os.path.join(bank_dir, BANK_META_FILE)
+        if not os.path.exists(meta_path):
+            raise ValueError("No scene bank found at {}".format(bank_dir))
+        with open(meta_path, "r") as f:
+            self.meta = json.load(f)
+        # binary models are only valid for the MuJoCo version that wrote them
+        self.use_mjb = (
+            self.meta["has_mjb"] and self.meta["mujoco_version"] == mujoco.__version__
+        )
+
+    def __len__(self):
+        return self.meta["num_scenes"]
+
+    @property
+    def env_name(self):
+        return self.meta["env_name"]
+
+    def load_scene(self, index):
+        """
+        Args:
+            index (int): index of the scene
+
+        Returns:
+            dict: ep_meta (dict), model_xml (str), state (np.array) and model_binary_path (str, None if the scene
+                has no usable binary model) of the scene
+        """
+        if not 0 <= index < len(self):
+            raise ValueError(
+                "Scene index {} out of range for a bank of {} scenes".format(
+                    index, len(self)
+                )
+            )
+        prefix = _get_scene_prefix(self.bank_dir, index)
+        with np.load(prefix + ".npz") as data:
+            scene = dict(
+                ep_meta=json.loads(str(data["ep_meta"])),
+                model_xml=data["model_xml"].tobytes().decode("utf8"),
+                state=data["state"],
+            )
+        scene["model_binary_path"] = prefix + ".mjb" if self.use_mjb else None
+        return scene
@@ -0,0 +1,192 @@
+"""
+Utilities for capturing and restoring in-memory snapshots of a simulation and the python
+objects driving it (controllers, fixtures, observables), without recompiling the model.
+"""
+
+import logging
+import types
+import xml.etree.ElementTree as ET
+from copy import deepcopy
+
+import mujoco
+import numpy as np
+from robosuite.models.base import MujocoModel, MujocoXML
+from robosuite.utils.binding_utils import MjData, MjModel, MjSim
+
+# full physics state needed to reproduce a trajectory: time, qpos, qvel, act, qacc_warmstart,
+# ctrl, applied forces, equality activations, mocap poses, userdata and plugin state
+MJ_SNAPSHOT_STATE_SPEC = mujoco.mjtState.mjSTATE_INTEGRATION
+
+
+def _is_plain_value(value):
+    """
+    Returns whether a value only holds data (arrays, numbers, strings and containers of these),
+    as opposed to references to other objects such as the simulation
+    """
+    if value is None or isinstance(value, (bool, int, float, str, np.generic)):
+        return True
+    if isinstance(value, np.ndarray):
+        return value.dtype != object
+    if isinstance(value, (list, tuple)):
+        return all(_is_plain_value(v) for v in value)
+    if isinstance(value, dict):
+        return all(_is_plain_value(v) for v in value.values())
+    return False
+
+
+def get_mj_state(sim):
+    """
+    Captures the full integration state of the simulation
+
+    Args:
+        sim (MjSim): simulation
+
+    Returns:
+        np.array: flattened integration state
+    """
+    model, data = sim.model._model, sim.data._data
+    state = np.empty(mujoco.mj_stateSize(model, MJ_SNAPSHOT_STATE_SPEC))
+    mujoco.mj_getState(model, data, state, MJ_SNAPSHOT_STATE_SPEC)
+    return state
+
+
+def set_mj_state(sim, state):
+    """
+    Restores a state captured by get_mj_state and recomputes derived quantities
+
+    Args:
+        sim (MjSim): simulation
+
+        state (np.array): flattened integration state
+    """
+    model, data = sim.model._model, sim.data._data
+    mujoco.mj_setState(model, data, state, MJ_SNAPSHOT_STATE_SPEC)
+    sim.forward()
+
+
+# objects referenced by controllers, fixtures and observables that carry state of their own and
+# are captured attribute by attribute (interpolators, history buffers, IK solvers)
+STATEFUL_HELPER_MODULES = (
+    "robosuite.utils.buffers",
+    "robosuite.utils.traj_utils",
+    "robosuite.utils.ik_utils",
+    "mink",
+)
+
+_VALUE, _OBJECT, _MJDATA, _RNG = range(4)
+
+
+def _is_stateful_helper(value):
+    module = type(value).__module__
+    return hasattr(value, "__dict__") and any(
+        module == m or module.startswith(m + ".") for m in STATEFUL_HELPER_MODULES
+    )
+
+
+def _is_reference(value, sim, ref_ids):
+    """
+    Returns whether a value references shared or static objects whose state is either immutable
+    (models, xml trees, callables) or captured separately (the simulation, captured objects)
+    """
+    if id(value) in ref_ids:
+        return True
+    if isinstance(value, (MjSim, MjModel, MjData, mujoco.MjModel, MujocoModel, MujocoXML, ET.Element)):
+        return True
+    if isinstance(value, mujoco.MjData):
+        return value is sim.data._data
+    if isinstance(value, (type, types.ModuleType, logging.Logger)) or callable(value):
+        return True
+    if isinstance(value, (list, tuple)):
+        return len(value) > 0 and all(_is_reference(v, sim, ref_ids) for v in value)
+    if isinstance(value, dict):
+        return len(value) > 0 and all(
+            _is_reference(v, sim, ref_ids) for v in value.values()
+        )
+    return False
+
+
+def _get_obj_state(obj, sim, ref_ids, path):
+    state = dict()
+    for k, v in vars(obj).items():
+        if _is_plain_value(v):
+            state[k] = (_VALUE, v)
+        elif _is_reference(v, sim, ref_ids):
+            continue
+        elif isinstance(v, np.random.Generator):
+            state[k] = (_RNG, v.bit_generator.state)
+        elif isinstance(v, mujoco.MjData):
+            # private copy of the physics, e.g. the configuration of an IK solver
+            state[k] = (_MJDATA, v)
+        elif _is_stateful_helper(v):
+            state[k] = (_OBJECT, _get_obj_state(v, sim, ref_ids, path + "." + k))
+        else:
+            raise TypeError(
+                "Cannot snapshot attribute {}.{} of type {}. Add its module to "
+                "STATEFUL_HELPER_MODULES if it holds state, or make it a plain value".format(
+                    path, k, type(v).__name__
+                )
+            )
+    return state
+
+
+def _set_obj_state(obj, state):
+    for k, (kind, v) in state.items():
+        if kind == _OBJECT:
+            _set_obj_state(getattr(obj, k), v)
+        elif kind == _RNG:
+            getattr(obj, k).bit_generator.state = v
+        elif kind == _MJDATA:
+            # copy in place, other objects may hold the same data
+            mujoco.mj_copyData(getattr(obj, k), v.model, v)
+        else:
+            # object.__setattr__ also covers frozen dataclasses
+            object.__setattr__(obj, k, v)
+
+
+def get_attr_state(objs, sim, refs=()):
+    """
+    Captures the state attributes of a list of objects. Data attributes are copied, stateful
+    helpers (interpolators, buffers, IK solvers) are captured recursively and references to the
+    simulation, models, callables and to the other captured objects are skipped. Any other
+    attribute raises an error instead of being silently left out of the snapshot. Objects are
+    copied together, so arrays shared between attributes stay shared
+
+    Args:
+        objs (list): objects to capture
+
+        sim (MjSim): simulation the objects belong to
+
+        refs (list): other objects that may be referenced and whose state is captured separately
+
+    Returns:
+        list: one dict of attribute states per object
+
+    Raises:
+        TypeError: [Attribute that is neither data, a known stateful helper nor a reference]
+    """
+    ref_ids = set(id(obj) for obj in objs) | set(id(obj) for obj in refs)
+    return deepcopy(
+        [
+            _get_obj_state(obj, sim, ref_ids, type(obj).__name__)
+            for obj in objs
+        ]
+    )
+
+
+def set_attr_state(objs, attr_state):
+    """
+    Restores attributes captured by get_attr_state
+
+    Args:
+        objs (list): objects to restore, in the same order as when captured
+
+        attr_state (list): captured attribute states
+    """
+    if len(objs) != len(attr_state):
+        raise ValueError(
+            "Snapshot holds {} objects, got {}".format(len(attr_state), len(objs))
+        )
+    # copy again so that the same snapshot can be restored multiple times
+    attr_state = deepcopy(attr_state)
+    for obj, state in zip(objs, attr_state):
+        _set_obj_state(obj, state)